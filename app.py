@@ -1,6 +1,9 @@
 import streamlit as st
-import pandas as pd
 import os
+from core.dataset import FILE_PATH, load_dataset
+from core.prewarm import start_prewarm
+from core.result_cache import RESULTS
+from core.derived import canonical_data
 
 # -----------------------------------------------------------------------------
 # 1. 페이지 공통 설정 (전역 설정)
@@ -11,23 +14,37 @@ st.set_page_config(
     layout="wide"
 )
 
+# 서버 시작 후 첫 접속 시 페이지별 파생 데이터를 백그라운드에서 미리 계산
+prewarm = start_prewarm()
+
 st.title("🏠 스마트 견적서 및 단가 관리 시스템")
 st.markdown("데이터를 초기화하고 불러오는 메인 화면입니다. 좌측 사이드바에서 원하는 기능을 선택해주세요.")
 
 # -----------------------------------------------------------------------------
-# 2. 데이터 로딩 및 세션 관리 (강제 로드)
+# 2. 데이터 로딩 (프로세스 전체에서 한 번만 읽고 모든 세션이 공유)
 # -----------------------------------------------------------------------------
-file_path = 'price_list.xlsx'
+file_path = FILE_PATH
 
 if os.path.exists(file_path):
     try:
-        # 데이터가 세션에 없으면 로드하여 저장
-        if 'df_sales' not in st.session_state or 'df_purch' not in st.session_state:
-            with st.spinner('데이터를 불러오는 중입니다...'):
-                st.session_state['df_sales'] = pd.read_excel(file_path, sheet_name='Sales_매출단가')
-                st.session_state['df_purch'] = pd.read_excel(file_path, sheet_name='Purchase_매입단가')
+        with st.spinner('데이터를 불러오는 중입니다...'):
+            ds = load_dataset(file_path)
             
         st.success("✅ 데이터 로드 완료! 왼쪽 메뉴를 선택하세요.")
+        mem = ds.memory
+        if prewarm:
+            n_done, n_total = prewarm.done()
+            st.caption(f"페이지 데이터 미리 계산: {n_done}/{n_total} 완료" + (" (아직 준비되지 않은 페이지는 처음 열 때 계산됩니다)" if n_done < n_total else ""))
+        cache = RESULTS.stats()
+        st.caption(f"조회 결과 캐시: 적중률 {cache['hit_rate']:.0%} (적중 {cache['hits']:,} / 조회 {cache['hits'] + cache['misses']:,}), 보관 {cache['size']}/{cache['maxsize']}건 · {cache['mb']:.0f}/{cache['max_mb']:.0f} MB")
+        st.caption(f"메모리 사용량: {mem['before_mb']:,.1f} MB → {mem['after_mb']:,.1f} MB (컬럼 압축으로 {1 - mem['after_mb'] / max(mem['before_mb'], 1e-9):.0%} 절감)")
+        if 'shared_tag' in mem:
+            st.caption(f"공유 데이터 사용 중: 게시 버전 {mem['shared_tag']} ({mem['shared_mb']:,.1f} MB, 모든 서버 프로세스가 한 벌을 매핑)")
+        
+        with st.expander("🔤 품목/규격/비고 표기 정규화 표 (시트 간 연결 키 검토)"):
+            df_canon = canonical_data(ds.version, ds)
+            only_merged = st.checkbox("여러 표기가 하나로 합쳐진 키만 보기", value=True)
+            st.dataframe(df_canon[df_canon['표기 수'] > 1] if only_merged else df_canon, hide_index=True, use_container_width=True)
         
         # -----------------------------------------------------------------------------
         # 3. 메인 화면 데이터 샘플 표시
@@ -38,11 +55,11 @@ if os.path.exists(file_path):
         col1, col2 = st.columns(2)
         with col1:
             st.markdown("**[매출단가 조회] 데이터 (상위 5개)**")
-            st.dataframe(st.session_state['df_sales'].head(), use_container_width=True)
+            st.dataframe(ds.sales_raw.head(), use_container_width=True)
             
         with col2:
             st.markdown("**[매입견적 및 업체별 단가] 데이터 (상위 5개)**")
-            st.dataframe(st.session_state['df_purch'].head(), use_container_width=True)
+            st.dataframe(ds.purch_raw.head(), use_container_width=True)
             
     except Exception as e:
         st.error(f"🚨 엑셀 파일을 읽는 중 오류가 발생했습니다: {e}")
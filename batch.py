@@ -0,0 +1,61 @@
+import os
+import sys
+import json
+import time
+import argparse
+import datetime
+
+from core.workbook import FILE_PATH, ACCOUNTS_PATH
+from core.reports import REPORTS, ReportSource, run_report, write_report
+
+# -----------------------------------------------------------------------------
+# 정기 보고서 일괄 실행 (Streamlit 없이)
+#   python batch.py jobs.json                                   # 보고서 정의 파일
+#   python batch.py --report vendor_comparison --report aging --report labor_grid --out-dir reports
+#
+#   jobs.json 예시 (out 의 {date} 는 실행일 YYYYMMDD 로 치환, 나머지 키는 보고서 옵션):
+#   {"reports": [
+#     {"type": "vendor_comparison", "vendors": "all", "out": "reports/업체비교_{date}.xlsx"},
+#     {"type": "aging", "ref_date": "2026-10-31", "out": "reports/잔고_{date}.xlsx"},
+#     {"type": "labor_grid", "lengths": [50, 100], "out": "reports/인건비_{date}.xlsx"}
+#   ]}
+# -----------------------------------------------------------------------------
+def load_definitions(args):
+    defs = []
+    if args.jobs:
+        with open(args.jobs, encoding='utf-8') as f: data = json.load(f)
+        defs += data['reports'] if isinstance(data, dict) else data
+    defs += [{'type': kind} for kind in args.report or []]
+    for d in defs: d.setdefault('out', os.path.join(args.out_dir, f"{d['type']}_{{date}}.xlsx"))
+    return defs
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description='정기 보고서 일괄 실행')
+    ap.add_argument('jobs', nargs='?', help='보고서 정의 JSON 파일')
+    ap.add_argument('--report', action='append', choices=sorted(REPORTS), help='기본 옵션으로 실행할 보고서 (여러 번 지정 가능)')
+    ap.add_argument('--out-dir', default='reports', help='--report 로 지정한 보고서의 저장 폴더')
+    ap.add_argument('--price-file', default=FILE_PATH)
+    ap.add_argument('--accounts-file', default=ACCOUNTS_PATH)
+    args = ap.parse_args(argv)
+
+    defs = load_definitions(args)
+    if not defs: ap.error('보고서 정의 파일 또는 --report 를 지정하세요.')
+
+    src = ReportSource(args.price_file, args.accounts_file)
+    date = datetime.date.today().strftime('%Y%m%d')
+    failed = 0
+    for i, d in enumerate(defs, 1):
+        t0 = time.perf_counter()
+        try:
+            sheets = run_report(src, d)
+            paths = write_report(sheets, d['out'].format(date=date))
+            rows = sum(len(df) for df in sheets.values())
+            print(f"[{i}/{len(defs)}] {d['type']}: {rows:,}행 → {', '.join(paths)} ({(time.perf_counter() - t0) * 1000:.0f} ms)")
+        except Exception as e:
+            failed += 1
+            print(f"[{i}/{len(defs)}] {d['type']}: 실패 — {e}", file=sys.stderr)
+    print(f"파싱한 파일: {', '.join(f'{k}({p})' for k, p in src.parsed) or '-'}")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
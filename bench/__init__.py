@@ -0,0 +1 @@
+# 페이지 성능 측정용 스크립트 모음
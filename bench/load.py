@@ -0,0 +1,140 @@
+import os
+import sys
+import csv
+import json
+import time
+import random
+import argparse
+import threading
+import subprocess
+import http.client
+from urllib.parse import urlparse
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path: sys.path.insert(0, ROOT)
+
+from bench.run import dataset_for, version_label, parse_sizes, RESULT_DIR
+
+# -----------------------------------------------------------------------------
+# 단가 조회 서비스(service.py) 부하 테스트 — 처리량(요청/초, 조회/초)과 지연시간(p50/p95/p99)
+#   python -m bench.load --size 10000:30 --concurrency 8 --duration 5 --batch 1,20
+#   python -m bench.load --url http://127.0.0.1:8765      # 이미 실행 중인 서비스 측정
+#   --size 를 쓰면 가상 데이터로 서비스를 직접 띄우고 측정 후 종료
+# -----------------------------------------------------------------------------
+DEFAULT_OPS = 'sales_price,purchase_price,compare,basket'
+
+def request(conn, method, path, payload=None):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8') if payload is not None else None
+    conn.request(method, path, body=body, headers={'Content-Type': 'application/json'})
+    resp = conn.getresponse()
+    data = resp.read()
+    if resp.status != 200: raise RuntimeError(f"{method} {path} → {resp.status}: {data[:200]!r}")
+    return json.loads(data)
+
+# --- 조회 종류별 요청 본문 (catalog 의 실제 키에서 무작위 선택) ---
+def make_query(op, cat, rng):
+    if op == 'sales_price':
+        item, spec = rng.choice(cat['sales']); return {'item': item, 'spec': spec}
+    if op == 'purchase_price':
+        item, spec, spec2 = rng.choice(cat['purchase']); return {'item': item, 'spec': spec, 'spec2': spec2}
+    if op == 'compare':
+        keys = rng.sample(cat['purchase'], min(5, len(cat['purchase'])))
+        return {'items': [{'item': i, 'spec': s, 'spec2': s2} for i, s, s2 in keys]}
+    if op == 'basket':
+        keys = rng.sample(cat['basket'], min(20, len(cat['basket'])))
+        return {'lines': [{'item': i, 'spec': s, 'qty': rng.randint(1, 10)} for i, s in keys], 'max_vendors': 3}
+    raise ValueError(op)
+
+def run_load(url, op, batch, concurrency, duration, cat, seed=0):
+    u = urlparse(url)
+    latencies, errors = [], []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(k):
+        rng = random.Random(seed * 1000 + k)
+        conn = http.client.HTTPConnection(u.hostname, u.port, timeout=60)
+        local = []
+        try:
+            while time.perf_counter() < deadline:
+                payload = {'queries': [make_query(op, cat, rng) for _ in range(batch)]}
+                t0 = time.perf_counter()
+                try: request(conn, 'POST', f'/{op}', payload)
+                except Exception as e:
+                    with lock: errors.append(str(e))
+                    conn.close(); conn = http.client.HTTPConnection(u.hostname, u.port, timeout=60)
+                    continue
+                local.append((time.perf_counter() - t0) * 1000)
+        finally:
+            conn.close()
+            with lock: latencies.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(k,)) for k in range(concurrency)]
+    t0 = time.perf_counter()
+    for t in threads: t.start()
+    for t in threads: t.join()
+    elapsed = time.perf_counter() - t0
+
+    lat = np.asarray(latencies) if latencies else np.array([np.nan])
+    return {'op': op, 'batch': batch, 'concurrency': concurrency, 'requests': len(latencies), 'errors': len(errors),
+            'req_per_sec': round(len(latencies) / elapsed, 1), 'queries_per_sec': round(len(latencies) * batch / elapsed, 1),
+            'p50_ms': round(float(np.percentile(lat, 50)), 2), 'p95_ms': round(float(np.percentile(lat, 95)), 2),
+            'p99_ms': round(float(np.percentile(lat, 99)), 2)}
+
+def start_service(path, port):
+    proc = subprocess.Popen([sys.executable, os.path.join(ROOT, 'service.py'), '--file', path, '--port', str(port)],
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, cwd=ROOT)
+    proc.stdout.readline()  # 첫 색인 준비 후 시작 메시지 출력
+    if proc.poll() is not None: raise RuntimeError('서비스 시작 실패')
+    return proc
+
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description='단가 조회 서비스 부하 테스트')
+    ap.add_argument('--url', default=None, help='측정할 서비스 주소 (지정하지 않으면 --size 데이터로 직접 실행)')
+    ap.add_argument('--size', default='10000:30', help='가상 데이터 크기 행수:업체수')
+    ap.add_argument('--port', type=int, default=8799)
+    ap.add_argument('--ops', default=DEFAULT_OPS)
+    ap.add_argument('--batch', default='1,20', help='요청당 조회 건수 목록')
+    ap.add_argument('--concurrency', type=int, default=8)
+    ap.add_argument('--duration', type=float, default=5.0, help='조회 종류·배치 크기별 측정 시간(초)')
+    ap.add_argument('--label', default=None)
+    ap.add_argument('--out', default=None)
+    args = ap.parse_args()
+
+    proc = None
+    rows, vendors = parse_sizes(args.size)[0]
+    if args.url: url = args.url
+    else:
+        proc = start_service(os.path.join(dataset_for(rows, vendors), 'price_list.xlsx'), args.port)
+        url = f'http://127.0.0.1:{args.port}'
+
+    try:
+        u = urlparse(url)
+        conn = http.client.HTTPConnection(u.hostname, u.port, timeout=60)
+        cat = request(conn, 'GET', '/catalog')
+        cat = {k: [tuple(x) if isinstance(x, list) else x for x in v] for k, v in cat.items()}
+        results = []
+        for op in [o for o in args.ops.split(',') if o]:
+            for batch in [int(b) for b in args.batch.split(',') if b]:
+                r = run_load(url, op, batch, args.concurrency, args.duration, cat)
+                results.append(r)
+                print(f"{op:<15} batch={batch:<4} {r['req_per_sec']:>9.1f} req/s {r['queries_per_sec']:>10.1f} q/s  "
+                      f"p50 {r['p50_ms']:>7.2f}  p95 {r['p95_ms']:>7.2f}  p99 {r['p99_ms']:>7.2f} ms  err {r['errors']}", flush=True)
+        server_stats = request(conn, 'GET', '/stats')
+        print('\n서버 측 처리 시간 (ms):')
+        for op, s in server_stats['ops'].items():
+            print(f"  {op:<15} 요청 {s['requests']:>7,}  p50 {s['p50_ms']:.2f}  p95 {s['p95_ms']:.2f}  p99 {s['p99_ms']:.2f}")
+        conn.close()
+    finally:
+        if proc: proc.terminate(); proc.wait()
+
+    label = args.label or version_label()
+    out = args.out or os.path.join(RESULT_DIR, f'load_{label}_{rows}r_{vendors}v.csv')
+    os.makedirs(os.path.dirname(out) or '.', exist_ok=True)
+    with open(out, 'w', newline='', encoding='utf-8') as f:
+        w = csv.DictWriter(f, fieldnames=['version', 'rows', 'vendors'] + list(results[0]))
+        w.writeheader()
+        for r in results: w.writerow({'version': label, 'rows': rows, 'vendors': vendors, **r})
+    print(f"\n결과 저장: {out}")
@@ -0,0 +1,80 @@
+import os
+import gc
+import sys
+import csv
+import argparse
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path: sys.path.insert(0, ROOT)
+
+from streamlit.logger import set_log_level
+from streamlit.testing.v1 import AppTest
+
+from bench.run import dataset_for, version_label, parse_sizes, RESULT_DIR
+
+# -----------------------------------------------------------------------------
+# 세션당 메모리 측정 — 동시 접속 세션을 AppTest 로 흉내내어 세션 수에 따른 증가량 확인
+#   python -m bench.memory --size 100000:100 --sessions 10
+#   (각 세션: 메인 → 01 → 02 → 03 페이지 순서로 방문, 세션 객체는 끝까지 유지)
+# -----------------------------------------------------------------------------
+VISIT = ['pages/01_sales_price.py', 'pages/02_quote_comparison.py', 'pages/03_vendor_price.py']
+
+def rss_mb():
+    # 리눅스 /proc 기준 상주 메모리 (없으면 빈 값)
+    try:
+        with open('/proc/self/statm') as f: return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except Exception:
+        return ''
+
+def open_session(timeout):
+    at = AppTest.from_file(os.path.join(ROOT, 'app.py'), default_timeout=timeout)
+    at.run()
+    for page in VISIT:
+        at.switch_page(page); at.run()
+        if at.exception: raise RuntimeError(f"{page}: {at.exception[0].value}")
+    return at
+
+def measure(n_sessions, timeout):
+    tracemalloc.start()
+    sessions, rows = [], []
+    for i in range(1, n_sessions + 1):
+        sessions.append(open_session(timeout))
+        gc.collect()
+        rss = rss_mb()
+        rows.append({'sessions': i, 'traced_mb': round(tracemalloc.get_traced_memory()[0] / 2**20, 1),
+                     'rss_mb': round(rss, 1) if rss != '' else ''})
+        print(f"세션 {i:>3}  traced={rows[-1]['traced_mb']:>8} MB  rss={rows[-1]['rss_mb']:>8} MB", flush=True)
+    tracemalloc.stop()
+    return rows
+
+def per_session(rows, key):
+    # 첫 세션(공유 데이터 적재 포함) 이후 세션 1개당 평균 증가량
+    if len(rows) < 2 or rows[0][key] == '': return None
+    return round((rows[-1][key] - rows[0][key]) / (len(rows) - 1), 2)
+
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description='세션당 메모리 측정 (AppTest)')
+    ap.add_argument('--size', default='10000:30', help='가상 데이터 크기 행수:업체수')
+    ap.add_argument('--sessions', type=int, default=10)
+    ap.add_argument('--timeout', type=float, default=300)
+    ap.add_argument('--label', default=None)
+    ap.add_argument('--out', default=None)
+    args = ap.parse_args()
+
+    rows_, vendors = parse_sizes(args.size)[0]
+    data_dir = dataset_for(rows_, vendors)
+    label = args.label or version_label()
+
+    set_log_level('error')  # 사용중단 경고 등 streamlit 로그 숨김 (이후 생성되는 로거 포함)
+    os.chdir(data_dir)
+    rows = measure(args.sessions, args.timeout)
+    print(f"\n첫 세션: traced={rows[0]['traced_mb']} MB / 이후 세션당: traced={per_session(rows, 'traced_mb')} MB, rss={per_session(rows, 'rss_mb')} MB")
+
+    out = args.out or os.path.join(RESULT_DIR, f'memory_{label}_{rows_}r_{vendors}v.csv')
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    with open(out, 'w', newline='', encoding='utf-8') as f:
+        w = csv.DictWriter(f, fieldnames=['version', 'rows', 'vendors', 'sessions', 'traced_mb', 'rss_mb'])
+        w.writeheader()
+        for r in rows: w.writerow({'version': label, 'rows': rows_, 'vendors': vendors, **r})
+    print(f"결과 저장: {out}")
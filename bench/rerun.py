@@ -0,0 +1,203 @@
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import tempfile
+import datetime
+import tracemalloc
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path: sys.path.insert(0, ROOT)
+
+from streamlit import config as st_config
+from streamlit.logger import set_log_level
+from streamlit.testing.v1 import AppTest
+
+from bench.run import dataset_for, version_label, parse_sizes, RESULT_DIR
+from core.profiler import ENV_FLAG, ENV_LOG
+
+# -----------------------------------------------------------------------------
+# 페이지 재실행(rerun) 지연시간 측정 — streamlit.testing AppTest 로 페이지를 헤드리스 실행
+#   python -m bench.rerun --size 10000:30 --repeat 20 --memory
+#   --fragments: 구간 측정을 켜고 st.fragment 본문 시간(fragment_p50_ms)을 함께 기록
+#     AppTest 는 항상 페이지 전체를 다시 실행하므로, 프래그먼트 안 위젯 조작 시 실제 rerun 시간은
+#     p50_ms(전체) 대신 fragment_p50_ms(프래그먼트 본문) 에 해당
+# -----------------------------------------------------------------------------
+PAGES_DIR = os.path.join(ROOT, 'pages')
+
+# --- 시나리오: 위젯 값을 바꾼 뒤 상호작용 이름을 yield 하면 하니스가 at.run() 을 측정 ---
+def sales_price(at, n):
+    vendors = at.multiselect[0].options
+    for i in range(n):
+        at.multiselect[0].set_value(vendors[:(i % 10) + 2])
+        yield '업체 선택'
+    items = at.multiselect[1].options
+    for i in range(n):
+        at.multiselect[1].set_value(items[:(i % 3) + 1])
+        yield '품목 선택'
+    for i in range(n):
+        at.radio[0].set_value(["기본 단가", "단위당 단가"][i % 2])
+        yield '단가 방식 변경'
+
+def quote_comparison(at, n):
+    added = 0
+    for item in at.selectbox(key="sel_item").options:
+        at.selectbox(key="sel_item").set_value(item)
+        yield '품목 선택'
+        for spec in at.selectbox(key="sel_spec").options:
+            at.selectbox(key="sel_spec").set_value(spec)
+            at.button[0].click()
+            yield '견적 라인 추가'
+            added += 1
+            if added >= 50: break
+        if added >= 50: break
+    for i in range(n):
+        keys = [b.key for b in at.button if b.key and b.key.startswith('del_')]
+        if not keys: return
+        at.button(key=keys[0]).click()
+        yield '견적 라인 삭제'
+
+def vendor_price(at, n):
+    vendors = [v for v in at.multiselect[0].options if v != '전체 선택']
+    for i in range(n):
+        at.multiselect[0].set_value(vendors[:(i % 10) + 2])
+        yield '업체 선택'
+    added = 0
+    for item in at.selectbox(key="vp_new_item").options:
+        at.selectbox(key="vp_new_item").set_value(item)
+        yield '품목 선택'
+        spec = at.multiselect(key="vp_new_spec")
+        spec.set_value(spec.options[:5])
+        yield '규격 선택'
+        at.button(key="vp_new_add").click()
+        yield '비교 라인 추가'
+        added += 1
+        if added >= n: return
+
+def quotation_generator(at, n):
+    for i in range(n):
+        at.number_input(key="quote_discount").set_value([5, 10, -5, 0][i % 4])
+        yield '일괄 조정(%) 변경'
+
+def accounts(at, n):
+    base = datetime.date(2026, 7, 1)
+    for i in range(n):
+        at.date_input[0].set_value(base - datetime.timedelta(days=31 * (i % 6)))
+        yield '기준일자 변경'
+
+def cost_analysis(at, n):
+    for i in range(n):
+        at.number_input[0].set_value(1.0 + (i % 10) * 0.5)
+        yield '폭 변경'
+    for v, p in zip(range(1, 4), (900, 12000, 1300)): at.number_input[v].set_value(p)
+    at.run()  # 결과와 [저장] 버튼 표시 (측정 제외)
+    for i in range(n):
+        at.number_input[0].set_value(1.0 + (i % 10) * 0.5)
+        next(b for b in at.button if '저장' in b.label).click()
+        yield '누적표 저장'
+    for i in range(n):
+        at.button(key="cost_clear_all").click()
+        yield '누적표 전체 삭제'
+        next(b for b in at.button if '저장' in b.label).click()
+        at.run()
+
+def labor_cost(at, n):
+    names = at.selectbox[0].options
+    for i in range(n):
+        at.selectbox[0].set_value(names[i % len(names)])
+        yield '품명 변경'
+    at.radio[0].set_value("구간 설정")
+    yield '폭 구간 설정'
+    for i in range(n):
+        at.text_input[0].set_value(["50", "30, 50", "50, 100", "20, 30, 50, 100"][i % 4])
+        yield '길이 변경'
+
+SCENARIOS = {
+    '01_sales_price.py': sales_price,
+    '02_quote_comparison.py': quote_comparison,
+    '03_vendor_price.py': vendor_price,
+    '04_quotation_generator.py': quotation_generator,
+    '05_accounts.py': accounts,
+    '06_cost_analysis.py': cost_analysis,
+    '07_labor_cost_breakdown.py': labor_cost,
+}
+
+def fragment_ms():
+    # 직전 실행에서 st.fragment 본문이 차지한 시간 (--fragments 로 구간 측정을 켠 경우, 구간 로그의 마지막 줄)
+    path = os.environ.get(ENV_LOG)
+    if not os.environ.get(ENV_FLAG) or not path or not os.path.exists(path): return float('nan')
+    with open(path, encoding='utf-8') as f: last = f.readlines()[-1]
+    phases = json.loads(last)['phases']
+    return sum(ms for name, ms in phases.items() if name.endswith(' (fragment)')) or float('nan')
+
+def timed_run(at, memory):
+    if memory:
+        tracemalloc.start(); tracemalloc.reset_peak()
+    t0 = time.perf_counter()
+    at.run()
+    dt = (time.perf_counter() - t0) * 1000
+    peak = 0.0
+    if memory:
+        peak = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+    if at.exception: raise RuntimeError(at.exception[0].value)
+    return dt, peak, fragment_ms()
+
+def run_page(page, scenario, n, memory, timeout):
+    samples = {}
+    at = AppTest.from_file(os.path.join(PAGES_DIR, page), default_timeout=timeout)
+    samples['최초 로드'] = [timed_run(at, memory)]
+    for name in scenario(at, n):
+        samples.setdefault(name, []).append(timed_run(at, memory))
+    rows = []
+    for name, vals in samples.items():
+        ms = np.array([v[0] for v in vals]); mb = [v[1] for v in vals]; frag = np.array([v[2] for v in vals])
+        rows.append({'page': page, 'interaction': name, 'n': len(ms),
+                     'p50_ms': round(float(np.percentile(ms, 50)), 1), 'p95_ms': round(float(np.percentile(ms, 95)), 1),
+                     'fragment_p50_ms': round(float(np.nanpercentile(frag, 50)), 1) if not np.isnan(frag).all() else '',
+                     'peak_mb': round(max(mb), 1) if memory else ''})
+    return rows
+
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description='페이지 rerun 지연시간 측정 (AppTest)')
+    ap.add_argument('--size', default='10000:30', help='가상 데이터 크기 행수:업체수')
+    ap.add_argument('--repeat', type=int, default=10, help='상호작용별 반복 횟수')
+    ap.add_argument('--pages', default='', help='측정할 페이지 파일명 (쉼표 구분, 기본 전체)')
+    ap.add_argument('--memory', action='store_true', help='tracemalloc 으로 최대 메모리 측정 (시간이 느려짐)')
+    ap.add_argument('--fragments', action='store_true', help='구간 측정을 켜고 st.fragment 본문 시간도 기록')
+    ap.add_argument('--timeout', type=float, default=120)
+    ap.add_argument('--label', default=None)
+    ap.add_argument('--out', default=None)
+    args = ap.parse_args()
+
+    rows_, vendors = parse_sizes(args.size)[0]
+    data_dir = dataset_for(rows_, vendors)
+    label = args.label or version_label()
+    pages = [p for p in args.pages.split(',') if p] or list(SCENARIOS)
+
+    if args.fragments:
+        os.environ[ENV_FLAG] = '1'
+        os.environ.setdefault(ENV_LOG, os.path.join(tempfile.mkdtemp(), 'profile.jsonl'))
+    # 사용중단 경고·ScriptRunContext 경고 등 streamlit 로그 숨김 — AppTest 는 첫 실행 때 설정을 읽으며
+    # logger.level 옵션 값으로 로그 레벨을 되돌리므로 옵션도 함께 지정
+    st_config.set_option('logger.level', 'error')
+    set_log_level('error')
+    os.chdir(data_dir)  # 페이지는 현재 폴더의 price_list.xlsx / accounts.xlsx 를 읽음
+    results = []
+    for page in pages:
+        for r in run_page(page, SCENARIOS[page], args.repeat, args.memory, args.timeout):
+            results.append(r)
+            frag = f"  fragment={r['fragment_p50_ms']:>8} ms" if r['fragment_p50_ms'] != '' else ''
+            print(f"{r['page']:<28} {r['interaction']:<14} n={r['n']:<3} p50={r['p50_ms']:>8} ms  p95={r['p95_ms']:>8} ms{frag}  peak={r['peak_mb']} MB", flush=True)
+
+    out = args.out or os.path.join(RESULT_DIR, f'rerun_{label}_{rows_}r_{vendors}v.csv')
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    with open(out, 'w', newline='', encoding='utf-8') as f:
+        w = csv.DictWriter(f, fieldnames=['version', 'rows', 'vendors', 'page', 'interaction', 'n', 'p50_ms', 'p95_ms', 'fragment_p50_ms', 'peak_mb'])
+        w.writeheader()
+        for r in results: w.writerow({'version': label, 'rows': rows_, 'vendors': vendors, **r})
+    print(f"\n결과 저장: {out}")
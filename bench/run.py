@@ -0,0 +1,176 @@
+import os
+import csv
+import time
+import argparse
+import datetime
+import statistics
+import subprocess
+
+import numpy as np
+import pandas as pd
+
+from bench.synth import make_dataset
+from core.sales import prepare_sales, sort_sales, sales_pivot, to_unit_price
+from core.purchase import prepare_purchase, sort_purchase, vendor_comparison, quote_columns, quote_pivot
+from core.basket import price_matrix, basket_prices, vendor_totals, split_plan
+from core.accounts import aging_report
+from core.excel_header import detect_header, apply_header
+from core.labor import labor_base_tables, labor_grid, width_range
+from core.price_diff import diff_sheet
+
+# -----------------------------------------------------------------------------
+# 페이지별 핵심 변환 단계 벤치마크
+#   python -m bench.run --sizes 1000:10,10000:30,100000:100 --repeat 5
+#   python -m bench.run --compare bench/results/이전버전.csv
+# -----------------------------------------------------------------------------
+DEFAULT_SIZES = '1000:10,10000:30,100000:100'
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+RESULT_DIR = os.path.join(os.path.dirname(__file__), 'results')
+
+def version_label():
+    try:
+        rev = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True, stderr=subprocess.DEVNULL).strip()
+        dirty = subprocess.call(['git', 'diff', '--quiet', 'HEAD'], stderr=subprocess.DEVNULL) != 0
+        return rev + ('-dirty' if dirty else '')
+    except Exception:
+        return 'unknown'
+
+def dataset_for(rows, vendors):
+    # 같은 크기의 가상 데이터는 재사용
+    out = os.path.join(DATA_DIR, f'{rows}r_{vendors}v')
+    if not os.path.exists(os.path.join(out, 'price_list.xlsx')):
+        make_dataset(out, rows, vendors)
+    return out
+
+# --- 벤치마크 단계 (각 단계는 state 딕셔너리를 읽고/채움) ---
+def step_load(st):
+    path = os.path.join(st['dir'], 'price_list.xlsx')
+    st['df_sales'] = pd.read_excel(path, sheet_name='Sales_매출단가')
+    st['df_purch'] = pd.read_excel(path, sheet_name='Purchase_매입단가')
+
+def step_sales_sort(st):
+    df, note_col, price_col = prepare_sales(st['df_sales'])
+    st['sales'] = (sort_sales(df, note_col), note_col, price_col)
+
+def step_sales_pivot(st):
+    df_sorted, note_col, price_col = st['sales']
+    vendors = sorted(df_sorted['매출업체'].dropna().unique().astype(str))
+    st['sales_pivot'] = sales_pivot(df_sorted, note_col, price_col, vendors)
+
+def step_unit_conversion(st):
+    to_unit_price(st['sales_pivot'], st['sales'][1])
+
+def step_vendor_comparison(st):
+    df, vendor_col, price_col = prepare_purchase(st['df_purch'])
+    df_sorted = sort_purchase(df)
+    keys = df_sorted[['품목', 'calc_spec', 'display_spec']].drop_duplicates().head(50)
+    cart = [{'item': r[0], 's1': r[1], 's2': r[2]} for r in keys.itertuples(index=False)]
+    vendors = sorted(df[vendor_col].dropna().unique().astype(str))
+    vendor_comparison(df, cart, vendor_col, price_col, vendors)
+
+def step_quote_pivot(st):
+    vendor_col, item_col, price_col, spec_cols = quote_columns(st['df_purch'])
+    st['quote'] = (item_col,) + quote_pivot(st['df_purch'], vendor_col, item_col, price_col, spec_cols)
+
+def step_basket(st):
+    # 500줄 장바구니 × 전체 업체: 업체별 합계 순위 + 분할 구매 (제한 없음 / 최대 3곳)
+    if 'quote' not in st: step_quote_pivot(st)
+    item_col, df_pivot, vendors = st['quote']
+    pm = price_matrix(df_pivot, item_col, vendors)
+    keys = list(pm.rows)
+    basket = [{item_col: keys[i % len(keys)][0], '통합규격': keys[i % len(keys)][1], '수량': 1 + i % 7} for i in range(500)]
+    prices, qty = basket_prices(pm, basket, item_col)
+    vendor_totals(prices, qty, pm.vendors)
+    split_plan(prices, qty)
+    split_plan(prices, qty, 3)
+
+def step_aging(st):
+    path = os.path.join(st['dir'], 'accounts.xlsx')
+    df_raw = pd.read_excel(path, header=None)
+    layout = detect_header(path, 0, marker='업체구분')
+    for mode in ('매출업체', '매입업체'):
+        aging_report(df_raw, datetime.date(2026, 7, 1), mode, layout)
+
+def step_labor_grid(st):
+    path = os.path.join(st['dir'], 'price_list.xlsx')
+    layout = detect_header(path, 'labor_cost', two_row=True)
+    df_labor = apply_header(pd.read_excel(path, sheet_name='labor_cost', header=None), layout)
+    for c in ('품명', '규격', '비고'): df_labor[c] = df_labor[c].fillna("").astype(str)
+    tables = labor_base_tables(df_labor, '품명', '규격', '비고')
+    kinds, base = tables[False]
+    labor_grid(base, kinds, width_range(1.0, 12.0, 0.1), [30.0, 50.0, 100.0])
+
+def step_price_diff(st):
+    # 매출 시트를 단가 5% 변경·1% 삭제한 새 버전과 비교
+    if 'sales' not in st: step_sales_sort(st)
+    df, note_col, price_col = st['sales']
+    if 'sales_new' not in st:
+        rng = np.random.default_rng(0)
+        new = df.assign(**{price_col: pd.to_numeric(df[price_col], errors='coerce') * np.where(rng.random(len(df)) < 0.05, 1.1, 1.0)})
+        st['sales_new'] = new[rng.random(len(new)) > 0.01]
+    cols = ['품목', '규격', note_col, '매출업체']
+    diff_sheet(df, cols, price_col, st['sales_new'], cols, price_col)
+
+STEPS = [
+    ('load', step_load),
+    ('sales_sort', step_sales_sort),
+    ('sales_pivot', step_sales_pivot),
+    ('unit_conversion', step_unit_conversion),
+    ('vendor_comparison', step_vendor_comparison),
+    ('quote_pivot', step_quote_pivot),
+    ('basket', step_basket),
+    ('aging', step_aging),
+    ('labor_grid', step_labor_grid),
+    ('price_diff', step_price_diff),
+]
+
+def run(sizes, repeat, only=None):
+    results = []
+    for rows, vendors in sizes:
+        state = {'dir': dataset_for(rows, vendors)}
+        for name, fn in STEPS:
+            if only and name not in only and name != 'load': continue
+            times = []
+            for _ in range(repeat if name != 'load' else 1):
+                t0 = time.perf_counter(); fn(state); times.append((time.perf_counter() - t0) * 1000)
+            results.append({'rows': rows, 'vendors': vendors, 'step': name,
+                            'median_ms': round(statistics.median(times), 2), 'min_ms': round(min(times), 2), 'n': len(times)})
+            print(f"{rows:>7} {vendors:>4} {name:<18} {results[-1]['median_ms']:>10.2f} ms", flush=True)
+    return results
+
+def write_results(results, label, path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        w = csv.DictWriter(f, fieldnames=['version', 'rows', 'vendors', 'step', 'median_ms', 'min_ms', 'n'])
+        w.writeheader()
+        for r in results: w.writerow({'version': label, **r})
+
+def compare(results, other_path):
+    # 이전 버전 결과와 단계별 중앙값 비교 (ratio < 1 이면 빨라진 것)
+    old = pd.read_csv(other_path)
+    new = pd.DataFrame(results)
+    merged = new.merge(old, on=['rows', 'vendors', 'step'], how='left', suffixes=('', '_old'))
+    merged['ratio'] = (merged['median_ms'] / merged['median_ms_old']).round(2)
+    return merged[['rows', 'vendors', 'step', 'median_ms_old', 'median_ms', 'ratio']]
+
+def parse_sizes(text):
+    return [tuple(int(x) for x in s.split(':')) for s in text.split(',') if s.strip()]
+
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description='핵심 변환 단계 벤치마크')
+    ap.add_argument('--sizes', default=DEFAULT_SIZES, help='행수:업체수 목록 (예: 1000:10,500000:300)')
+    ap.add_argument('--repeat', type=int, default=5)
+    ap.add_argument('--steps', default='', help='실행할 단계 (쉼표 구분, 기본 전체)')
+    ap.add_argument('--label', default=None, help='결과 버전명 (기본: git 커밋)')
+    ap.add_argument('--out', default=None, help='결과 CSV 경로 (기본: bench/results/<버전>.csv)')
+    ap.add_argument('--compare', default=None, help='비교할 이전 결과 CSV')
+    args = ap.parse_args()
+
+    label = args.label or version_label()
+    only = [s for s in args.steps.split(',') if s]
+    results = run(parse_sizes(args.sizes), args.repeat, only)
+    out = args.out or os.path.join(RESULT_DIR, f'{label}.csv')
+    write_results(results, label, out)
+    print(f"\n결과 저장: {out}")
+    if args.compare:
+        print(compare(results, args.compare).to_string(index=False))
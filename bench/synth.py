@@ -0,0 +1,148 @@
+import os
+import re
+import shutil
+import zipfile
+import argparse
+import tempfile
+
+import numpy as np
+import openpyxl
+
+# -----------------------------------------------------------------------------
+# 벤치마크용 가상 price_list.xlsx / accounts.xlsx 생성기
+#   python -m bench.synth --rows 100000 --vendors 50 --out bench/data/100k_50v
+# -----------------------------------------------------------------------------
+CATALOG = [
+    # (품목, 규격 목록, 단위, 기준단가)
+    ('안전망2cm', ['1.2*50', '1.5*50', '1.8*50', '2*50', '2.5*50', '3*50', '4*50', '6mm가공', '8mm가공', '10mm가공'], 'm2', 900),
+    ('안전망1cm', ['1.2*50', '1.8*50', '2*50', '미가공', '가공품'], 'm2', 1600),
+    ('멀티망', ['1.2*30', '1.8*30', '2*30', '3*30'], 'm2', 420),
+    ('럿셀망', ['1.2', '1.5', '1.8', '2.4'], 'R/L', 20000),
+    ('PP로프', ['5mm', '6mm', '8mm', '10mm', '12mm', '16mm'], 'R/L', 25000),
+    ('PE로프', ['6mm', '8mm', '10mm'], 'R/L', 18000),
+    ('와이어로프', ['6*100', '8*100', '10*200', '12*200'], 'R/L', 60000),
+    ('와이어클립', ['6', '8', '10', '12'], 'EA', 130),
+    ('케이블타이', ['200mm', '270mm', '370mm'], '봉', 15000),
+]
+NOTES = ['', 'KS', '로프가공', 'KS로프가공']
+REAL_VENDORS = ['가온건설', '신영산업안전', '네오이앤씨', '동원', '우주안전', '세종스틸', '제이엠산업개발', '전진산업안전',
+                '씨에스산업건설', '타포', '경원안전', '토우코리아', '솔트룩스', '태양산자']
+
+def vendor_names(n):
+    names = REAL_VENDORS[:n]
+    return names + [f"업체{i:03d}" for i in range(len(names), n)]
+
+def make_skus(n_sku, rng):
+    # 기본 카탈로그를 먼저 쓰고, 부족하면 '품목-번호' 변형으로 채움
+    base = [(item, spec, note, unit, price) for item, specs, unit, price in CATALOG for spec in specs for note in NOTES]
+    skus = []
+    k = 0
+    while len(skus) < n_sku:
+        for item, spec, note, unit, price in base:
+            name = item if k == 0 else f"{item}-{k}"
+            skus.append((name, spec, note, unit, price * float(rng.uniform(0.7, 1.3))))
+            if len(skus) >= n_sku: break
+        k += 1
+    return skus
+
+def price_rows(n_rows, n_vendors, rng, density=0.5):
+    # (SKU 번호, 업체 번호, 단가) — 같은 SKU 에 같은 업체가 중복되지 않도록 배치
+    per = max(1, min(n_vendors, int(round(n_vendors * density))))
+    n_sku = int(np.ceil(n_rows / per))
+    sku_idx = np.repeat(np.arange(n_sku), per)[:n_rows]
+    offset = np.tile(np.arange(per), n_sku)[:n_rows]
+    vendor_idx = (sku_idx * 7 + offset) % n_vendors
+    factor = rng.uniform(0.8, 1.2, n_rows)
+    blank = rng.random(n_rows) < 0.03
+    return n_sku, sku_idx, vendor_idx, factor, blank
+
+def _write_sheet(ws, header, rows):
+    ws.append(header)
+    for r in rows: ws.append(r)
+
+def _inject_merges(path, sheet_index, refs):
+    # write-only 모드는 병합셀을 지원하지 않으므로 저장 후 시트 XML 에 <mergeCells> 추가
+    tmp = path + '.tmp'
+    target = f'xl/worksheets/sheet{sheet_index}.xml'
+    with zipfile.ZipFile(path) as zin, zipfile.ZipFile(tmp, 'w', zipfile.ZIP_DEFLATED) as zout:
+        for info in zin.infolist():
+            data = zin.read(info.filename)
+            if info.filename == target:
+                merges = ''.join(f'<mergeCell ref="{r}"/>' for r in refs)
+                data = re.sub(rb'</sheetData>', f'</sheetData><mergeCells count="{len(refs)}">{merges}</mergeCells>'.encode(), data, count=1)
+            zout.writestr(info, data)
+    shutil.move(tmp, path)
+
+def make_price_list(path, n_rows=10000, n_vendors=30, seed=0):
+    rng = np.random.default_rng(seed)
+    vendors = vendor_names(n_vendors)
+    wb = openpyxl.Workbook(write_only=True)
+
+    # Sales_매출단가
+    n_sku, sku_idx, vendor_idx, factor, blank = price_rows(n_rows, n_vendors, rng)
+    skus = make_skus(n_sku, rng)
+    ws = wb.create_sheet('Sales_매출단가')
+    _write_sheet(ws, ['품목', '규격', '비고 1', '단위', '매출업체', '현재매출단가'], (
+        [skus[s][0], skus[s][1], skus[s][2], skus[s][3], vendors[v], None if b else int(round(skus[s][4] * f * 1.25, -1))]
+        for s, v, f, b in zip(sku_idx, vendor_idx, factor, blank)
+    ))
+
+    # Purchase_매입단가
+    n_sku, sku_idx, vendor_idx, factor, blank = price_rows(n_rows, n_vendors, rng)
+    skus = make_skus(n_sku, rng)
+    ws = wb.create_sheet('Purchase_매입단가')
+    _write_sheet(ws, ['품목', '규격1', '규격2', '매입업체', '매입단가'], (
+        [skus[s][0], skus[s][1], skus[s][2], vendors[v], None if b else int(round(skus[s][4] * f, -1))]
+        for s, v, f, b in zip(sku_idx, vendor_idx, factor, blank)
+    ))
+
+    # labor_cost (제목줄 + 두 줄 병합 헤더)
+    kinds = vendors[:min(n_vendors, 8)]
+    ws = wb.create_sheet('labor_cost')
+    ws.append(['인건비 단가표'])
+    top = ['', '', '', '']; bottom = ['품명', '규격', '단위', '비고']
+    for k in kinds: top += [k, '']; bottom += ['단가', '메모']
+    ws.append(top); ws.append(bottom)
+    for flame in ('', '(방염)'):
+        for spec, p in [('미가공', 750), ('6mm가공', 1100), ('8mm가공', 1150), ('10mm가공', 1300), ('12mm가공', 1450)]:
+            ws.append([f'안전망2cm{flame}', spec, 'm2', ''] + sum([[int(p * (1.2 if flame else 1) * rng.uniform(0.9, 1.1)), ''] for _ in kinds], []))
+    for spec, p in [('6mm', 12000), ('8mm', 20000), ('10mm', 30000), ('12 mm', 43000)]:
+        ws.append(['PP로프', spec, 'R/L', ''] + sum([[int(p * rng.uniform(0.9, 1.1)), ''] for _ in kinds], []))
+
+    wb.save(path)
+    col = openpyxl.utils.get_column_letter
+    _inject_merges(path, 3, [f'{col(5 + 2 * i)}2:{col(6 + 2 * i)}2' for i in range(len(kinds))])
+
+def make_accounts(path, n_vendors=30, months=6, seed=0):
+    rng = np.random.default_rng(seed)
+    vendors = vendor_names(n_vendors)
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet('입출금장부(요약)')
+    ws.append(['석미세이프 매입매출 잔고표'])
+    ws.append([None, None, '2026.07.01'])
+    ws.append(['업체구분', '업체', '합계 : 결제금액', '비고'])
+    for cat, half in (('매입업체', vendors[::2]), ('매출업체', vendors[1::2])):
+        total = 0
+        for v in half:
+            for m in range(1, months + 1):
+                if rng.random() < 0.4: continue
+                amt = int(rng.uniform(1e6, 8e7)); total += amt
+                ws.append([None, f"{v}26{m:02d}", amt, '400추가' if rng.random() < 0.05 else None])
+        ws.append([f'{cat} 요약', None, total])
+    wb.save(path)
+
+def make_dataset(out_dir, n_rows=10000, n_vendors=30, seed=0):
+    os.makedirs(out_dir, exist_ok=True)
+    make_price_list(os.path.join(out_dir, 'price_list.xlsx'), n_rows, n_vendors, seed)
+    make_accounts(os.path.join(out_dir, 'accounts.xlsx'), n_vendors, seed=seed)
+    return out_dir
+
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description='벤치마크용 가상 엑셀 생성')
+    ap.add_argument('--rows', type=int, default=10000, help='매출/매입 시트 행 수 (1k ~ 500k)')
+    ap.add_argument('--vendors', type=int, default=30, help='업체 수 (10 ~ 300)')
+    ap.add_argument('--seed', type=int, default=0)
+    ap.add_argument('--out', default=None, help='출력 폴더 (기본: 임시 폴더)')
+    args = ap.parse_args()
+    out = args.out or tempfile.mkdtemp(prefix='ms_bench_')
+    print(make_dataset(out, args.rows, args.vendors, args.seed))
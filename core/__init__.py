@@ -0,0 +1 @@
+# 페이지(pages/)에서 공통으로 사용하는 계산 로직 모음
@@ -0,0 +1,104 @@
+import re
+import pandas as pd
+
+from core.excel_header import apply_header
+
+# -----------------------------------------------------------------------------
+# 미수금/미지급금 잔고 및 연체 계산 (pages/05_accounts.py)
+# -----------------------------------------------------------------------------
+def aging_report(df_raw, ref_date, mode="매출업체", layout=None):
+    try:
+        # 헤더('업체구분' 행) 위치는 detect_header 에서 미리 탐지 (파일 버전별 캐시)
+        df = apply_header(df_raw, layout) if layout is not None else df_raw.copy()
+            
+        df.columns = ['업체구분', '업체', '결제금액'] + list(df.columns[3:])
+        
+        # 새 양식 대응: 1열이 비어있어도 요약행 기준으로 매입/매출 자동 분류
+        current_cat = "매입업체"
+        for i in df.index:
+            row_val = str(df.loc[i, '업체구분']) + str(df.loc[i, '업체'])
+            if '매출' in row_val and '요약' not in row_val: current_cat = "매출업체"
+            elif '매입' in row_val and '요약' not in row_val: current_cat = "매입업체"
+            
+            df.loc[i, '업체구분'] = current_cat
+            
+            if '매입' in row_val and '요약' in row_val: 
+                current_cat = "매출업체"
+        
+        df_target = df[df['업체구분'] == mode].copy()
+        df_target = df_target.dropna(subset=['업체'])
+        df_target = df_target[~df_target['업체'].astype(str).str.contains('요약')]
+        
+        df_target['결제금액'] = df_target['결제금액'].astype(str).str.replace(',', '').str.replace('₩', '').str.strip()
+        df_target['금액_백만'] = pd.to_numeric(df_target['결제금액'], errors='coerce') / 1_000_000
+        df_target = df_target.dropna(subset=['금액_백만'])
+
+        def extract_info(val):
+            val_str = str(val).strip()
+            match = re.search(r'^(.*?)(\d{4})$', val_str)
+            if match: return match.group(1).strip(), match.group(2)
+            return val_str, None
+            
+        df_target[['거래처명', 'YYMM']] = df_target['업체'].apply(lambda x: pd.Series(extract_info(x)))
+        
+        # 비고 컬럼 처리
+        if '비고' not in df_target.columns:
+            df_target['비고'] = ''
+        df_target['비고'] = df_target['비고'].fillna('').astype(str)
+        
+        def calc_delay(yymm):
+            if not yymm: return 0
+            y = 2000 + int(yymm[:2])
+            m = int(yymm[2:])
+            # 당월을 1개월 차로 계산하기 위해 + 1 추가
+            delay = (ref_date.year - y) * 12 + (ref_date.month - m) + 1
+            return delay if delay >= 0 else 0
+            
+        df_target['연체개월'] = df_target['YYMM'].apply(calc_delay)
+        
+        result = []
+        for name, group in df_target.groupby('거래처명'):
+            total_amt = group['금액_백만'].sum()
+            if total_amt <= 0: continue
+            
+            max_delay = group['연체개월'].max()
+            note_parts = []
+            for d in sorted(group['연체개월'].unique(), reverse=True):
+                amt = group[group['연체개월'] == d]['금액_백만'].sum()
+                if amt > 0:
+                    # 해당 연체개월의 YYMM 값 가져오기
+                    yymm_val = group[group['연체개월'] == d]['YYMM'].iloc[0]
+                    yymm_str = f"({yymm_val[:2]}.{int(yymm_val[2:])}月)" if yymm_val and len(str(yymm_val)) == 4 else ""
+                    
+                    label = f"{int(d)}개월{yymm_str}"
+                    note_parts.append(f"{label}: <span style='color: red; font-weight: bold;'>{amt:.1f}</span>")
+                    
+            # 비고 내용 추출
+            bigo_parts = []
+            for _, row in group.iterrows():
+                b_val = str(row['비고']).strip()
+                if b_val and b_val.lower() != 'nan':
+                    # '400추가' -> '400만원추가' 로 변환 (이미 '만'이 있으면 건너뜀)
+                    b_val = re.sub(r'(\d+)(추가)', r'\1만원\2', b_val)
+                    
+                    yymm_val = row['YYMM']
+                    yymm_str = f"({yymm_val[:2]}.{int(yymm_val[2:])}月)" if yymm_val and len(str(yymm_val)) == 4 else ""
+                    bigo_parts.append(f"{yymm_str} {b_val}".strip())
+                    
+            result.append({
+                '거래처명': name,
+                '총액': round(total_amt, 1),
+                '최대 경과': f"{int(max_delay)}개월" if max_delay > 0 else "1개월",
+                '상세 비고': " / ".join(note_parts),
+                '비고': " / ".join(bigo_parts),
+                '_sort': total_amt
+            })
+            
+        return pd.DataFrame(result).sort_values('_sort', ascending=False).drop(columns=['_sort']) if result else pd.DataFrame()
+    except: 
+        return pd.DataFrame()
+
+def plain_report(df):
+    # 엑셀/CSV 저장용: '상세 비고' 의 강조 HTML 태그 제거
+    if df.empty: return df
+    return df.assign(**{'상세 비고': df['상세 비고'].str.replace(r'<[^>]+>', '', regex=True)})
@@ -0,0 +1,104 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# -----------------------------------------------------------------------------
+# 견적 장바구니 × 전체 업체 단가 행렬 (02 매입견적 비교)
+#   단가 행렬은 파일 버전당 한 번 만들고(core/derived.py), 장바구니가 바뀔 때는 행 번호만 골라 계산
+#   단가가 없는 칸은 NaN = 해당 업체 미취급 (0원으로 보지 않음)
+# -----------------------------------------------------------------------------
+PriceMatrix = namedtuple('PriceMatrix', ['rows', 'vendors', 'prices'])  # (품목, 통합규격) → 행 번호, 업체 목록, 행×업체 단가
+
+def price_matrix(df_pivot, item_col, vendors):
+    keys = zip(df_pivot[item_col].tolist(), df_pivot['통합규격'].tolist())
+    prices = df_pivot[list(vendors)].to_numpy(dtype=np.float64, na_value=np.nan)
+    return PriceMatrix({k: i for i, k in enumerate(keys)}, list(vendors), prices)
+
+def basket_prices(pm, quote_list, item_col):
+    # 장바구니 줄별 (단가 행: 줄 × 업체, 수량) — 단가표에 없는 품목은 모든 업체 NaN
+    idx = np.array([pm.rows.get((x[item_col], x['통합규격']), -1) for x in quote_list], dtype=np.intp)
+    prices = np.full((len(idx), len(pm.vendors)), np.nan)
+    prices[idx >= 0] = pm.prices[idx[idx >= 0]]
+    qty = np.array([x['수량'] for x in quote_list], dtype=np.float64)
+    return prices, qty
+
+def vendor_totals(prices, qty, vendors):
+    # 업체별 장바구니 합계 (취급 품목만 합산) — 전 품목 취급 업체 먼저, 그다음 취급 품목 수·합계 순으로 순위
+    cost = prices * qty[:, None]
+    covered = (~np.isnan(prices)).sum(axis=0)
+    totals = np.nansum(cost, axis=0)
+    order = np.lexsort((totals, -covered))
+    df = pd.DataFrame({'업체': np.asarray(vendors, dtype=object)[order], '합계': totals[order],
+                       '취급 품목': covered[order], '미취급 품목': len(qty) - covered[order]})
+    df.insert(0, '순위', np.arange(1, len(df) + 1))
+    return df
+
+def _selection_cost(cost, chosen):
+    # 고른 업체들 중 줄별 최저가 → (미취급 줄 수, 합계)
+    best = cost[:, chosen].min(axis=1)
+    missing = np.isinf(best)
+    return int(missing.sum()), float(best[~missing].sum())
+
+def split_plan(prices, qty, max_vendors=None, max_rounds=20):
+    # 줄별 최저가 업체로 나눠 구매하는 계획 → 줄별 선택 업체 번호 (-1 = 아무 업체도 단가 없음)
+    #   max_vendors 가 없으면 줄별 최저가 (정확한 최적)
+    #   있으면 업체 수 제한: 탐욕 선택(추가 시 합계가 가장 많이 줄어드는 업체) 후 1:1 교체로 개선 (근사 최적)
+    #   미취급 줄을 줄이는 것이 합계보다 우선 (업체 한 곳이라도 단가가 있는 줄은 가능한 한 포함)
+    cost = np.where(np.isnan(prices), np.inf, prices * qty[:, None])
+    n_lines, n_vendors = cost.shape
+    priced = ~np.isinf(cost).all(axis=1) if n_vendors else np.zeros(n_lines, dtype=bool)
+    assign = np.full(n_lines, -1, dtype=np.intp)
+    if not priced.any(): return assign
+
+    c = cost[priced]
+    if max_vendors is None or max_vendors >= n_vendors:
+        assign[priced] = c.argmin(axis=1)
+        return assign
+
+    # 미취급 벌점: 어떤 합계 차이보다 큰 값 → 줄을 덮는 것이 항상 우선
+    penalty = np.where(np.isinf(c), np.nan, c)
+    penalty = np.nansum(np.nanmax(penalty, axis=1)) + 1.0
+    c = np.where(np.isinf(c), penalty, c)
+
+    chosen = []
+    best = np.full(len(c), penalty * 2)
+    for _ in range(max(1, max_vendors)):
+        totals = np.minimum(best[:, None], c).sum(axis=0)
+        totals[chosen] = np.inf
+        v = int(totals.argmin())
+        if chosen and totals[v] >= best.sum(): break  # 더 추가해도 줄지 않음
+        chosen.append(v); best = np.minimum(best, c[:, v])
+
+    # 교체 개선: 고른 업체 하나를 빼고 다른 업체를 넣었을 때 합계가 줄면 교체
+    for _ in range(max_rounds):
+        current = c[:, chosen].min(axis=1).sum()
+        improved = False
+        for k in range(len(chosen)):
+            rest = chosen[:k] + chosen[k + 1:]
+            base = c[:, rest].min(axis=1) if rest else np.full(len(c), penalty * 2)
+            totals = np.minimum(base[:, None], c).sum(axis=0)
+            totals[chosen] = np.inf
+            v = int(totals.argmin())
+            if totals[v] < current - 1e-9:
+                chosen[k] = v; improved = True
+                break
+        if not improved: break
+
+    sub = cost[priced][:, chosen]
+    pick = sub.argmin(axis=1)
+    assign[priced] = np.where(np.isinf(sub[np.arange(len(sub)), pick]), -1, np.asarray(chosen)[pick])
+    return assign
+
+def plan_table(quote_list, item_col, prices, qty, vendors, assign):
+    # 분할 구매 계획 표 (줄별 구매 업체·단가·합계, 단가 없는 줄은 업체 '-')
+    ok = assign >= 0
+    unit = np.where(ok, prices[np.arange(len(assign)), np.where(ok, assign, 0)], np.nan)
+    return pd.DataFrame({
+        '품목': [x[item_col] for x in quote_list],
+        '규격': [x['통합규격'] for x in quote_list],
+        '수량': qty.astype(np.int64),
+        '구매 업체': np.where(ok, np.asarray(vendors, dtype=object)[np.where(ok, assign, 0)], '-'),
+        '단가': unit,
+        '합계': unit * qty,
+    })
@@ -0,0 +1,52 @@
+import re
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# -----------------------------------------------------------------------------
+# 품목/규격/비고 표기 정규화 (시트 간 연결 키)
+#   "6mm가공" / "6 mm 가공" / "6m/m가공" / "6파이 가공" → "6mm가공",  "1.2×50" / "1.2 x 50" → "1.2*50"
+#   문자열 하나당 한 번만 계산(메모), 컬럼은 서로 다른 값만 변환 후 행에 펼침 → 조인은 정규화 키 일치(해시)로 처리
+#   정규화 결과표(canonical_table)는 메인 화면에서 검토 가능
+# -----------------------------------------------------------------------------
+CANON_CACHE_SIZE = 65536
+
+# (시트, 컬럼 역할) — Sales: 품목/규격/비고, Purchase: 품목/규격1(calc_spec)/규격2(display_spec)
+CANON_FIELDS = ['품목', '규격', '비고']
+
+@lru_cache(maxsize=CANON_CACHE_SIZE)
+def canonical(text):
+    t = unicodedata.normalize('NFKC', str(text)).lower()  # 전각 문자·㎜ 등 호환 문자 정리
+    t = re.sub(r'\s+', '', t)
+    t = t.replace('m/m', 'mm')
+    t = re.sub(r'(?<=\d)(?:파이|φ|ø)', 'mm', t)
+    t = re.sub(r'(?<=\d)[x×](?=\d)', '*', t)
+    t = re.sub(r'(?<![\d.])(\d+)\.0+(?![\d])', r'\1', t)  # 6.0 → 6
+    t = re.sub(r'^(\d+)가공', r'\1mm가공', t)               # 6가공 → 6mm가공
+    return t
+
+def canonical_values(values):
+    # Series → 행별 정규화 문자열 배열 (서로 다른 값만 변환, 빈 값은 "")
+    cat = values.astype('category').array
+    mapped = np.array([canonical(v) for v in cat.categories] + [''], dtype=object)
+    return mapped[np.asarray(cat.codes)]
+
+def canonical_keys(df, cols):
+    # 여러 컬럼을 이어 붙인 연결 키 (품목|규격|비고)
+    parts = [canonical_values(df[c]) for c in cols]
+    return np.array(['\x1f'.join(t) for t in zip(*parts)], dtype=object)
+
+def canonical_table(sources):
+    # 검토용 정규화 표: sources = [(시트명, df, [품목 컬럼, 규격 컬럼, 비고 컬럼]), ...]
+    #   같은 정규화 키로 묶이는 원본 표기가 여러 개인지('표기 수') 확인용
+    frames = []
+    for sheet, df, cols in sources:
+        for field, c in zip(CANON_FIELDS, cols):
+            counts = df[c].astype(str).value_counts(sort=False)
+            frames.append(pd.DataFrame({'구분': field, '정규화 키': [canonical(v) for v in counts.index],
+                                        '원본 표기': counts.index.astype(str), '시트': sheet, '행 수': counts.to_numpy()}))
+    table = pd.concat(frames, ignore_index=True)
+    table['표기 수'] = table.groupby(['구분', '정규화 키'])['원본 표기'].transform('nunique')
+    return table.sort_values(['구분', '정규화 키', '시트', '원본 표기'], ignore_index=True)
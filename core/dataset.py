@@ -0,0 +1,47 @@
+import os
+
+import streamlit as st
+
+from core.workbook import FILE_PATH, file_version, read_dataset
+from core.shared_dataset import shared_root, published, attach
+
+# -----------------------------------------------------------------------------
+# 매출/매입 단가 데이터 (프로세스 전체에서 한 벌만 보관, 모든 세션이 공유)
+#   - 세션마다 st.session_state 에 사본을 두지 않음
+#   - 공유 DataFrame 은 읽기 전용으로 취급: 페이지는 슬라이스/필터 결과만 만들고
+#     컬럼 추가·값 변경이 필요하면 assign()/copy() 로 새 객체를 만들어 사용
+#   - 시트 파싱·정렬·압축은 core/workbook.py (Streamlit 없는 배치 작업과 공용)
+#   - 여러 서버 프로세스 운영 시 PRICE_SHARED_DIR 를 지정하면 publish.py 가 게시한 버전을 매핑해 사용
+#     (엑셀 파싱 없음, 모든 프로세스가 한 벌 공유 — core/shared_dataset.py), 아직 게시 전이면 직접 파싱
+# -----------------------------------------------------------------------------
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _load(path, version):
+    # 파일 버전이 바뀌면 새로 읽고, 이전 버전은 max_entries 를 넘는 순간 해제됨
+    return read_dataset(path, version)
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _attach(root, tag):
+    # 게시된 버전 매핑 → (Dataset, 인건비 기준표) — 새 버전이 게시되면 태그가 바뀌어 다시 매핑
+    return attach(root, tag)
+
+def dataset_source(path=FILE_PATH):
+    # 데이터 출처 키: ('shared', 공유 폴더, 태그) 또는 ('file', 경로, 파일 버전), 둘 다 없으면 None
+    root = shared_root() if path == FILE_PATH else None
+    current = published(root) if root else None
+    if current: return ('shared', root, current['tag'])
+    if not os.path.exists(path): return None
+    return ('file', path, file_version(path))
+
+def open_dataset(source):
+    kind, where, version = source
+    return _attach(where, version)[0] if kind == 'shared' else _load(where, version)
+
+def load_dataset(path=FILE_PATH):
+    # 파일이 없으면 None
+    source = dataset_source(path)
+    return None if source is None else open_dataset(source)
+
+def shared_labor_base(path=FILE_PATH):
+    # 공유 모드면 게시된 07 인건비 기준표, 아니면 None (페이지가 파일에서 직접 계산)
+    source = dataset_source(path)
+    return _attach(source[1], source[2])[1] if source and source[0] == 'shared' else None
@@ -0,0 +1,144 @@
+from collections import namedtuple
+
+import streamlit as st
+
+from core.sales import DEFAULT_VENDORS, robust_natural_sort_key, sales_pivot, to_unit_price
+from core.purchase import KEY_COLS, quote_columns, quote_pivot, sorted_quote_items, natural_sort_key_simple, all_spec_options
+from core.labor import read_labor_base
+from core.search import SearchIndex
+from core.filter_index import FilterIndex
+from core.basket import price_matrix
+from core.margin import margin_index
+from core.canonical import canonical_table
+from core.workbook import read_dataset
+from core.price_diff import price_diff
+from core.price_history import load_index
+from core.price_stats import price_stats
+from core.quotation import customer_price_index
+
+# -----------------------------------------------------------------------------
+# 페이지별 파생 데이터 (위젯 선택과 무관한 부분) — 파일 버전별로 한 번만 계산해 모든 세션이 공유
+#   서버 시작 시 core/prewarm.py 가 미리 채워두고, 아직 준비되지 않았으면 페이지가 직접 계산
+#   (_ds 처럼 밑줄로 시작하는 인자는 캐시 키에서 제외되므로 version 으로 구분)
+# -----------------------------------------------------------------------------
+SalesOptions = namedtuple('SalesOptions', ['vendors', 'items', 'specs', 'notes'])  # 필터 선택 전 선택지
+QuoteData = namedtuple('QuoteData', ['vendor_col', 'item_col', 'price_col', 'df_pivot', 'vendors', 'items', 'specs'])
+PurchaseOptions = namedtuple('PurchaseOptions', ['vendors', 'items', 'specs'])
+
+UNIT_MODES = ["기본 단가", "단위당 단가"]
+
+# --- 01 매출단가 조회 ---
+@st.cache_resource(show_spinner=False, max_entries=2)
+def sales_options(version, _ds):
+    df_sorted, note_col, _ = _ds.sales
+    return SalesOptions(sorted(df_sorted['매출업체'].dropna().unique().astype(str)),
+                        [x for x in df_sorted['품목'].unique().tolist() if str(x).strip() != ""],
+                        [x for x in sorted(df_sorted['규격'].unique().tolist(), key=robust_natural_sort_key) if str(x).strip() != ""],
+                        [x for x in df_sorted[note_col].unique().tolist() if str(x).strip() != ""])
+
+def default_sales_vendors(options):
+    return [v for v in DEFAULT_VENDORS if v in options.vendors]
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def sales_view(version, vendors, price_mode, _ds):
+    # 필터 없이 전체 품목을 볼 때의 업체별 단가표 (첫 화면)
+    df_sorted, note_col, price_col = _ds.sales
+    df_display = sales_pivot(df_sorted, note_col, price_col, list(vendors))
+    return to_unit_price(df_display, note_col) if price_mode == "단위당 단가" else df_display
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def sales_search(version, _ds):
+    opts = sales_options(version, _ds)
+    return {'vendors': SearchIndex(opts.vendors), 'items': SearchIndex(opts.items),
+            'specs': SearchIndex(opts.specs), 'notes': SearchIndex(opts.notes)}
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def sales_filter_index(version, _ds):
+    df_sorted, note_col, _ = _ds.sales
+    return FilterIndex(df_sorted, ['품목', '규격', note_col, '매출업체'])
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def sales_stats(version, _ds):
+    # (품목, 규격, 비고, 단위) 별 전체 매출업체 단가 통계 (선택 업체와 무관)
+    df_sorted, note_col, price_col = _ds.sales
+    return price_stats(df_sorted, ['품목', '규격', note_col, '단위'], '매출업체', price_col)
+
+# --- 02 매입견적 비교 ---
+@st.cache_resource(show_spinner=False, max_entries=2)
+def quote_data(version, _ds):
+    df_raw = _ds.purch_raw
+    vendor_col, item_col, price_col, spec_cols = quote_columns(df_raw)
+    if not (vendor_col and item_col and price_col): return QuoteData(vendor_col, item_col, price_col, None, [], [], {})
+    df_pivot, vendors = quote_pivot(df_raw, vendor_col, item_col, price_col, spec_cols)
+    specs = {item: sorted(g['통합규격'].unique().tolist(), key=natural_sort_key_simple)
+             for item, g in df_pivot.groupby(item_col, sort=False, observed=True)}
+    return QuoteData(vendor_col, item_col, price_col, df_pivot, vendors,
+                     sorted_quote_items(df_pivot[item_col].unique().tolist()), specs)
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def quote_search(version, _ds):
+    return {'items': SearchIndex(quote_data(version, _ds).items)}
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def quote_matrix(version, _ds):
+    # (품목, 통합규격) × 전체 업체 단가 행렬 (장바구니 업체별 합계·분할 구매 계산용)
+    qd = quote_data(version, _ds)
+    if qd.df_pivot is None: return None
+    return price_matrix(qd.df_pivot, qd.item_col, qd.vendors)
+
+# --- 03 업체별 매입단가 조회 ---
+@st.cache_resource(show_spinner=False, max_entries=2)
+def purchase_options(version, _ds):
+    df_sorted, vendor_col, _ = _ds.purch
+    return PurchaseOptions(sorted(df_sorted[vendor_col].dropna().unique().astype(str)),
+                           df_sorted['품목'].unique().tolist(), all_spec_options(df_sorted))
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def purchase_search(version, _ds):
+    opts = purchase_options(version, _ds)
+    return {'vendors': SearchIndex(opts.vendors), 'items': SearchIndex(opts.items)}
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def purchase_stats(version, _ds):
+    # (품목, 규격1, 규격2) 별 전체 매입업체 단가 통계 (기본 단가 기준 — 페이지에서 단위당 단가로 환산)
+    df_sorted, vendor_col, price_col = _ds.purch
+    return price_stats(df_sorted, KEY_COLS, vendor_col, price_col)
+
+# --- 04 견적서 거래처 단가 불러오기 ---
+@st.cache_resource(show_spinner=False, max_entries=2)
+def customer_prices(version, _ds):
+    df_sorted, note_col, price_col = _ds.sales
+    return customer_price_index(df_sorted, note_col, price_col) if price_col else {}
+
+# --- 시트 간 연결 키 정규화 표 (메인 화면 검토용) ---
+@st.cache_resource(show_spinner=False, max_entries=2)
+def canonical_data(version, _ds):
+    df_s, note_col, _ = _ds.sales
+    return canonical_table([('Sales_매출단가', df_s, ['품목', '규격', note_col]),
+                            ('Purchase_매입단가', _ds.purch.df, ['품목', 'calc_spec', 'display_spec'])])
+
+# --- 08 매출·매입 마진 ---
+@st.cache_resource(show_spinner=False, max_entries=2)
+def margin_data(version, _ds):
+    return margin_index(_ds.sales, _ds.purch)
+
+# --- 09 단가표 버전 비교 ---
+@st.cache_resource(show_spinner=False, max_entries=4)
+def workbook_dataset(key, _source):
+    # 비교할 단가표 (파일 경로 또는 업로드 파일 객체) — key: (경로, 파일 버전) 또는 ('upload', md5)
+    return read_dataset(_source, key)
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def diff_data(old_key, new_key, _old, _new):
+    return price_diff(_old, _new)
+
+# --- 10 단가 이력 ---
+@st.cache_resource(show_spinner=False, max_entries=2)
+def history_index(store_key):
+    # store_key: 버전 목록 파일 버전 (새 버전이 기록되면 다시 읽음)
+    return load_index()
+
+# --- 07 폭별 인건비 ---
+@st.cache_data(show_spinner=False)
+def load_labor_base(file_path, version):
+    return read_labor_base(file_path)
@@ -0,0 +1,123 @@
+import re
+import zipfile
+import functools
+import posixpath
+import xml.etree.ElementTree as ET
+from collections import namedtuple
+
+import pandas as pd
+import openpyxl
+from openpyxl.utils import range_boundaries
+
+from core.workbook import file_version
+
+# -----------------------------------------------------------------------------
+# 불규칙한 엑셀 시트의 헤더 위치/컬럼명 자동 탐지 (병합셀 대응)
+# -----------------------------------------------------------------------------
+# header_row: pd.read_excel(header=None) 기준 헤더(아래 줄) 행 번호, 못 찾으면 None
+HeaderLayout = namedtuple('HeaderLayout', ['header_row', 'columns'])
+
+NS_MAIN = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+NS_REL = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+NS_PKG_REL = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+# 두 줄 헤더에서도 상단 그룹명을 붙이지 않는 기본 컬럼
+ID_COLUMNS = ('품명', '단위', '규격', '품목', '비고')
+
+def clean_cell(x):
+    if x is None or (isinstance(x, float) and pd.isna(x)): return ""
+    s = str(x).strip()
+    return "" if s.lower() in ['nan', 'none'] else s.replace(" ", "")
+
+def _sheet_xml_path(zf, sheet_name):
+    wb = ET.fromstring(zf.read('xl/workbook.xml'))
+    rid = next((s.get(f'{NS_REL}id') for s in wb.iter(f'{NS_MAIN}sheet') if s.get('name') == sheet_name), None)
+    if rid is None: return None
+    rels = ET.fromstring(zf.read('xl/_rels/workbook.xml.rels'))
+    target = next((r.get('Target') for r in rels.iter(f'{NS_PKG_REL}Relationship') if r.get('Id') == rid), None)
+    if target is None: return None
+    return target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join('xl', target))
+
+def read_merged_ranges(path, sheet_name):
+    # 시트 XML 의 <mergeCell ref="A1:B2"> 만 스트리밍으로 읽음 (셀 데이터는 읽고 바로 버림)
+    # 반환: [(min_col, min_row, max_col, max_row), ...] (1부터 시작)
+    ranges = []
+    try:
+        with zipfile.ZipFile(path) as zf:
+            xml_path = _sheet_xml_path(zf, sheet_name)
+            if xml_path is None: return ranges
+            with zf.open(xml_path) as f:
+                for _, el in ET.iterparse(f):
+                    if el.tag == f'{NS_MAIN}mergeCell':
+                        ranges.append(range_boundaries(el.get('ref')))
+                    elif el.tag == f'{NS_MAIN}row':
+                        el.clear()
+    except (zipfile.BadZipFile, KeyError):
+        pass  # .xls 등 zip 형식이 아니면 병합 정보 없이 진행
+    return ranges
+
+def read_head_rows(path, sheet_name, n_rows):
+    # 시트 이름(또는 순번)과 앞쪽 n_rows 줄의 값을 반환
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        name = sheet_name if isinstance(sheet_name, str) else wb.sheetnames[sheet_name]
+        return name, [list(r) for r in wb[name].iter_rows(max_row=n_rows, values_only=True)]
+    finally:
+        wb.close()
+
+def _single_row_names(bottom):
+    return [b if b else "Unnamed" for b in bottom]
+
+def _two_row_names(top, bottom, top_merges):
+    # 기본 컬럼(품명/규격...) 위의 값은 제목줄로 보고 무시
+    top = [t if b not in ID_COLUMNS else "" for t, b in zip(top, bottom)]
+    if top_merges:
+        for c0, c1 in top_merges:
+            v = top[c0] if c0 < len(top) else ""
+            for c in range(c0, min(c1 + 1, len(top))):
+                if not top[c] and bottom[c] not in ID_COLUMNS: top[c] = v
+    else:
+        last = ""
+        for i, t in enumerate(top):
+            if t: last = t
+            elif bottom[i] not in ID_COLUMNS: top[i] = last
+
+    names = []
+    for t, b in zip(top, bottom):
+        if b in ID_COLUMNS: names.append(b)
+        elif t and b: names.append(f"{t}_{b}")
+        elif t: names.append(t)
+        elif b: names.append(b)
+        else: names.append("Unnamed")
+    return names
+
+@functools.lru_cache(maxsize=64)
+def _detect(path, sheet_name, version, marker, scan_rows, two_row):
+    sheet_name, rows = read_head_rows(path, sheet_name, scan_rows)
+    width = max((len(r) for r in rows), default=0)
+    grid = [[clean_cell(x) for x in r] + [""] * (width - len(r)) for r in rows]
+
+    pat = re.compile(marker)
+    idx = next((i for i, r in enumerate(grid) if any(pat.search(c) for c in r if c)), None)
+    if idx is None: return HeaderLayout(None, _single_row_names(grid[0]) if grid else [])
+
+    if not two_row or idx == 0:
+        return HeaderLayout(idx, _single_row_names(grid[idx]))
+
+    # 상단 줄(idx-1)에 걸친 병합 범위만 사용 (0부터 시작하는 열 번호로 변환)
+    top_merges = [(c0 - 1, c1 - 1) for c0, r0, c1, r1 in read_merged_ranges(path, sheet_name) if r0 <= idx <= r1]
+    return HeaderLayout(idx, _two_row_names(grid[idx - 1], grid[idx], top_merges))
+
+def detect_header(path, sheet_name=0, marker=r'^(품명|품목)$', scan_rows=30, two_row=False):
+    # 앞쪽 scan_rows 줄만 읽어서 marker(정규식, 공백 제거 후 비교)가 있는 행을 헤더로 판단
+    # 결과는 (파일, 시트, 파일 버전) 단위로 캐시되므로 파일이 바뀌지 않으면 다시 읽지 않음
+    return _detect(path, sheet_name, file_version(path), marker, scan_rows, two_row)
+
+def apply_header(df_raw, layout):
+    # pd.read_excel(header=None) 로 읽은 원본에 탐지된 헤더 적용
+    hdr = layout.header_row if layout.header_row is not None else 0
+    names = list(layout.columns)[:df_raw.shape[1]]
+    names += ["Unnamed"] * (df_raw.shape[1] - len(names))
+    df = df_raw.iloc[hdr + 1:].copy()
+    df.columns = names
+    return df
@@ -0,0 +1,152 @@
+import io
+import re
+import zipfile
+import datetime
+import unicodedata
+from xml.sax.saxutils import escape
+
+import numpy as np
+import pandas as pd
+
+# -----------------------------------------------------------------------------
+# 엑셀(.xlsx) 내보내기 — 화면 표 다운로드 (pages 01/03/04/05) 와 batch.py 보고서 저장
+#   시트 XML 을 행 묶음(CHUNK_ROWS) 단위로 만들어 zip 에 바로 흘려 씀 → 표 크기와 관계없이 메모리 일정
+#     (openpyxl write_only 도 메모리는 일정하지만 lxml 없이는 셀당 수십 µs 라 전체 단가표에 수십 초 걸림)
+#   숫자 열은 숫자 그대로 저장하고 표시 서식(천 단위 구분)만 지정, 머리글 행과 첫 열(품목) 고정
+#   문자열은 공유 문자열 표 없이 셀에 직접 기록 (inlineStr) — 엑셀/openpyxl/pandas 모두 읽을 수 있음
+#   페이지에서는 st.download_button(data=콜백, on_click="ignore") 으로 연결
+#     → 버튼을 누를 때만 Streamlit 이 별도 스레드에서 생성 (페이지 실행이나 다른 세션을 막지 않음)
+# -----------------------------------------------------------------------------
+XLSX_MIME = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+INT_FORMAT = '#,##0'
+FLOAT_FORMAT = '#,##0.0#'
+CHUNK_ROWS = 1000  # 한 번에 object 배열로 바꿔 XML 로 쓰는 행 수
+
+_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_PKG_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+_ILLEGAL = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')  # XML 에 쓸 수 없는 제어 문자
+
+def _text_width(v):
+    # 엑셀 열 너비 근사 (한글 등 전각 문자는 2칸)
+    return sum(2 if unicodedata.east_asian_width(ch) in 'WF' else 1 for ch in str(v))
+
+def _col_letter(j):
+    s = ''
+    j += 1
+    while j: j, r = divmod(j - 1, 26); s = chr(65 + r) + s
+    return s
+
+def sheet_title(name):
+    # 엑셀 시트명 제한: 31자, []:*?/\ 사용 불가
+    return re.sub(r'[\[\]:*?/\\]', '_', str(name))[:31] or 'Sheet'
+
+def column_formats(df):
+    # 숫자 열 → 서식 (정수 값만 있으면 천 단위 정수, 아니면 소수 둘째 자리까지)
+    fmts = {}
+    for c in df.columns:
+        s = df[c]
+        if pd.api.types.is_bool_dtype(s) or not pd.api.types.is_numeric_dtype(s): continue
+        v = s.to_numpy(dtype=np.float64, na_value=np.nan)
+        v = v[np.isfinite(v)]
+        fmts[c] = INT_FORMAT if np.array_equal(v, np.trunc(v)) else FLOAT_FORMAT
+    return fmts
+
+def _cell_xml(ref, v, style):
+    # 셀 하나 → <c> 요소 (빈 값은 '')
+    if v is None or v is pd.NA or v is pd.NaT: return ''
+    if isinstance(v, (bool, np.bool_)): return f'<c r="{ref}" t="b"><v>{int(v)}</v></c>'
+    if isinstance(v, (int, float, np.integer, np.floating)):
+        if v != v or v in (np.inf, -np.inf): return ''
+        num = str(int(v)) if float(v).is_integer() and abs(v) < 1e15 else repr(float(v))
+        return f'<c r="{ref}"{style}><v>{num}</v></c>'
+    if isinstance(v, (datetime.date, pd.Timestamp)): v = v.isoformat(sep=' ') if isinstance(v, datetime.datetime) else v.isoformat()
+    text = escape(_ILLEGAL.sub('', str(v)))
+    if not text: return ''
+    return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+def _write_sheet(f, df, fmt_ids, formats, freeze_cols):
+    cols = list(df.columns)
+    letters = [_col_letter(j) for j in range(len(cols))]
+    fmts = {**column_formats(df), **(formats or {})}
+    styles = [f' s="{fmt_ids[fmts[c]]}"' if c in fmts else '' for c in cols]
+    first = df.iloc[:CHUNK_ROWS].to_numpy(dtype=object)
+
+    # 열 너비 (머리글과 첫 묶음 기준), 머리글 행·앞 열 고정
+    widths = []
+    for j, c in enumerate(cols):
+        sample = [_text_width(f"{v:,.0f}" if isinstance(v, (int, float, np.number)) and v == v else v)
+                  for v in first[:, j] if v is not None and v is not pd.NA and not (isinstance(v, float) and v != v)]
+        widths.append(min(60, max([_text_width(c)] + sample) + 2))
+    n_freeze = min(freeze_cols, len(cols))
+    top_left = f"{_col_letter(n_freeze)}2"
+    pane = (f'<pane xSplit="{n_freeze}" ySplit="1" topLeftCell="{top_left}" activePane="bottomRight" state="frozen"/>'
+            f'<selection pane="bottomRight" activeCell="{top_left}" sqref="{top_left}"/>') if n_freeze else \
+           '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/><selection pane="bottomLeft" activeCell="A2" sqref="A2"/>'
+    head = [f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<worksheet xmlns="{_NS}" xmlns:r="{_REL_NS}">',
+            f'<sheetViews><sheetView workbookViewId="0">{pane}</sheetView></sheetViews><sheetFormatPr defaultRowHeight="15"/>']
+    if cols: head.append('<cols>' + ''.join(f'<col min="{j + 1}" max="{j + 1}" width="{w}" customWidth="1"/>' for j, w in enumerate(widths)) + '</cols>')
+    head.append('<sheetData><row r="1">' + ''.join(
+        f'<c r="{l}1" s="1" t="inlineStr"><is><t xml:space="preserve">{escape(_ILLEGAL.sub("", str(c)))}</t></is></c>' for l, c in zip(letters, cols)) + '</row>')
+    f.write(''.join(head).encode('utf-8'))
+
+    for start in range(0, len(df), CHUNK_ROWS):
+        block = first if start == 0 else df.iloc[start:start + CHUNK_ROWS].to_numpy(dtype=object)
+        out = []
+        for i, row in enumerate(block, start=start + 2):
+            r = str(i)
+            out.append(f'<row r="{r}">' + ''.join(_cell_xml(l + r, v, s) for l, v, s in zip(letters, row, styles)) + '</row>')
+        f.write(''.join(out).encode('utf-8'))
+    f.write(b'</sheetData></worksheet>')
+
+def _styles_xml(fmt_ids):
+    # 0: 기본, 1: 머리글 (굵게 + 회색 배경 + 가운데), 2~: 숫자 서식별
+    num_fmts = ''.join(f'<numFmt numFmtId="{163 + i}" formatCode="{escape(fmt, {chr(34): "&quot;"})}"/>' for fmt, i in sorted(fmt_ids.items(), key=lambda x: x[1]))
+    xfs = ''.join(f'<xf numFmtId="{163 + i}" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>' for _, i in sorted(fmt_ids.items(), key=lambda x: x[1]))
+    return (f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<styleSheet xmlns="{_NS}">'
+            f'<numFmts count="{len(fmt_ids)}">{num_fmts}</numFmts>'
+            '<fonts count="2"><font><sz val="11"/><name val="맑은 고딕"/></font><font><b/><sz val="11"/><name val="맑은 고딕"/></font></fonts>'
+            '<fills count="3"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill>'
+            '<fill><patternFill patternType="solid"><fgColor rgb="FFF2F2F2"/><bgColor indexed="64"/></patternFill></fill></fills>'
+            '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+            '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+            f'<cellXfs count="{2 + len(fmt_ids)}"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+            '<xf numFmtId="0" fontId="1" fillId="2" borderId="0" xfId="0" applyFont="1" applyFill="1" applyAlignment="1"><alignment horizontal="center" vertical="center"/></xf>'
+            f'{xfs}</cellXfs>'
+            '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles></styleSheet>')
+
+def write_xlsx(sheets, target, formats=None, freeze_cols=1):
+    # sheets: {시트명: DataFrame} (인덱스는 저장하지 않음 — 필요하면 reset_index 후 전달), target: 경로 또는 파일 객체
+    #   formats: {열 이름: 엑셀 표시 서식} (자동 서식보다 우선)
+    sheets = dict(sheets) or {'빈 보고서': pd.DataFrame()}
+    names = list(dict.fromkeys(sheet_title(n) for n in sheets))
+    if len(names) != len(sheets): names = [f"{sheet_title(n)[:28]}_{i + 1}" for i, n in enumerate(sheets)]
+    all_fmts = sorted({*(formats or {}).values(), INT_FORMAT, FLOAT_FORMAT})
+    fmt_ids = {fmt: 2 + i for i, fmt in enumerate(all_fmts)}  # 서식 → cellXfs 번호 (numFmtId 는 163 + 번호, 164 이상이 사용자 서식)
+
+    with zipfile.ZipFile(target, 'w', zipfile.ZIP_DEFLATED) as z:
+        n = len(names)
+        z.writestr('[Content_Types].xml',
+                   '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                   '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/><Default Extension="xml" ContentType="application/xml"/>'
+                   '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+                   '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+                   + ''.join(f'<Override PartName="/xl/worksheets/sheet{i + 1}.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>' for i in range(n))
+                   + '</Types>')
+        z.writestr('_rels/.rels', f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<Relationships xmlns="{_PKG_REL_NS}">'
+                   f'<Relationship Id="rId1" Type="{_REL_NS}/officeDocument" Target="xl/workbook.xml"/></Relationships>')
+        z.writestr('xl/workbook.xml', f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<workbook xmlns="{_NS}" xmlns:r="{_REL_NS}"><sheets>'
+                   + ''.join(f'<sheet name="{escape(name, {chr(34): "&quot;"})}" sheetId="{i + 1}" r:id="rId{i + 1}"/>' for i, name in enumerate(names))
+                   + '</sheets></workbook>')
+        z.writestr('xl/_rels/workbook.xml.rels', f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<Relationships xmlns="{_PKG_REL_NS}">'
+                   + ''.join(f'<Relationship Id="rId{i + 1}" Type="{_REL_NS}/worksheet" Target="worksheets/sheet{i + 1}.xml"/>' for i in range(n))
+                   + f'<Relationship Id="rId{n + 1}" Type="{_REL_NS}/styles" Target="styles.xml"/></Relationships>')
+        z.writestr('xl/styles.xml', _styles_xml(fmt_ids))
+        for i, df in enumerate(sheets.values()):
+            with z.open(f'xl/worksheets/sheet{i + 1}.xml', 'w', force_zip64=True) as f:
+                _write_sheet(f, df, fmt_ids, formats, freeze_cols)
+
+def xlsx_bytes(sheets, formats=None, freeze_cols=1):
+    buf = io.BytesIO()
+    write_xlsx(sheets, buf, formats, freeze_cols)
+    return buf.getvalue()
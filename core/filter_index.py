@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+# -----------------------------------------------------------------------------
+# 컬럼별 역색인 (값 → 행 번호 배열) — 데이터 버전당 한 번 만들고 필터는 행 번호 연산으로 처리
+#   행 번호는 색인을 만든 DataFrame 의 위치(iloc) 기준, 값별 배열은 오름차순(= 원래 행 순서)
+# -----------------------------------------------------------------------------
+class FilterIndex:
+    def __init__(self, df, columns):
+        self.codes = {}     # 컬럼 → 행별 카테고리 번호 (빈 값은 -1)
+        self.values = {}    # 컬럼 → 카테고리 값 (번호 순서 = 카테고리 순서)
+        self.postings = {}  # 컬럼 → {값: 행 번호 배열}
+        for c in columns:
+            cat = df[c].astype('category').array
+            codes = np.asarray(cat.codes)
+            order = np.argsort(codes, kind='stable')
+            counts = np.bincount(codes[codes >= 0], minlength=len(cat.categories))
+            splits = np.split(order[(codes < 0).sum():], np.cumsum(counts)[:-1])
+            self.codes[c] = codes
+            self.values[c] = cat.categories
+            self.postings[c] = {v: rows for v, rows in zip(cat.categories, splits) if len(rows)}
+
+    def select(self, col, values, within=None, keep_order=False):
+        # 선택값에 해당하는 행 번호
+        #   within 이 없으면 선택값들의 행을 합침 (keep_order=True 면 선택 순서대로 이어붙임, 아니면 원래 행 순서)
+        #   within 이 있으면 그 행들 중에서만 (within 순서 유지)
+        if within is None:
+            parts = [self.postings[col][v] for v in values if v in self.postings[col]]
+            if not parts: return np.empty(0, dtype=np.intp)
+            rows = np.concatenate(parts)
+            return rows if keep_order else np.sort(rows)
+        wanted = self.values[col].get_indexer([v for v in values if v in self.postings[col]])
+        return within[np.isin(self.codes[col][within], wanted)]
+
+    def options(self, col, rows=None, ordered=True):
+        # 주어진 행들에 나오는 값 목록 (ordered=True: 카테고리 순서, False: 처음 나온 순서)
+        codes = self.codes[col] if rows is None else self.codes[col][rows]
+        codes = np.unique(codes) if ordered else pd.unique(codes)
+        return [self.values[col][c] for c in codes if c >= 0]
@@ -0,0 +1,18 @@
+import streamlit as st
+
+# -----------------------------------------------------------------------------
+# st.fragment 보조 함수 (편집기/목록처럼 자주 바뀌는 부분만 다시 실행)
+#   프래그먼트 안 위젯을 조작하면 그 프래그먼트만 다시 실행되고, 바깥 위젯을 조작하면 페이지 전체가 다시 실행됨
+# -----------------------------------------------------------------------------
+def in_fragment_rerun():
+    # 프래그먼트만 다시 실행 중인지 (페이지 전체 실행 중 프래그먼트 호출이면 False)
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx()
+        return bool(ctx and ctx.fragment_ids_this_run)
+    except Exception:
+        return False
+
+def rerun_fragment():
+    # 프래그먼트 안에서 상태를 바꾼 뒤 다시 그리기 (st.rerun(scope="fragment") 는 전체 실행 중에는 쓸 수 없음)
+    st.rerun(scope="fragment" if in_fragment_rerun() else "app")
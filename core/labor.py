@@ -0,0 +1,152 @@
+import re
+import numpy as np
+import pandas as pd
+
+from core.canonical import canonical
+from core.excel_header import detect_header, apply_header
+
+# -----------------------------------------------------------------------------
+# 폭별 인건비 산출 (pages/07_labor_cost_breakdown.py)
+# -----------------------------------------------------------------------------
+THICKNESSES = (6, 8, 10, 12)
+DEFAULT_WIDTHS = (1.0, 1.2, 1.5, 1.8, 2.0, 2.5, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0, 12.0)
+DEFAULT_LENGTH = 50.0
+ROPE_ROLL_M = 200.0  # 로프 1롤 길이 (m)
+
+LABOR_ITEMS = ('안전망2cm(방염)', '안전망2cm')  # 품명 선택지 (방염 여부로 원가 기본 설정 표 구분)
+RAW_NET_ROW = '[안전망] 미가공(m²)'
+
+def net_row(t): return f'[안전망] {int(t)}mm가공(m²)'
+def rope_row(t): return f'[로프] {int(t)}mm(롤)'
+
+BASE_IDX = [RAW_NET_ROW] + [net_row(t) for t in THICKNESSES] + [rope_row(t) for t in THICKNESSES]
+
+def rope_length_for(lengths, rope_length_per_roll):
+    # 입력된 로프 소요량은 50m 기준 (양쪽 2면 × (50m × 1.2 + 3m) = 126m)
+    # 길이가 달라지면 길이방향 로프 2줄에 신축성 20%를 반영해 증감 (06_cost_analysis 제작망 공식과 동일)
+    lengths = np.asarray(lengths, dtype=float)
+    return rope_length_per_roll + 2 * 1.2 * (lengths - DEFAULT_LENGTH)
+
+# (두께 × 단가종류 × 폭 × 길이) 전체를 한 번의 배열 연산으로 계산
+# 반환: (1롤 인건비, m²당 인건비) 숫자 DataFrame — 행 (길이, 폭), 열 (두께, 단가종류), 가공단가 0 이하 열 제외
+def labor_grid(base, kinds, widths, lengths=(DEFAULT_LENGTH,), rope_length_per_roll=126.0, thicknesses=THICKNESSES):
+    kinds = list(kinds)
+    widths = np.asarray(widths, dtype=float)
+    lengths = np.asarray(lengths, dtype=float)
+
+    proc = base.loc[[net_row(t) for t in thicknesses], kinds].to_numpy(dtype=float)   # (T, K)
+    rope = base.loc[[rope_row(t) for t in thicknesses], kinds].to_numpy(dtype=float)  # (T, K)
+    net = base.loc[RAW_NET_ROW, kinds].to_numpy(dtype=float)                          # (K,)
+
+    area = lengths[:, None] * widths[None, :]                                # (L, W)
+    rope_cost = (rope / ROPE_ROLL_M)[None, None] * rope_length_for(lengths, rope_length_per_roll)[:, None, None, None]  # (L, 1, T, K)
+
+    # 1롤 인건비 = 면적 × (가공단가 - 망 원가) - 로프 원가
+    labor_roll = area[:, :, None, None] * (proc - net[None, :])[None, None] - rope_cost  # (L, W, T, K)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        labor_m2 = np.where(area[:, :, None, None] > 0, labor_roll / area[:, :, None, None], 0.0)
+
+    rows = pd.MultiIndex.from_product([lengths, widths], names=['길이(m)', '폭(m)'])
+    cols = pd.MultiIndex.from_product([list(thicknesses), kinds], names=['두께(mm)', '단가종류'])
+    valid = (proc > 0).ravel()
+
+    n_rows = len(lengths) * len(widths)
+    df_roll = pd.DataFrame(labor_roll.reshape(n_rows, -1), index=rows, columns=cols).loc[:, valid]
+    df_m2 = pd.DataFrame(labor_m2.reshape(n_rows, -1), index=rows, columns=cols).loc[:, valid]
+    return df_roll, df_m2
+
+def format_labor_grid(df_roll, df_m2):
+    # 화면 표시 직전에만 문자열로 변환 ('원' 단어 없이 숫자와 콤마만 표시)
+    roll_txt = df_roll.map(lambda v: f"{int(v):,}")
+    m2_txt = df_m2.map(lambda v: f"({int(v):,}/m²)")
+    return roll_txt + "\n" + m2_txt
+
+def width_range(start, stop, step):
+    # 부동소수 누적 오차 없이 폭 구간 생성 (끝값 포함)
+    if step <= 0 or stop < start: return np.array([float(start)])
+    n = int(np.floor((stop - start) / step + 1e-9)) + 1
+    return np.round(start + step * np.arange(n), 6)
+
+# -----------------------------------------------------------------------------
+# 원가 기본 설정 표 (labor_cost 시트 → 기본 단가표)
+# -----------------------------------------------------------------------------
+ID_KEYWORDS = ('품', '규격', '단위', '업체', '비고', 'Unnamed')
+THICK_UNIT_PAT = re.compile(r'(12|10|8|6)(?:mm|가공|t)')  # 정규화 표기 기준 (m/m·파이 → mm)
+THICK_BARE_PAT = re.compile(r'(?<!\d)(12|10|8|6)(?!\d)')
+
+def melt_labor_prices(df_labor):
+    id_vars = [c for c in df_labor.columns if any(k in c for k in ID_KEYWORDS)]
+    val_vars = [c for c in df_labor.columns if c not in id_vars]
+
+    df_melt = df_labor.melt(id_vars=id_vars, value_vars=val_vars, var_name='단가종류', value_name='단가')
+    df_melt['단가'] = pd.to_numeric(df_melt['단가'].astype(str).str.replace(',', '').str.replace('원', ''), errors='coerce')
+    df_melt = df_melt[df_melt['단가'].notna()]
+    df_melt['단가종류'] = df_melt['단가종류'].astype(str).str.replace("_단가", "").str.replace("단가", "").str.strip()
+    return df_melt
+
+def _thickness(spec):
+    # 단위가 붙은 표기(6mm, 8m/m, 10파이, 12가공...)를 우선, 없으면 단독 숫자로 판단
+    m = THICK_UNIT_PAT.search(canonical(spec)) or THICK_BARE_PAT.search(spec)
+    return float(m.group(1)) if m else np.nan
+
+def extract_thickness(spec):
+    # 서로 다른 규격 표기만 판단 후 행에 펼침
+    spec = spec.fillna("").astype(str)
+    return spec.map({s: _thickness(s) for s in spec.unique()}).astype(float)
+
+def split_labor_prices(df_melt, item_col, spec_col, note_col):
+    # 로프 / 안전망2cm 분류 + 두께, 방염 여부 (행 단위 함수 호출 없이 문자열 연산으로 처리)
+    items = df_melt[item_col].fillna("").astype(str)
+
+    df_rope = df_melt[items.str.contains('로프')].copy()
+    df_rope['thick'] = extract_thickness(df_rope[spec_col])
+
+    df_net = df_melt[items.str.replace(" ", "").str.contains('안전망2cm')].copy()
+    combined = df_net[item_col].astype(str) + df_net[spec_col].astype(str) + df_net[note_col].astype(str)
+    df_net['is_flame'] = combined.str.contains('방염')
+    df_net['thick'] = extract_thickness(df_net[spec_col])
+    return df_net, df_rope
+
+def build_base_table(df_net, df_rope, spec_col, kinds):
+    # 안전망: 5000원 이상은 롤(50m) 단가로 보고 m² 단가로 환산, 두께 없음/'-' 은 미가공
+    raw = df_net['thick'].isna() | (df_net[spec_col].astype(str).str.strip() == '-')
+    net_label = df_net['thick'].map({t: net_row(t) for t in THICKNESSES}).where(~raw, RAW_NET_ROW)
+    net_val = df_net['단가'].where(df_net['단가'] < 5000, df_net['단가'] / 50.0)
+
+    rope_label = df_rope['thick'].map({t: rope_row(t) for t in THICKNESSES})
+
+    rows = pd.concat([
+        pd.DataFrame({'row': net_label, '단가종류': df_net['단가종류'], '단가': net_val}),
+        pd.DataFrame({'row': rope_label, '단가종류': df_rope['단가종류'], '단가': df_rope['단가'].astype(float)}),
+    ])
+    rows = rows[rows['row'].notna() & rows['단가종류'].isin(kinds)]
+    # 같은 칸에 여러 행이 매칭되면 시트 아래쪽 값이 우선 (기존 순차 덮어쓰기와 동일)
+    rows = rows.drop_duplicates(subset=['row', '단가종류'], keep='last')
+
+    base = rows.pivot(index='row', columns='단가종류', values='단가')
+    return base.reindex(index=BASE_IDX, columns=list(kinds)).fillna(0.0).astype(float)
+
+def labor_base_tables(df_labor, item_col, spec_col, note_col):
+    # 방염/일반 각각의 (단가종류 목록, 전체 단가종류 기준 원가 기본 설정 표)
+    df_net_all, df_rope = split_labor_prices(melt_labor_prices(df_labor), item_col, spec_col, note_col)
+    tables = {}
+    for flame in (True, False):
+        df_net = df_net_all[df_net_all['is_flame'] == flame]
+        kinds = sorted({k for k in df_net['단가종류'].unique() if k and str(k).lower() != 'nan'})
+        tables[flame] = (kinds, build_base_table(df_net, df_rope, spec_col, kinds))
+    return tables
+
+def read_labor_base(file_path):
+    # labor_cost 시트 → 방염/일반 원가 기본 설정 표 (헤더 자동 파싱: 병합셀 범위를 직접 읽어 두 줄 헤더를 "상단_하단" 형태로 정규화)
+    layout = detect_header(file_path, 'labor_cost', marker=r'^(품명|품목)$', two_row=True)
+    df_labor = apply_header(pd.read_excel(file_path, sheet_name='labor_cost', header=None), layout)
+
+    item_col = next((c for c in df_labor.columns if '품명' in c or '품목' in c), '품명')
+    spec_col = next((c for c in df_labor.columns if '규격' in c), '규격')
+    note_col = next((c for c in df_labor.columns if '비고' in c), '비고')
+    if note_col not in df_labor.columns: df_labor[note_col] = ""
+
+    df_labor[item_col] = df_labor[item_col].fillna("").astype(str)
+    df_labor[spec_col] = df_labor[spec_col].fillna("").astype(str)
+    df_labor[note_col] = df_labor[note_col].fillna("").astype(str)
+    return labor_base_tables(df_labor, item_col, spec_col, note_col)
@@ -0,0 +1,71 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from core.canonical import canonical_keys
+
+# -----------------------------------------------------------------------------
+# 매출단가(Sales_매출단가) × 매입단가(Purchase_매입단가) 마진 계산 (pages/08_margin_analysis.py)
+#   같은 품목/규격 연결 키: (품목, 규격, 비고) ↔ (품목, 규격1, 규격2) 의 정규화 표기 (core/canonical.py)
+#   키 색인과 단가 행렬은 파일 버전당 한 번 만들고(core/derived.py), 화면에서는 행/열 번호만 골라 계산
+#   마진율 = (매출단가 - 매입단가) / 매출단가
+# -----------------------------------------------------------------------------
+MarginIndex = namedtuple('MarginIndex', ['keys', 'customers', 'suppliers', 'sales', 'purchase'])
+# keys: 공통 키 표시값 DataFrame (품목/규격/비고), sales: 키 × 매출업체 단가, purchase: 키 × 매입업체 단가 (없으면 NaN)
+
+def _price_table(df, cols, vendor_col, price_col, agg):
+    # (정규화 키) × 업체 단가표 + 키별 첫 표시값
+    keys = canonical_keys(df, cols)
+    data = pd.DataFrame({'key': keys, 'vendor': df[vendor_col].astype(str).to_numpy(), 'price': pd.to_numeric(df[price_col], errors='coerce').to_numpy()})
+    data = data[df[vendor_col].notna().to_numpy() & (data['price'] > 0).to_numpy()]
+    table = data.pivot_table(index='key', columns='vendor', values='price', aggfunc=agg, sort=False)
+    labels = pd.DataFrame({'key': keys, '품목': df[cols[0]].astype(str).to_numpy(), '규격': df[cols[1]].astype(str).to_numpy(),
+                           '비고': df[cols[2]].astype(str).to_numpy()}).drop_duplicates('key').set_index('key')
+    return table, labels
+
+def margin_index(sales, purch):
+    # 매출/매입 모두 단가가 있는 키만 남긴 공통 색인 (매출은 첫 단가, 매입은 같은 업체 중복 시 최저가)
+    df_s, note_col, s_price = sales
+    df_p, vendor_col, p_price = purch
+    st_table, labels = _price_table(df_s, ['품목', '규격', note_col], '매출업체', s_price, 'first')
+    pt_table, _ = _price_table(df_p, ['품목', 'calc_spec', 'display_spec'], vendor_col, p_price, 'min')
+    common = st_table.index[st_table.index.isin(pt_table.index)]  # 매출 시트 순서 유지
+    customers = sorted(st_table.columns)
+    suppliers = sorted(pt_table.columns)
+    return MarginIndex(labels.loc[common].reset_index(drop=True), customers, suppliers,
+                       st_table.loc[common, customers].to_numpy(dtype=np.float64),
+                       pt_table.loc[common, suppliers].to_numpy(dtype=np.float64))
+
+def margin_matrix(sales, purchase):
+    # 매출업체 × 매입업체 평균 마진율·공통 품목 수 (행렬곱으로 계산, 키 × 업체 × 업체 배열을 만들지 않음)
+    #   평균 마진율 = 1 - Σ(매입/매출) / n   (두 단가가 모두 있는 키만)
+    has_s = ~np.isnan(sales); has_p = ~np.isnan(purchase)
+    inv_s = np.where(has_s, 1.0 / np.where(has_s, sales, 1.0), 0.0)
+    n = has_s.T.astype(np.float64) @ has_p.astype(np.float64)
+    ratio = inv_s.T @ np.where(has_p, purchase, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rate = np.where(n > 0, 1.0 - ratio / n, np.nan)
+    return rate, n.astype(np.int64)
+
+def best_purchase(purchase):
+    # 키별 최저 매입가와 그 업체 번호 (매입가가 모두 없으면 NaN / -1)
+    has_p = ~np.isnan(purchase)
+    any_p = has_p.any(axis=1)
+    pick = np.where(has_p, purchase, np.inf).argmin(axis=1) if purchase.shape[1] else np.zeros(len(purchase), dtype=np.intp)
+    price = np.where(any_p, purchase[np.arange(len(purchase)), pick] if purchase.shape[1] else np.nan, np.nan)
+    return price, np.where(any_p, pick, -1)
+
+def margin_detail(mi, rows, customers, suppliers):
+    # 품목별 상세: 선택 매입처 중 최저 매입가 대비 매출업체별 마진율
+    c_idx = [mi.customers.index(c) for c in customers]
+    v_idx = [mi.suppliers.index(v) for v in suppliers]
+    sales = mi.sales[np.ix_(rows, c_idx)]
+    price, pick = best_purchase(mi.purchase[np.ix_(rows, v_idx)])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rate = (sales - price[:, None]) / sales
+    df = mi.keys.iloc[rows].reset_index(drop=True)
+    df['최저 매입가'] = price
+    df['최저 매입처'] = np.where(pick >= 0, np.asarray(suppliers + [''], dtype=object)[pick], '-')
+    for j, c in enumerate(customers): df[c] = rate[:, j]
+    return df
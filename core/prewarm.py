@@ -0,0 +1,75 @@
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from core.dataset import FILE_PATH, dataset_source, open_dataset
+from core.price_history import record_version
+from core.derived import (
+    UNIT_MODES, sales_options, default_sales_vendors, sales_view, sales_search, sales_filter_index, sales_stats, quote_search, quote_matrix, purchase_search, purchase_stats, customer_prices, margin_data, load_labor_base
+)
+
+# -----------------------------------------------------------------------------
+# 서버 시작 시 백그라운드 미리 계산 (prewarm)
+#   app.py / 각 페이지 첫 실행에서 start_prewarm() 호출 → 파일 버전당 한 번만 작업 등록
+#   작업은 core/derived.py 의 캐시 함수를 그대로 호출하므로, 완료된 항목은 페이지에서 캐시로 바로 사용되고
+#   진행 중인 항목은 같은 캐시 키를 기다리며, 시작 전/실패한 항목은 페이지가 직접 계산
+# -----------------------------------------------------------------------------
+MAX_WORKERS = 4
+
+_log = logging.getLogger(__name__)
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='prewarm')
+
+class PrewarmStatus:
+    def __init__(self, version):
+        self.version = version
+        self.futures = {}  # 작업명 → Future
+        self.elapsed = {}  # 작업명 → 소요 ms
+
+    def submit(self, name, fn, *args):
+        def run():
+            t0 = time.perf_counter()
+            try: return fn(*args)
+            except Exception:
+                _log.exception("prewarm '%s' 실패 (페이지에서 다시 계산됨)", name)
+                raise
+            finally: self.elapsed[name] = (time.perf_counter() - t0) * 1000
+        self.futures[name] = _executor.submit(run)
+        return self.futures[name]
+
+    def done(self):
+        return sum(f.done() for f in self.futures.values()), len(self.futures)
+
+def _sales_tasks(status, ds):
+    opts = sales_options(ds.version, ds)
+    vendors = tuple(default_sales_vendors(opts) or opts.vendors)
+    for mode in UNIT_MODES:
+        status.submit(f'01 단가표 ({mode})', sales_view, ds.version, vendors, mode, ds)
+    status.submit('01 검색 색인', sales_search, ds.version, ds)
+    status.submit('01 필터 색인', sales_filter_index, ds.version, ds)
+    status.submit('01 업체 단가 통계', sales_stats, ds.version, ds)
+
+def _dataset_tasks(status, path, source):
+    ds = open_dataset(source)
+    status.submit('01 선택지', _sales_tasks, status, ds)
+    status.submit('02 견적 피벗·검색 색인', quote_search, ds.version, ds)
+    status.submit('02 업체 단가 행렬', quote_matrix, ds.version, ds)
+    status.submit('03 선택지·검색 색인', purchase_search, ds.version, ds)
+    status.submit('03 업체 단가 통계', purchase_stats, ds.version, ds)
+    status.submit('04 거래처 단가 색인', customer_prices, ds.version, ds)
+    status.submit('08 마진 키 색인', margin_data, ds.version, ds)
+    if source[0] == 'file':  # 공유 모드에서는 이력 기록·인건비 기준표를 게시 프로세스(publish.py)가 담당
+        status.submit('10 단가 이력 기록', record_version, ds, path)  # 새 파일 버전의 변경분을 이력 저장소에 추가
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _start(path, source):
+    status = PrewarmStatus(source)
+    status.submit('데이터 로드', _dataset_tasks, status, path, source)
+    if source[0] == 'file': status.submit('07 인건비 기준표', load_labor_base, path, source[2])
+    return status
+
+def start_prewarm(path=FILE_PATH):
+    # 파일이 없으면 None (페이지에서 오류 표시)
+    source = dataset_source(path)
+    return None if source is None else _start(path, source)
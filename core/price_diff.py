@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+
+from core.canonical import canonical
+
+# -----------------------------------------------------------------------------
+# 단가표 두 버전 비교 (pages/09_price_diff.py, diff.py, batch.py 'price_diff' 보고서)
+#   키: (품목, 규격, 비고, 업체) 의 정규화 표기(core/canonical.py) → 64비트 해시 한 컬럼 (서로 다른 값만 해시)
+#   이전/새 버전을 해시 기준 outer merge 한 번으로 추가·삭제·변경을 함께 판별 (행 단위 반복 없음)
+#   단가가 비었거나 0 이하인 행은 없는 것으로 봄 (단가를 지우면 '삭제', 새로 넣으면 '추가')
+#   같은 키가 시트에 여러 번 있으면 첫 행 단가 (화면 피벗 aggfunc='first' 와 동일)
+# -----------------------------------------------------------------------------
+DIFF_KINDS = ['변경', '추가', '삭제']
+HASH_MIX = np.uint64(0x100000001B3)  # 컬럼 해시를 섞는 곱 (FNV 소수)
+DIFF_COLUMNS = ['구분', '품목', '규격', '비고', '업체', '이전 단가', '새 단가', '차액', '변동률']
+
+def sheet_columns(ds):
+    # 시트별 (키 컬럼 [품목, 규격, 비고, 업체], 단가 컬럼) — 매입은 규격1/규격2 를 규격/비고 자리에 사용
+    df_s, note_col, s_price = ds.sales
+    df_p, vendor_col, p_price = ds.purch
+    return {'Sales_매출단가': (df_s, ['품목', '규격', note_col, '매출업체'], s_price),
+            'Purchase_매입단가': (df_p, ['품목', 'calc_spec', 'display_spec', vendor_col], p_price)}
+
+def key_hash(df, cols):
+    # 행별 키 해시: 컬럼마다 서로 다른 값만 정규화·해시한 뒤 코드로 펼치고 컬럼끼리 섞음 (행 단위 문자열 연산 없음)
+    h = np.zeros(len(df), dtype=np.uint64)
+    for c in cols:
+        cat = df[c].astype('category').array
+        cat_hash = pd.util.hash_array(np.array([canonical(v) for v in cat.categories] + [''], dtype=object))
+        h = (h * HASH_MIX) ^ cat_hash[np.asarray(cat.codes)]
+    return h
+
+def keyed_prices(df, cols, price_col):
+    # (키 해시, 단가, 원본 행 위치) — 표시 값은 변경 행만 나중에 꺼냄
+    price = pd.to_numeric(df[price_col], errors='coerce').to_numpy(dtype=np.float64)
+    ok = np.flatnonzero(price > 0)
+    out = pd.DataFrame({'key': key_hash(df, cols)[ok], '단가': price[ok], 'pos': ok})
+    return out.drop_duplicates('key')
+
+def _labels(df, cols, pos):
+    # 필요한 행만 꺼낸 뒤 문자열 변환
+    return [df[c].iloc[pos].astype(str).to_numpy(dtype=object) for c in cols]
+
+def diff_sheet(old_df, old_cols, old_price, new_df, new_cols, new_price):
+    old = keyed_prices(old_df, old_cols, old_price)
+    new = keyed_prices(new_df, new_cols, new_price)
+    m = old.merge(new, on='key', how='outer', suffixes=('_old', '_new'), indicator=True, sort=False)
+
+    side = m['_merge'].to_numpy()
+    p_old = m['단가_old'].to_numpy(dtype=np.float64)
+    p_new = m['단가_new'].to_numpy(dtype=np.float64)
+    kind = np.select([side == 'left_only', side == 'right_only', (side == 'both') & (p_old != p_new)], ['삭제', '추가', '변경'], '')
+    keep = kind != ''
+    m, kind, p_old, p_new = m[keep], kind[keep], p_old[keep], p_new[keep]
+
+    # 표시 값은 새 버전 표기 우선 (삭제 행은 이전 버전 표기)
+    is_new = (m['_merge'] != 'left_only').to_numpy()
+    new_pos = m['pos_new'].to_numpy()[is_new].astype(np.intp)
+    old_pos = m['pos_old'].to_numpy()[~is_new].astype(np.intp)
+    out = pd.DataFrame({'구분': kind})
+    for name, new_v, old_v in zip(['품목', '규격', '비고', '업체'], _labels(new_df, new_cols, new_pos), _labels(old_df, old_cols, old_pos)):
+        col = np.empty(len(out), dtype=object)
+        col[is_new] = new_v; col[~is_new] = old_v
+        out[name] = col
+    out['이전 단가'] = p_old
+    out['새 단가'] = p_new
+    out['차액'] = out['새 단가'] - out['이전 단가']
+    out['변동률'] = out['차액'] / out['이전 단가']
+
+    # 변경 → 추가 → 삭제, 변경은 변동률 절댓값 큰 순
+    rank = out['구분'].map({k: i for i, k in enumerate(DIFF_KINDS)})
+    order = np.lexsort((out['품목'].to_numpy(dtype=str), -out['변동률'].abs().fillna(0).to_numpy(), rank.to_numpy()))
+    return out.iloc[order].reset_index(drop=True)[DIFF_COLUMNS]
+
+def price_diff(old_ds, new_ds):
+    # 두 Dataset 의 매출/매입 시트별 변경 목록 {시트명: DataFrame}
+    old_sheets, new_sheets = sheet_columns(old_ds), sheet_columns(new_ds)
+    result = {}
+    for sheet, (new_df, new_cols, new_price) in new_sheets.items():
+        old_df, old_cols, old_price = old_sheets[sheet]
+        if not (old_price and new_price and old_cols[-1] and new_cols[-1]):
+            result[sheet] = pd.DataFrame(columns=DIFF_COLUMNS); continue
+        result[sheet] = diff_sheet(old_df, old_cols, old_price, new_df, new_cols, new_price)
+    return result
+
+def diff_summary(diffs):
+    # 시트 × 구분 건수 표
+    counts = {sheet: df['구분'].value_counts().reindex(DIFF_KINDS, fill_value=0) for sheet, df in diffs.items()}
+    return pd.DataFrame(counts).T.rename_axis('시트').reset_index()
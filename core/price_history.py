@@ -0,0 +1,204 @@
+import os
+import json
+import logging
+import datetime
+import threading
+from contextlib import contextmanager
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+try: import fcntl
+except ImportError: fcntl = None  # Windows: 프로세스 간 잠금 없이 스레드 잠금만
+
+from core.workbook import HISTORY_DIR, file_version
+from core.canonical import canonical, canonical_values
+from core.price_diff import sheet_columns, keyed_prices
+
+# -----------------------------------------------------------------------------
+# 단가 이력 저장소 (버전별 변경분만 기록) — pages/10_price_history.py, history.py
+#   price_history/store/
+#     versions.json       버전 목록 (번호, 적용 일시, 원본 파일, 추가/변경/삭제 건수)
+#     keys.npz            (시트, 키 해시) → 품목/규격/비고/업체 표시값 (새 키가 생길 때만 추가)
+#     deltas/000001.npz   해당 버전에서 바뀐 칸만 (시트, 키 해시, 단가 — NaN 은 삭제)
+#   첫 버전은 전체 단가, 이후 버전은 직전 상태와 다른 칸만 저장 → 과거 시점 단가 = 그 시점까지의 마지막 변경분
+#   키 해시는 core/price_diff.py 와 같은 정규화 (품목, 규격, 비고, 업체) 해시
+#   조회는 변경분 전체를 한 번 읽어 (시트, 키, 버전) 순으로 정렬한 색인에서 처리 (과거 엑셀 파일 불필요)
+# -----------------------------------------------------------------------------
+STORE_DIR = os.path.join(HISTORY_DIR, 'store')
+SHEETS = ['Sales_매출단가', 'Purchase_매입단가']
+LABELS = ['품목', '규격', '비고', '업체']
+REMOVED = -1.0  # 추세 표 ffill 용 삭제 표시 (단가는 항상 0 초과)
+
+HistoryIndex = namedtuple('HistoryIndex', ['versions', 'keys', 'deltas'])
+# versions: 버전 목록 DataFrame (id, effective ...), keys: sheet/key/표시값/정규화값(c_*), deltas: vid/sheet/key/price ((sheet, key, vid) 정렬)
+
+_log = logging.getLogger(__name__)
+_lock = threading.Lock()
+
+@contextmanager
+def _store_lock(store):
+    # 기록 잠금: 같은 프로세스 안은 스레드 잠금, 프로세스 사이(서버 프로세스마다의 prewarm, history.py ingest)는
+    # 저장소의 .lock 파일 flock — 버전 번호 결정부터 versions.json 교체까지 한 번에 한 기록만 (프로세스가 죽으면 자동 해제)
+    os.makedirs(store, exist_ok=True)
+    with _lock, open(os.path.join(store, '.lock'), 'a') as f:
+        if fcntl: fcntl.flock(f, fcntl.LOCK_EX)
+        try: yield
+        finally:
+            if fcntl: fcntl.flock(f, fcntl.LOCK_UN)
+
+def _paths(store):
+    return os.path.join(store, 'versions.json'), os.path.join(store, 'keys.npz'), os.path.join(store, 'deltas')
+
+def store_version(store=STORE_DIR):
+    # 캐시 키: 버전 목록 파일의 수정시각/크기 (저장소가 없으면 None)
+    path = _paths(store)[0]
+    return file_version(path) if os.path.exists(path) else None
+
+def _empty_index():
+    keys = pd.DataFrame({'sheet': np.empty(0, np.uint8), 'key': np.empty(0, np.uint64), **{c: np.empty(0, object) for c in LABELS}})
+    for c in LABELS: keys['c_' + c] = np.empty(0, object)
+    return HistoryIndex(pd.DataFrame(columns=['id', 'effective', 'ingested', 'source', 'file_version', 'changes']), keys,
+                        pd.DataFrame({'vid': np.empty(0, np.int32), 'sheet': np.empty(0, np.uint8), 'key': np.empty(0, np.uint64), 'price': np.empty(0)}))
+
+def load_index(store=STORE_DIR):
+    v_path, k_path, d_dir = _paths(store)
+    if not os.path.exists(v_path): return _empty_index()
+    with open(v_path, encoding='utf-8') as f: versions = pd.DataFrame(json.load(f))
+    if versions.empty: return _empty_index()
+    versions['effective'] = pd.to_datetime(versions['effective'], format='ISO8601')
+
+    with np.load(k_path) as z: keys = pd.DataFrame({c: z[c] for c in ['sheet', 'key'] + LABELS})
+    for c in LABELS:
+        keys[c] = keys[c].astype(object)
+        keys['c_' + c] = canonical_values(keys[c])
+
+    parts = []
+    for vid in versions['id']:
+        with np.load(os.path.join(d_dir, f'{vid:06d}.npz')) as z:
+            parts.append(pd.DataFrame({'vid': np.full(len(z['key']), vid, dtype=np.int32), 'sheet': z['sheet'], 'key': z['key'], 'price': z['price']}))
+    deltas = pd.concat(parts, ignore_index=True).sort_values(['sheet', 'key', 'vid'], kind='stable', ignore_index=True)
+    return HistoryIndex(versions, keys, deltas)
+
+def _state(idx, vid=None):
+    # 버전 vid 시점(없으면 최신)의 (시트, 키) → 단가 (삭제된 키 제외)
+    d = idx.deltas if vid is None else idx.deltas[idx.deltas['vid'].to_numpy() <= vid]
+    last = d.drop_duplicates(['sheet', 'key'], keep='last')
+    return last[last['price'].notna()]
+
+# -----------------------------------------------------------------------------
+# 기록: Dataset 한 버전 → 직전 상태와 다른 칸만 새 버전으로 저장
+# -----------------------------------------------------------------------------
+def _save_npz(path, **arrays):
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f: np.savez_compressed(f, **arrays)
+    os.replace(tmp, path)
+
+def ingest(ds, source, effective=None, store=STORE_DIR):
+    # 반환: 새 버전 정보 dict (이미 기록된 파일 버전이면 None)
+    #   effective: 적용 일시 (기본: 파일 수정 시각) — 마지막 버전보다 이르면 거부 (변경분은 항상 직전 버전 기준)
+    with _store_lock(store):
+        v_path, k_path, d_dir = _paths(store)
+        idx = load_index(store)
+        fv = [int(x) for x in ds.version]
+        if any(s == source and list(v) == fv for s, v in zip(idx.versions['source'], idx.versions['file_version'])): return None
+
+        effective = pd.Timestamp(effective) if effective is not None else pd.Timestamp(datetime.datetime.fromtimestamp(fv[0] // 10**9))
+        if not idx.versions.empty and effective < idx.versions['effective'].max():
+            raise ValueError(f"적용 일시 {effective} 가 마지막 버전({idx.versions['effective'].max()})보다 이릅니다")
+
+        # 새 파일의 (시트, 키, 단가) + 처음 보는 키의 표시값
+        frames, new_labels = [], []
+        known = set(zip(idx.keys['sheet'].tolist(), idx.keys['key'].tolist()))
+        for code, (sheet, (df, cols, price_col)) in enumerate(sheet_columns(ds).items()):
+            if not (price_col and cols[-1]): continue
+            k = keyed_prices(df, cols, price_col)
+            frames.append(pd.DataFrame({'sheet': np.full(len(k), code, dtype=np.uint8), 'key': k['key'].to_numpy(), 'price': k['단가'].to_numpy()}))
+            fresh = np.array([(code, h) not in known for h in k['key'].tolist()], dtype=bool)
+            if fresh.any():
+                pos = k['pos'].to_numpy()[fresh]
+                new_labels.append(pd.DataFrame({'sheet': np.full(fresh.sum(), code, dtype=np.uint8), 'key': k['key'].to_numpy()[fresh],
+                                                **{name: df[c].iloc[pos].astype(str).to_numpy(dtype=object) for name, c in zip(LABELS, cols)}}))
+        new = pd.concat(frames, ignore_index=True) if frames else _empty_index().deltas[['sheet', 'key', 'price']]
+
+        # 직전 상태와 비교 → 추가/변경/삭제 칸만 (삭제는 NaN)
+        cur = _state(idx)[['sheet', 'key', 'price']]
+        m = cur.merge(new, on=['sheet', 'key'], how='outer', suffixes=('_old', ''), indicator=True)
+        side = m['_merge'].to_numpy()
+        changed = (side != 'both') | (m['price'].to_numpy() != m['price_old'].to_numpy())
+        delta = m[changed]
+
+        vid = int(idx.versions['id'].max()) + 1 if not idx.versions.empty else 1
+        os.makedirs(d_dir, exist_ok=True)
+        _save_npz(os.path.join(d_dir, f'{vid:06d}.npz'), sheet=delta['sheet'].to_numpy(dtype=np.uint8),
+                  key=delta['key'].to_numpy(dtype=np.uint64), price=delta['price'].to_numpy(dtype=np.float64))
+        if new_labels:
+            keys = pd.concat([idx.keys[['sheet', 'key'] + LABELS]] + new_labels, ignore_index=True)
+            _save_npz(k_path, sheet=keys['sheet'].to_numpy(dtype=np.uint8), key=keys['key'].to_numpy(dtype=np.uint64),
+                      **{c: keys[c].to_numpy(dtype=str) for c in LABELS})
+
+        d_side = side[changed]; d_sheet = delta['sheet'].to_numpy()
+        changes = {sheet: {'추가': int(((d_side == 'right_only') & (d_sheet == code)).sum()),
+                           '변경': int(((d_side == 'both') & (d_sheet == code)).sum()),
+                           '삭제': int(((d_side == 'left_only') & (d_sheet == code)).sum())} for code, sheet in enumerate(SHEETS)}
+        info = {'id': vid, 'effective': effective.isoformat(), 'ingested': datetime.datetime.now().isoformat(timespec='seconds'),
+                'source': source, 'file_version': fv, 'changes': changes, 'cells': int(len(delta))}
+        versions = idx.versions.assign(effective=idx.versions['effective'].map(lambda t: t.isoformat())).to_dict('records') + [info]
+        tmp = v_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f: json.dump(versions, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, v_path)  # 버전 목록을 마지막에 교체 → 중간에 실패해도 이전 버전 목록 그대로
+        return info
+
+def record_version(ds, source, store=STORE_DIR):
+    # 앱에서 새 파일 버전을 읽을 때 호출 — 기록 실패가 화면 로딩을 막지 않도록 로그만 남김
+    try:
+        info = ingest(ds, source, store=store)
+        if info: _log.info("단가 이력 버전 %d 기록 (%d칸)", info['id'], info['cells'])
+    except Exception:
+        _log.exception("단가 이력 기록 실패: %s", source)
+
+# -----------------------------------------------------------------------------
+# 조회
+# -----------------------------------------------------------------------------
+def find_keys(idx, sheet, item, spec=None, note=None, vendors=None):
+    # 표기 차이를 무시하고 키 찾기 (spec/note 없으면 전체, vendors: 목록)
+    k = idx.keys
+    mask = (k['sheet'].to_numpy() == SHEETS.index(sheet)) & (k['c_품목'].to_numpy() == canonical(item))
+    if spec not in (None, ''): mask &= k['c_규격'].to_numpy() == canonical(spec)
+    if note is not None: mask &= k['c_비고'].to_numpy() == canonical(note)
+    if vendors: mask &= np.isin(k['c_업체'].to_numpy(), [canonical(v) for v in vendors])
+    return k[mask]
+
+def version_at(idx, date):
+    # date 당일까지 적용된 마지막 버전 번호 (그 전에 기록된 버전이 없으면 None)
+    v = idx.versions[idx.versions['effective'] < pd.Timestamp(date).normalize() + pd.Timedelta(days=1)]
+    return None if v.empty else int(v['id'].iloc[-1])
+
+def _key_deltas(idx, keys):
+    d = idx.deltas
+    return d[np.isin(d['key'].to_numpy(), keys['key'].to_numpy()) & np.isin(d['sheet'].to_numpy(), keys['sheet'].unique())]
+
+def price_at(idx, item, date=None, vendors=None, spec=None, note=None, sheet=SHEETS[0]):
+    # date 시점 단가 (없으면 최신) → 품목/규격/비고/업체/단가/적용일 (그 단가가 정해진 버전의 적용 일시)
+    keys = find_keys(idx, sheet, item, spec, note, vendors)
+    vid = version_at(idx, date) if date is not None else (int(idx.versions['id'].max()) if not idx.versions.empty else None)
+    if vid is None or keys.empty: return pd.DataFrame(columns=LABELS + ['단가', '적용일'])
+    sub = _key_deltas(idx, keys)
+    sub = sub[sub['vid'].to_numpy() <= vid].drop_duplicates(['sheet', 'key'], keep='last')
+    sub = sub[sub['price'].notna()]
+    out = keys.merge(sub, on=['sheet', 'key'])
+    out['적용일'] = out['vid'].map(idx.versions.set_index('id')['effective'])
+    return out.rename(columns={'price': '단가'})[LABELS + ['단가', '적용일']].sort_values(['업체', '규격', '비고'], ignore_index=True)
+
+def price_trend(idx, item, vendors=None, spec=None, note=None, sheet=SHEETS[0]):
+    # 버전(적용 일시) × 키 단가 표 — 변경이 없던 버전은 직전 단가 유지, 삭제 후에는 빈 칸
+    keys = find_keys(idx, sheet, item, spec, note, vendors)
+    if keys.empty or idx.versions.empty: return pd.DataFrame()
+    sub = _key_deltas(idx, keys)
+    wide = sub.assign(price=sub['price'].fillna(REMOVED)).pivot_table(index='vid', columns='key', values='price', aggfunc='last')
+    wide = wide.reindex(idx.versions['id']).ffill().replace(REMOVED, np.nan)
+    labels = keys.set_index('key')
+    wide.columns = [' · '.join(x for x in (labels.at[h, '업체'], labels.at[h, '규격'], labels.at[h, '비고']) if x) for h in wide.columns]
+    wide.index = pd.Index(idx.versions['effective'].to_numpy(), name='적용일')
+    return wide[sorted(wide.columns)]
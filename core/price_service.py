@@ -0,0 +1,232 @@
+import time
+import logging
+import threading
+from collections import namedtuple, deque
+
+import numpy as np
+import pandas as pd
+
+from core.workbook import FILE_PATH, file_version, read_dataset
+from core.canonical import canonical, canonical_values
+from core.purchase import quote_columns, quote_pivot, unit_divisor
+from core.basket import price_matrix, vendor_totals, split_plan, plan_table
+
+# -----------------------------------------------------------------------------
+# 단가 조회 서비스 (service.py 의 HTTP 처리와 분리된 색인·계산 부분)
+#   엑셀 파싱은 화면과 같은 core/workbook.py, 장바구니 합계는 core/basket.py 를 그대로 사용
+#   색인: 정규화 키(core/canonical.py) → 행 번호 — 품목/규격의 공백·대소문자·표기 차이를 무시하고 조회
+#   파일 버전이 바뀌면 백그라운드 스레드에서 새 색인을 만든 뒤 참조만 교체 (교체 전까지는 이전 색인으로 계속 응답)
+# -----------------------------------------------------------------------------
+RELOAD_CHECK_SEC = 1.0    # 파일 변경 확인 간격
+LATENCY_SAMPLES = 10000   # 조회 종류별 최근 지연시간 보관 개수
+
+_log = logging.getLogger(__name__)
+
+Table = namedtuple('Table', ['cols', 'keys', 'by_item', 'by_spec'])  # cols: 응답 값 배열, keys: 정규화 키 배열, by_*: 키 → 행 번호
+PriceIndex = namedtuple('PriceIndex', ['version', 'loaded_at', 'sales', 'purchase', 'basket', 'basket_rows'])
+
+def _table(cols, keys):
+    groups = pd.DataFrame({'item': keys['item'], 'spec': keys['spec']})
+    return Table(cols, keys, groups.groupby('item', sort=False).indices, groups.groupby(['item', 'spec'], sort=False).indices)
+
+def _strings(s):
+    return s.astype(str).to_numpy(dtype=object)
+
+def build_index(ds):
+    df_s, note_col, s_price = ds.sales
+    ok = pd.to_numeric(df_s[s_price], errors='coerce').gt(0).to_numpy() if s_price else np.zeros(len(df_s), dtype=bool)
+    df_s = df_s[ok]
+    sales = _table({'item': _strings(df_s['품목']), 'spec': _strings(df_s['규격']), 'note': _strings(df_s[note_col]),
+                    'unit': _strings(df_s['단위']), 'vendor': _strings(df_s['매출업체']), 'price': df_s[s_price].to_numpy(dtype=np.float64)},
+                   {'item': canonical_values(df_s['품목']), 'spec': canonical_values(df_s['규격']),
+                    'note': canonical_values(df_s[note_col]), 'vendor': canonical_values(df_s['매출업체'])})
+
+    df_p, vendor_col, p_price = ds.purch
+    ok = pd.to_numeric(df_p[p_price], errors='coerce').gt(0).to_numpy() if vendor_col and p_price else np.zeros(len(df_p), dtype=bool)
+    df_p = df_p[ok]
+    purchase = _table({'item': _strings(df_p['품목']), 'spec': _strings(df_p['calc_spec']), 'spec2': _strings(df_p['display_spec']),
+                       'vendor': _strings(df_p[vendor_col]), 'price': df_p[p_price].to_numpy(dtype=np.float64)},
+                      {'item': canonical_values(df_p['품목']), 'spec': canonical_values(df_p['calc_spec']),
+                       'spec2': canonical_values(df_p['display_spec']), 'vendor': canonical_values(df_p[vendor_col])})
+
+    # 장바구니: 02 매입견적 비교와 같은 (품목, 통합규격) × 업체 단가 행렬
+    pm, basket_rows = None, {}
+    q_vendor, q_item, q_price, spec_cols = quote_columns(ds.purch_raw)
+    if q_vendor and q_item and q_price:
+        df_pivot, vendors = quote_pivot(ds.purch_raw, q_vendor, q_item, q_price, spec_cols)
+        pm = price_matrix(df_pivot, q_item, vendors)
+        basket_rows = {(canonical(i), canonical(s)): r for (i, s), r in pm.rows.items()}
+    return PriceIndex(ds.version, time.time(), sales, purchase, pm, basket_rows)
+
+# --- 조회 (query: dict, 값은 원본 표기 그대로 받아 정규화 후 비교) ---
+def _as_list(v):
+    return v if isinstance(v, list) else [v]
+
+def _price(v):
+    return None if np.isnan(v) else float(v)
+
+def _rows(table, q, filters):
+    if not q.get('item'): raise ValueError("'item' 이 필요합니다")
+    item = canonical(q['item'])
+    if q.get('spec') not in (None, ''): rows = table.by_spec.get((item, canonical(q['spec'])))
+    else: rows = table.by_item.get(item)
+    if rows is None: return np.empty(0, dtype=np.intp)
+    for f in filters:
+        if q.get(f) in (None, '', []): continue
+        wanted = {canonical(v) for v in _as_list(q[f])}
+        rows = rows[np.isin(table.keys[f][rows], list(wanted))]
+    return rows
+
+def _records(table, rows):
+    cols = table.cols
+    return [{k: (_price(v[r]) if k == 'price' else v[r]) for k, v in cols.items()} for r in rows]
+
+def sales_price(idx, q):
+    # {item, spec?, note?, vendor?(문자열 또는 목록)} → 매출단가 행 목록
+    return {'matches': _records(idx.sales, _rows(idx.sales, q, ['note', 'vendor']))}
+
+def purchase_price(idx, q):
+    # {item, spec?(규격1), spec2?(규격2), vendor?} → 매입단가 행 목록
+    return {'matches': _records(idx.purchase, _rows(idx.purchase, q, ['spec2', 'vendor']))}
+
+def compare(idx, q):
+    # {items: [{item, spec?, spec2?}], vendors?: [...], unit_price?: bool} → (품목, 규격1, 규격2)별 업체 단가·최저가 업체
+    #   같은 업체 단가가 여러 행이면 첫 행 (03 업체별 매입단가 조회와 동일)
+    t = idx.purchase
+    vendors = q.get('vendors')
+    out = []
+    for item_q in q.get('items') or []:
+        rows = _rows(t, {**item_q, 'vendor': vendors}, ['spec2', 'vendor'])
+        groups = {}
+        for r in rows:
+            g = groups.setdefault((t.cols['item'][r], t.cols['spec'][r], t.cols['spec2'][r]), {})
+            g.setdefault(t.cols['vendor'][r], float(t.cols['price'][r]))
+        for (item, spec, spec2), prices in groups.items():
+            if q.get('unit_price'):
+                div = unit_divisor(item, spec)
+                prices = {v: p / div for v, p in prices.items()}
+            best = min(prices, key=prices.get)
+            out.append({'item': item, 'spec': spec, 'spec2': spec2, 'prices': prices, 'best_vendor': best, 'best_price': prices[best]})
+        if not groups: out.append({'query': item_q, 'prices': {}, 'best_vendor': None, 'best_price': None})
+    return {'rows': out}
+
+def basket(idx, q):
+    # {lines: [{item, spec, qty}], vendors?: [...], max_vendors?: int, top?: int} → 업체별 합계 순위 + 분할 구매 계획
+    #   spec 은 02 페이지의 통합규격 (규격1 규격2 를 공백으로 연결한 값)
+    pm = idx.basket
+    if pm is None: raise ValueError("매입단가 시트에 업체/품목/단가 컬럼이 없습니다")
+    lines = [{'품목': str(x.get('item', '')), '통합규격': str(x.get('spec') or '-'), '수량': float(x.get('qty', 1))} for x in q.get('lines') or []]
+    if not lines: raise ValueError("'lines' 가 비어 있습니다")
+
+    # 줄별 단가 행 (core.basket.basket_prices 와 같은 모양, 키만 정규화 표기로 찾음)
+    vendors = pm.vendors
+    rows = np.array([idx.basket_rows.get((canonical(x['품목']), canonical(x['통합규격'])), -1) for x in lines], dtype=np.intp)
+    prices = np.full((len(rows), len(vendors)), np.nan)
+    prices[rows >= 0] = pm.prices[rows[rows >= 0]]
+    qty = np.array([x['수량'] for x in lines], dtype=np.float64)
+    if q.get('vendors'):
+        want = {canonical(v) for v in q['vendors']}
+        keep = [j for j, v in enumerate(vendors) if canonical(v) in want]
+        vendors = [vendors[j] for j in keep]; prices = prices[:, keep]
+
+    totals = vendor_totals(prices, qty, vendors).head(int(q.get('top', 10)))
+    assign = split_plan(prices, qty, q.get('max_vendors'))
+    plan = plan_table(lines, '품목', prices, qty, vendors, assign)
+    return {
+        'totals': [{'rank': int(r['순위']), 'vendor': r['업체'], 'total': float(r['합계']), 'covered': int(r['취급 품목']), 'missing': int(r['미취급 품목'])}
+                   for r in totals.to_dict('records')],
+        'plan': [{'item': r['품목'], 'spec': r['규격'], 'qty': float(r['수량']), 'vendor': r['구매 업체'],
+                  'price': _price(r['단가']), 'amount': _price(r['합계'])} for r in plan.to_dict('records')],
+        'plan_total': float(np.nansum(plan['합계'].to_numpy(dtype=np.float64))),
+        'plan_vendors': sorted(set(plan['구매 업체']) - {'-'}),
+    }
+
+OPS = {'sales_price': sales_price, 'purchase_price': purchase_price, 'compare': compare, 'basket': basket}
+
+# -----------------------------------------------------------------------------
+# 서비스 상태: 현재 색인 + 파일 변경 감지 + 조회 통계
+# -----------------------------------------------------------------------------
+class PriceService:
+    def __init__(self, path=FILE_PATH, check_interval=RELOAD_CHECK_SEC):
+        self.path = path
+        self.check_interval = check_interval
+        self._index = None
+        self._checked = 0.0
+        self._reload_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.started = time.time()
+        self.reloads = 0
+        self.latency = {}  # 조회 종류 → 최근 지연시간(ms)
+        self.counts = {}   # 조회 종류 → (요청 수, 조회 건수, 오류 수)
+
+    def index(self):
+        # 첫 색인만 기다려서 만들고, 이후 파일이 바뀌면 백그라운드 스레드에서 새 색인 → 그동안은 현재 색인으로 응답
+        idx = self._index
+        if idx is None:
+            with self._reload_lock:
+                if self._index is None: self._load(file_version(self.path))
+            return self._index
+        now = time.monotonic()
+        if now - self._checked >= self.check_interval:
+            self._checked = now
+            try: version = file_version(self.path)
+            except OSError as e:  # 파일 교체 중 (잠시 없거나 접근 불가) → 현재 색인 유지, 다음 확인 때 재시도
+                _log.warning("단가표 버전 확인 실패 (이전 버전으로 계속 응답): %s", e)
+                return idx
+            if version != idx.version and self._reload_lock.acquire(blocking=False):
+                threading.Thread(target=self._reload, args=(version,), daemon=True).start()
+        return idx
+
+    def _load(self, version):
+        t0 = time.perf_counter()
+        self._index = build_index(read_dataset(self.path, version))
+        self.reloads += 1
+        _log.info("단가표 색인 %s (%.0f ms)", version, (time.perf_counter() - t0) * 1000)
+
+    def _reload(self, version):
+        # 백그라운드 스레드 — index() 가 _reload_lock 을 잡은 채로 시작
+        try: self._load(version)
+        except Exception:
+            # 저장 중인 파일 등 읽기 실패 → 이전 색인 유지, 다음 확인 때 재시도
+            _log.exception("단가표 다시 읽기 실패 (이전 버전으로 계속 응답)")
+        finally: self._reload_lock.release()
+
+    def run(self, op, queries, idx=None):
+        # 같은 색인으로 여러 건을 한 번에 처리 (건별 오류는 결과에 담고 나머지는 계속) — idx: 호출 측이 이미 잡아 둔 색인
+        if op not in OPS: raise KeyError(op)
+        t0 = time.perf_counter()
+        if idx is None: idx = self.index()
+        results, errors = [], 0
+        for q in queries:
+            try: results.append(OPS[op](idx, q))
+            except Exception as e:
+                errors += 1; results.append({'error': str(e)})
+        self._record(op, (time.perf_counter() - t0) * 1000, len(queries), errors)
+        return results
+
+    def _record(self, op, ms, n, errors):
+        with self._stats_lock:
+            self.latency.setdefault(op, deque(maxlen=LATENCY_SAMPLES)).append(ms)
+            req, items, err = self.counts.get(op, (0, 0, 0))
+            self.counts[op] = (req + 1, items + n, err + errors)
+
+    def stats(self):
+        with self._stats_lock:
+            up = time.time() - self.started
+            ops = {}
+            for op, (req, items, err) in self.counts.items():
+                lat = np.asarray(self.latency[op])
+                ops[op] = {'requests': req, 'queries': items, 'errors': err, 'queries_per_sec': items / up if up else 0.0,
+                           'p50_ms': float(np.percentile(lat, 50)), 'p95_ms': float(np.percentile(lat, 95)), 'p99_ms': float(np.percentile(lat, 99))}
+        idx = self._index
+        return {'file': self.path, 'version': list(idx.version) if idx else None, 'loaded_at': idx.loaded_at if idx else None,
+                'reloads': self.reloads, 'uptime_sec': up, 'ops': ops}
+
+    def catalog(self):
+        # 조회 가능한 키 목록 (ERP 품목 매핑·부하 테스트용)
+        idx = self.index()
+        s, p = idx.sales.cols, idx.purchase.cols
+        return {'sales': sorted({(i, sp) for i, sp in zip(s['item'], s['spec'])}),
+                'purchase': sorted({(i, sp, sp2) for i, sp, sp2 in zip(p['item'], p['spec'], p['spec2'])}),
+                'basket': list(idx.basket.rows) if idx.basket else [],
+                'sales_vendors': sorted(set(s['vendor'])), 'purchase_vendors': sorted(set(p['vendor']))}
@@ -0,0 +1,78 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from core.sales import format_price_safe
+
+# -----------------------------------------------------------------------------
+# 품목·규격별 업체 단가 통계 (pages 01/03 비교표의 업체 수·최저·중앙값·최고·편차율 열과 이상 단가 표시)
+#   파일 버전마다 한 번만 계산 (core/derived.py 캐시, 서버 시작 시 prewarm) — 페이지는 표시할 행/업체로 reindex 만 함
+#   같은 키·업체의 행이 여러 개면 비교표(pivot 'first')와 같이 첫 값, 0/빈 단가는 제외
+#   robust z = 0.6745 × (단가 − 중앙값) / MAD (MAD: 중앙값 절대 편차)
+#     절반 이상이 같은 단가라 MAD 가 0 이면 (단가 − 중앙값) / (1.2533 × 평균 절대 편차) 로 대체
+#   업체가 MIN_VENDORS 곳 미만인 키는 z 를 계산하지 않음 (비교 대상이 적어 의미 없음)
+# -----------------------------------------------------------------------------
+STAT_COLUMNS = ['업체 수', '최저', '중앙값', '최고', '편차율']
+OUTLIER_Z = 3.5
+MIN_VENDORS = 3
+
+PriceStats = namedtuple('PriceStats', ['table', 'z'])
+# table: 키별 통계 (인덱스 = 키 컬럼), z: 키 × 업체 robust z 행렬 (계산하지 않은 칸은 NaN)
+
+def price_stats(df, keys, vendor_col, price_col):
+    d = df[keys + [vendor_col, price_col]]
+    d = d[d[price_col].notna() & (d[price_col] != 0) & d[vendor_col].notna()].drop_duplicates(keys + [vendor_col], keep='first')
+    by = [d[k] for k in keys]
+    price = d[price_col].astype(float)
+
+    # 그룹별 집계를 행 단위로 펼쳐(transform) 한 번에 z 계산
+    g = price.groupby(by, observed=True, sort=False)
+    med = g.transform('median').to_numpy()
+    n = g.transform('count').to_numpy()
+    dev = pd.Series(np.abs(price.to_numpy() - med), index=d.index).groupby(by, observed=True, sort=False)
+    mad, mean_ad = dev.transform('median').to_numpy(), dev.transform('mean').to_numpy()
+    diff = price.to_numpy() - med
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = np.where(mad > 0, 0.6745 * diff / mad, np.where(mean_ad > 0, diff / (1.2533 * mean_ad), 0.0))
+    z[n < MIN_VENDORS] = np.nan
+
+    table = pd.DataFrame({'업체 수': g.count(), '최저': g.min(), '중앙값': g.median(), '최고': g.max()})
+    table['편차율'] = (table['최고'] - table['최저']) / table['중앙값']
+    table.index.names = keys
+    z_wide = d[keys + [vendor_col]].assign(z=z).pivot_table(index=keys, columns=vendor_col, values='z', aggfunc='first', observed=True)
+    return PriceStats(table, z_wide)
+
+def stat_columns(stats, index, divisors=None):
+    # 표시 행(키 MultiIndex) 순서의 통계 열 — divisors: 행별 단위 환산 나눗수 (단위당 단가 표시용, 업체 수·편차율은 그대로)
+    out = stats.table.reindex(index)
+    if divisors is not None:
+        div = np.asarray(divisors, dtype=float)[:, None]
+        out[['최저', '중앙값', '최고']] = out[['최저', '중앙값', '최고']].to_numpy() / div
+    return out
+
+def outlier_flags(stats, index, columns):
+    # 표시 행 × 업체 칸별 이상 단가 표시: 1 (중앙값보다 크게 높음), -1 (크게 낮음), 0
+    z = stats.z.reindex(index=index, columns=columns).to_numpy(dtype=float)
+    return pd.DataFrame(np.where(z > OUTLIER_Z, 1, np.where(z < -OUTLIER_Z, -1, 0)), columns=columns)
+
+def with_stats(table, stats_cols, after='단위'):
+    # 표시용 표(행 순서 = stats_cols 행 순서)의 after 열 뒤에 통계 열 삽입
+    out = table.copy()
+    pos = out.columns.get_loc(after) + 1 if after in out.columns else 0
+    for i, c in enumerate(STAT_COLUMNS): out.insert(pos + i, c, stats_cols[c].to_numpy())
+    return out
+
+def format_rate(v):
+    return "" if pd.isna(v) else f"{v:.0%}"
+
+def format_table(raw, flags, format_price=format_price_safe):
+    # 단가·통계 열 서식 (편차율은 %) + 이상 단가 칸에 ▲(높음)/▼(낮음) 표시 — flags 는 raw 와 같은 행 순서
+    out = raw.map(format_price)
+    if '편차율' in out.columns: out['편차율'] = raw['편차율'].map(format_rate)
+    cols = [c for c in flags.columns if c in out.columns]
+    if cols and len(out):
+        f = flags[cols].to_numpy()
+        vals = out[cols].to_numpy(dtype=object)
+        out[cols] = np.where(f > 0, vals + ' ▲', np.where(f < 0, vals + ' ▼', vals))
+    return out
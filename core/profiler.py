@@ -0,0 +1,113 @@
+import os
+import json
+import time
+import threading
+import contextlib
+
+import pandas as pd
+import streamlit as st
+
+from core.fragment import in_fragment_rerun
+
+# -----------------------------------------------------------------------------
+# 페이지 rerun 구간별 시간 측정 (기본 꺼짐)
+#   켜기: 환경변수 MS_PROFILE=1 또는 주소 뒤에 ?profile=1
+#   로그: 환경변수 MS_PROFILE_LOG=/경로/profile.jsonl 지정 시 rerun 마다 한 줄씩 기록
+#   st.fragment 본문은 prof.fragment(이름) 으로 감싸면 전체 rerun 때는 '이름 (fragment)' 구간,
+#   프래그먼트 단독 rerun 때는 '페이지#이름' 으로 따로 한 건 기록
+# -----------------------------------------------------------------------------
+ENV_FLAG = 'MS_PROFILE'
+ENV_LOG = 'MS_PROFILE_LOG'
+HISTORY_KEY = '_profile_history'
+MAX_HISTORY = 500
+
+_log_lock = threading.Lock()
+
+def is_enabled():
+    if os.environ.get(ENV_FLAG, '').lower() in ('1', 'true', 'yes'): return True
+    try: return st.query_params.get('profile', '').lower() in ('1', 'true', 'yes')
+    except Exception: return False
+
+def _session_id():
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx()
+        return ctx.session_id if ctx else None
+    except Exception:
+        return None
+
+class PageProfile:
+    def __init__(self, page, enabled):
+        self.page = page
+        self.enabled = enabled
+        self.phases = {}  # 구간명 → ms (같은 구간이 여러 번 나오면 합산)
+        self.t0 = time.perf_counter()
+
+    @contextlib.contextmanager
+    def _timed(self, name):
+        t = time.perf_counter()
+        try: yield
+        finally: self.add(name, (time.perf_counter() - t) * 1000)
+
+    def phase(self, name):
+        # 꺼져 있으면 아무것도 하지 않는 컨텍스트 반환 (오버헤드 없음)
+        return self._timed(name) if self.enabled else contextlib.nullcontext()
+
+    def add(self, name, ms):
+        if self.enabled: self.phases[name] = self.phases.get(name, 0.0) + ms
+
+    @contextlib.contextmanager
+    def fragment(self, name):
+        if not self.enabled:
+            yield
+        elif not in_fragment_rerun():
+            with self._timed(f"{name} (fragment)"): yield
+        else:
+            # 프래그먼트 단독 rerun: 페이지 기록과 섞이지 않게 구간을 따로 모아 한 건으로 저장
+            saved, self.phases = self.phases, {}
+            t = time.perf_counter()
+            try: yield
+            finally:
+                self._save(f"{self.page}#{name}", (time.perf_counter() - t) * 1000)
+                self.phases = saved
+
+    def _save(self, page, total):
+        record = {'ts': time.time(), 'page': page, 'session': _session_id(), 'total_ms': round(total, 2),
+                  'phases': {n: round(ms, 2) for n, ms in self.phases.items()}}
+
+        history = st.session_state.setdefault(HISTORY_KEY, [])
+        history.append(record)
+        del history[:-MAX_HISTORY]
+
+        log_path = os.environ.get(ENV_LOG)
+        if log_path:
+            with _log_lock, open(log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        return record, history
+
+    def finish(self):
+        # rerun 종료 시 호출: 누적 통계 저장 + 로그 기록 + 패널 표시
+        if not self.enabled: return
+        record, history = self._save(self.page, (time.perf_counter() - self.t0) * 1000)
+        self._render(record, [h for h in history if h['page'] == self.page])
+
+    def _render(self, record, history):
+        with st.expander(f"⏱️ 구간별 처리시간 (이번 실행 {record['total_ms']:,.0f} ms)", expanded=False):
+            cur = pd.DataFrame(list(self.phases.items()), columns=['구간', 'ms'])
+            cur.loc[len(cur)] = ['기타 (측정 외)', max(record['total_ms'] - cur['ms'].sum(), 0.0)]
+            cur['비율(%)'] = (cur['ms'] / max(record['total_ms'], 1e-9) * 100).round(1)
+            st.markdown("**이번 rerun**")
+            st.dataframe(cur.round(1), hide_index=True, use_container_width=True)
+
+            rows = [{'구간': n, 'ms': ms} for h in history for n, ms in h['phases'].items()]
+            rows += [{'구간': '전체', 'ms': h['total_ms']} for h in history]
+            if rows:
+                df = pd.DataFrame(rows)
+                stats = df.groupby('구간', sort=False)['ms'].agg(
+                    횟수='count', 평균='mean', p50='median', p95=lambda s: s.quantile(0.95), 합계='sum'
+                ).round(1)
+                st.markdown(f"**누적 통계 (이 세션, {len(history)}회 실행)**")
+                st.dataframe(stats, use_container_width=True)
+
+def start_profile(page):
+    return PageProfile(page, is_enabled())
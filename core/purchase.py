@@ -0,0 +1,170 @@
+import re
+import pandas as pd
+
+from core.sales import natural_sort_values
+
+# -----------------------------------------------------------------------------
+# 매입단가 (pages/02_quote_comparison.py, pages/03_vendor_price.py) 계산 로직
+# -----------------------------------------------------------------------------
+DEFAULT_VENDORS = ['가온건설', '신영산업안전', '토우코리아']
+PRIORITY_KEYWORDS = ['안전망', 'PP로프', '와이어로프', '와이어클립', '멀티망', '럿셀망', '케이블타이', 'PE로프']
+KEY_COLS = ['품목', 'calc_spec', 'display_spec']
+
+def natural_sort_key_simple(s):
+    text = str(s).strip()
+    match = re.search(r'(\d+(\.\d+)?)', text)
+    num_val = float(match.group(1)) if match else float('inf')
+    if 'KS' in text: k_rank = 0
+    elif '가공' in text: k_rank = 2
+    else: k_rank = 1
+    return (num_val, k_rank, text)
+
+def get_base_score(name):
+    n = str(name).strip()
+    if '안전망' in n: return 0
+    if '멀티망' in n: return 1
+    if '럿셀망' in n: return 2
+    if 'PP로프' in n: return 3
+    if '와이어로프' in n: return 4
+    if '와이어클립' in n: return 5
+    return 6
+
+# --- 업체별 매입단가 조회 (03) ---
+def prepare_purchase(df_purch):
+    # 규격1/규격2 → calc_spec/display_spec 으로 정리 후 (데이터, 업체 컬럼명, 단가 컬럼명) 반환
+    df_purch = df_purch.copy()
+    vendor_col = next((c for c in df_purch.columns if '매입업체' in str(c)), next((c for c in df_purch.columns if '업체' in str(c)), None))
+    price_col = next((c for c in df_purch.columns if '매입단가' in str(c)), next((c for c in df_purch.columns if '단가' in str(c) or '가격' in str(c)), None))
+    if not vendor_col or not price_col: return df_purch, vendor_col, price_col
+
+    col_map = {}
+    if '규격1' in df_purch.columns: col_map['규격1'] = 'calc_spec'
+    elif '규격' in df_purch.columns: col_map['규격'] = 'calc_spec'
+    else: df_purch['calc_spec'] = ""
+    if '규격2' in df_purch.columns: col_map['규격2'] = 'display_spec'
+    else: df_purch['display_spec'] = df_purch.get('calc_spec', "")
+
+    df_purch = df_purch.rename(columns=col_map)
+    df_purch['calc_spec'] = df_purch['calc_spec'].fillna("").astype(str)
+    df_purch['display_spec'] = df_purch['display_spec'].fillna("").astype(str)
+    df_purch['품목'] = df_purch['품목'].fillna("").astype(str)
+    return df_purch, vendor_col, price_col
+
+def sort_purchase(df_purch):
+    df_purch['Sort_Base'] = df_purch['품목'].apply(get_base_score)
+    return df_purch.sort_values(
+        by=['Sort_Base', '품목', 'calc_spec', 'display_spec'],
+        key=lambda x: natural_sort_values(x) if x.name in ['calc_spec', 'display_spec'] else x,
+        ascending=True
+    )
+
+def all_spec_options(df_sorted):
+    # 품목별 (규격1, 규격2) 조합 → 선택지 라벨 (df_sorted 는 품목 안에서 규격 자연 정렬 순서)
+    specs = {}
+    for item, s1, s2 in df_sorted[['품목', 'calc_spec', 'display_spec']].drop_duplicates().itertuples(index=False):
+        spec_opts, spec_map = specs.setdefault(item, ([], {}))
+        label = f"{s1} | {s2}" if s2 and s2!=s1 else s1
+        spec_opts.append(label); spec_map[label] = (s1, s2)
+    return specs
+
+def unit_divisor(item, spec1):
+    item = str(item); spec1 = str(spec1); divisor = 1.0
+    if '럿셀망' in item: divisor = 1.0
+    elif any(x in item for x in ['안전망', '멀티망']):
+        nums = [float(x) for x in re.findall(r'(\d+(?:\.\d+)?)', spec1)]
+        if len(nums) >= 2: divisor = nums[0] * nums[1]
+        elif len(nums) == 1: divisor = nums[0]
+    elif any(x in item for x in ['와이어로프', '와이어클립']):
+        nums = [float(x) for x in re.findall(r'(\d+(?:\.\d+)?)', spec1)]
+        if nums: divisor = nums[-1]
+    if divisor == 0: divisor = 1.0
+    return divisor
+
+def match_vendor_columns(columns, target_vendors):
+    # 공백을 무시하고 선택 순서대로 실제 피벗 컬럼명 매칭
+    clean_to_real = {}
+    for c in columns:
+        if c not in KEY_COLS: clean_to_real[str(c).replace(' ', '')] = c
+
+    ordered_matched_cols = []
+    for t in target_vendors:
+        clean_t = str(t).replace(' ', '')
+        if clean_t in clean_to_real: ordered_matched_cols.append(clean_to_real[clean_t])
+    return ordered_matched_cols
+
+def vendor_comparison(df_purch, cart, vendor_col, price_col, target_vendors):
+    # 비교 리스트(cart: item/s1/s2) × 선택 업체 단위당 단가표 → (결과, 업체 컬럼 목록)
+    cart_df = pd.DataFrame(cart)
+    cart_df['__order'] = range(len(cart_df))
+    cart_df.rename(columns={'item': '품목', 's1': 'calc_spec', 's2': 'display_spec'}, inplace=True)
+
+    df_pivot_base = df_purch.pivot_table(index=KEY_COLS, columns=vendor_col, values=price_col, aggfunc='first', observed=True).reset_index()
+    merged_view = pd.merge(cart_df, df_pivot_base, on=KEY_COLS, how='left')
+    ordered_matched_cols = match_vendor_columns(df_pivot_base.columns, target_vendors)
+
+    def apply_unit_calc(row):
+        divisor = unit_divisor(row['품목'], row['calc_spec'])
+        for v in ordered_matched_cols:
+            if v in row:
+                val = row[v]
+                try: row[v] = float(val) / divisor
+                except: pass
+        return row
+
+    df_calc = merged_view.apply(apply_unit_calc, axis=1)
+    df_out = df_calc.sort_values('__order').reset_index(drop=True)
+    df_out['row_id'] = list(zip(df_out['품목'], df_out['calc_spec'], df_out['display_spec']))
+
+    # 품목, 규격 합쳐서 공간 절약
+    def combine_info(row):
+        res = str(row['품목'])
+        extras = []
+        if str(row['calc_spec']).strip(): extras.append(str(row['calc_spec']))
+        if str(row['display_spec']).strip() and str(row['display_spec']) != str(row['calc_spec']): extras.append(str(row['display_spec']))
+        if extras:
+            res += f" ({' / '.join(extras)})"
+        return res
+
+    df_out['품목정보'] = df_out.apply(combine_info, axis=1)
+    return df_out, ordered_matched_cols
+
+# --- 매입견적 비교 (02) ---
+def quote_columns(df_raw):
+    cols = df_raw.columns.tolist()
+    vendor_col = next((c for c in cols if '업체' in c or '거래처' in c), None)
+    item_col = next((c for c in cols if '품목' in c or '품명' in c), None)
+    price_col = next((c for c in cols if '단가' in c or '매입가' in c or '가격' in c), None)
+    spec_cols = [c for c in cols if '규격' in c]
+    return vendor_col, item_col, price_col, spec_cols
+
+def quote_pivot(df_raw, vendor_col, item_col, price_col, spec_cols):
+    # (품목, 통합규격) × 업체 단가표
+    df_raw = df_raw.copy()
+    def combine_specs(row):
+        specs = [str(row[c]) for c in spec_cols if pd.notna(row[c]) and str(row[c]).strip() != '']
+        return ' '.join(specs) if specs else '-'
+
+    df_raw['통합규격'] = df_raw.apply(combine_specs, axis=1)
+    df_pivot = df_raw.pivot_table(index=[item_col, '통합규격'], columns=vendor_col, values=price_col, aggfunc='first', observed=True).reset_index()
+    vendors = [c for c in df_pivot.columns if c not in [item_col, '통합규격']]
+    return df_pivot, vendors
+
+def sorted_quote_items(raw_items):
+    sorted_items = []
+    used_items = set()
+    for kw in PRIORITY_KEYWORDS:
+        matches = sorted([x for x in raw_items if kw in str(x) and x not in used_items], key=natural_sort_key_simple)
+        sorted_items.extend(matches); used_items.update(matches)
+    others = sorted([x for x in raw_items if x not in used_items], key=natural_sort_key_simple)
+    return sorted_items + others
+
+def compare_two_vendors(quote_list, df_pivot, item_col, vendor_a, vendor_b):
+    df_quote = pd.DataFrame(quote_list)
+    df_merged = pd.merge(df_quote, df_pivot[[item_col, '통합규격', vendor_a, vendor_b]], on=[item_col, '통합규격'], how='left')
+    df_merged[f'{vendor_a} 단가'] = df_merged[vendor_a].fillna(0)
+    df_merged[f'{vendor_b} 단가'] = df_merged[vendor_b].fillna(0)
+    df_merged['단가 차액'] = df_merged[f'{vendor_b} 단가'] - df_merged[f'{vendor_a} 단가']
+    df_merged[f'{vendor_a} 합계'] = df_merged[f'{vendor_a} 단가'] * df_merged['수량']
+    df_merged[f'{vendor_b} 합계'] = df_merged[f'{vendor_b} 단가'] * df_merged['수량']
+    df_merged['총 차액'] = df_merged[f'{vendor_a} 합계'] - df_merged[f'{vendor_b} 합계']
+    return df_merged
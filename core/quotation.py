@@ -0,0 +1,86 @@
+import re
+from collections import namedtuple
+
+import pandas as pd
+
+from core.canonical import canonical, canonical_values
+
+# -----------------------------------------------------------------------------
+# 견적서 (pages/04_quotation_generator.py) — 금액 배수, 거래처 매출단가 불러오기
+#   Sales_매출단가 → {매출업체: 그 업체 단가표 + (품목, 규격, 비고) 정규화 키 → 행 번호} 를 파일 버전별로 한 번만 만들어 두고
+#   (core/derived.py, 서버 시작 시 prewarm) 견적 행마다 해시 조회 — 거래처 단가가 없는 행은 기본 단가 목록으로
+#   견적서 품명 표기: "안전망2cm KS망" → 품목 안전망2cm + 비고 KS,  "pp로프(200m)" → 품목 PP로프 (괄호 안 표기 무시)
+#   견적 단가 = 매출단가 / 금액 배수 (소수 둘째 자리 반올림 — 수량 × 단가 × 배수 ≈ 수량 × 매출단가, 예: 안전망 1.2*50 은 m2 당 단가)
+# -----------------------------------------------------------------------------
+CustomerPrices = namedtuple('CustomerPrices', ['table', 'lookup'])  # table: 품목/규격/비고/단위/단가 (시트 순서), lookup: 정규화 키 → table 행 번호
+QUOTE_COLUMNS = ["번호", "품명", "규격", "단위", "수량", "단가(원)", "금액(원)", "비고", "기본단가"]
+
+def quote_multiplier(item, spec):
+    # 금액 = 수량 × 단가 × 배수 (안전망/멀티망은 폭×길이, 와이어로프/클립은 m 길이)
+    item = str(item); spec = str(spec); multiplier = 1.0
+    if '럿셀망' in item:
+        multiplier = 1.0
+    elif any(x in item for x in ['안전망', '멀티망']):
+        nums = [float(x) for x in re.findall(r'(\d+(?:\.\d+)?)', spec)]
+        if len(nums) >= 2: multiplier = nums[0] * nums[1]
+        elif len(nums) == 1 and re.search(r'[xX*]', spec): multiplier = nums[0]
+    elif any(x in item for x in ['와이어로프', '와이어클립']):
+        nums = [float(x) for x in re.findall(r'(\d+(?:\.\d+)?)', spec)]
+        if nums and re.search(r'[mM미터]', spec): multiplier = nums[-1]
+    return multiplier
+
+def _text(v):
+    return "" if v is None or pd.isna(v) else str(v)
+
+def quote_key(name, spec):
+    # 견적서 품명/규격 → (품목, 규격, 비고) 정규화 키
+    item, note = re.sub(r'\(.*?\)', '', canonical(_text(name))), ''
+    if item.endswith('ks망'): item, note = item[:-3], 'ks'
+    return (item, canonical(_text(spec)), note)
+
+def customer_price_index(df_sales, note_col, price_col):
+    # {매출업체: CustomerPrices} — 같은 키가 여러 행이면 비교표(pivot 'first')와 같이 첫 단가, 0/빈 단가 제외
+    d = df_sales[df_sales[price_col].notna() & (df_sales[price_col] != 0)]
+    d = d.drop_duplicates(['매출업체', '품목', '규격', note_col], keep='first')
+    items = pd.Series(canonical_values(d['품목'])).str.replace(r'\(.*?\)', '', regex=True).to_numpy()
+    keys = list(zip(items, canonical_values(d['규격']), canonical_values(d[note_col])))
+    d = pd.DataFrame({'품목': d['품목'].astype(str).to_numpy(), '규격': d['규격'].astype(str).to_numpy(), '비고': d[note_col].astype(str).to_numpy(),
+                      '단위': d['단위'].astype(str).to_numpy(), '단가': d[price_col].astype(float).to_numpy(), '매출업체': d['매출업체'].to_numpy()})
+    index = {}
+    for vendor, rows in d.groupby('매출업체', observed=True, sort=True).indices.items():
+        table = d.iloc[rows].drop(columns='매출업체').reset_index(drop=True)
+        index[str(vendor)] = CustomerPrices(table, dict(reversed([(keys[r], i) for i, r in enumerate(rows)])))  # 정규화 키가 겹치면 첫 행
+    return index
+
+def _quote_price(price, name, spec):
+    return round(price / quote_multiplier(name, spec), 2)
+
+def prefill_quote(quote_df, prices, defaults):
+    # 견적표 각 행 단가를 거래처 단가로 (없으면 defaults: 정규화 키 → 기본 단가, 그것도 없으면 그대로) → (새 견적표, 거래처 단가 적용 행 수)
+    df = quote_df.astype({'단가(원)': float, '기본단가': float})  # 단위당 단가는 소수가 될 수 있음
+    found = 0
+    for idx in df.index:
+        name, spec = df.at[idx, '품명'], df.at[idx, '규격']
+        if not _text(name).strip(): continue
+        key = quote_key(name, spec)
+        row = prices.lookup.get(key)
+        if row is not None:
+            price = _quote_price(prices.table.at[row, '단가'], name, spec); found += 1
+        elif key in defaults: price = defaults[key]
+        else: continue
+        df.at[idx, '단가(원)'] = price; df.at[idx, '기본단가'] = price
+    return df, found
+
+def customer_quote(prices, items=None):
+    # 거래처 단가표 전체(또는 선택 품목)를 견적 행으로 — 비고 KS 는 품명 "… KS망", 그 밖의 비고는 비고 칸
+    t = prices.table if not items else prices.table[prices.table['품목'].isin(items)]
+    is_ks = t['비고'].str.startswith('KS')
+    df = pd.DataFrame({
+        "번호": range(1, len(t) + 1),
+        "품명": (t['품목'] + is_ks.map({True: ' KS망', False: ''})).to_numpy(),
+        "규격": t['규격'].to_numpy(), "단위": t['단위'].to_numpy(), "수량": None,
+        "단가(원)": [_quote_price(p, n, s) for p, n, s in zip(t['단가'], t['품목'], t['규격'])],
+        "금액(원)": None, "비고": t['비고'].where(~t['비고'].isin(['', 'KS']), '').to_numpy(),
+    })
+    df['기본단가'] = df['단가(원)']
+    return df[QUOTE_COLUMNS]
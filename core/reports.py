@@ -0,0 +1,134 @@
+import os
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from core.workbook import FILE_PATH, ACCOUNTS_PATH, file_version, read_dataset
+from core.excel_header import detect_header
+from core.sales import DEFAULT_VENDORS as DEFAULT_SALES_VENDORS, sales_pivot, to_unit_price
+from core.purchase import DEFAULT_VENDORS as DEFAULT_PURCHASE_VENDORS, KEY_COLS, vendor_comparison
+from core.accounts import aging_report, plain_report
+from core.labor import LABOR_ITEMS, DEFAULT_WIDTHS, DEFAULT_LENGTH, read_labor_base, labor_grid
+from core.price_diff import price_diff, diff_summary
+from core.export import sheet_title, write_xlsx
+
+# -----------------------------------------------------------------------------
+# 정기 보고서 (Streamlit 없이 실행 — batch.py)
+#   보고서 정의 = {'type': 보고서 종류, 'out': 저장 경로, ...옵션}
+#   같은 프로세스 안의 여러 보고서는 ReportSource 하나를 공유 → 엑셀 파일은 버전당 한 번만 파싱
+#   각 보고서 함수는 {시트명: DataFrame} 을 반환하고 저장은 write_report 가 담당
+# -----------------------------------------------------------------------------
+class ReportSource:
+    def __init__(self, price_path=FILE_PATH, accounts_path=ACCOUNTS_PATH):
+        self.price_path = price_path
+        self.accounts_path = accounts_path
+        self._memo = {}  # (종류, 경로, 파일 버전) → 파싱 결과
+        self.parsed = []  # 실제로 파싱한 (종류, 경로) 기록
+
+    def _get(self, kind, path, build):
+        key = (kind, path, file_version(path))
+        if key not in self._memo:
+            self._memo[key] = build(path)
+            self.parsed.append((kind, path))
+        return self._memo[key]
+
+    def dataset(self, path=None):
+        return self._get('dataset', path or self.price_path, read_dataset)
+
+    def labor_base(self):
+        return self._get('labor', self.price_path, read_labor_base)
+
+    def accounts(self):
+        return self._get('accounts', self.accounts_path,
+                         lambda p: (pd.read_excel(p, header=None), detect_header(p, 0, marker='업체구분')))
+
+def _vendors(requested, all_vendors, defaults):
+    # 'all' → 전체, 없으면 기본 업체 중 파일에 있는 업체 (하나도 없으면 전체)
+    if requested == 'all': return list(all_vendors)
+    if requested: return [v for v in requested if v in all_vendors]
+    return [v for v in defaults if v in all_vendors] or list(all_vendors)
+
+# --- 매출단가표 (01) ---
+def sales_prices_report(src, vendors=None, items=None, unit_price=False):
+    df_sorted, note_col, price_col = src.dataset().sales
+    vendors = _vendors(vendors, sorted(df_sorted['매출업체'].dropna().unique().astype(str)), DEFAULT_SALES_VENDORS)
+    df = sales_pivot(df_sorted, note_col, price_col, vendors)
+    if items: df = df[df.index.get_level_values('품목').isin(items)]
+    if unit_price: df = to_unit_price(df, note_col)
+    return {'단위당 단가' if unit_price else '매출단가': df.reset_index()}
+
+# --- 업체별 매입단가 비교 (03) ---
+def vendor_comparison_report(src, vendors=None, items=None):
+    df_sorted, vendor_col, price_col = src.dataset().purch
+    vendors = _vendors(vendors, sorted(df_sorted[vendor_col].dropna().unique().astype(str)), DEFAULT_PURCHASE_VENDORS)
+    keys = df_sorted[KEY_COLS].drop_duplicates()
+    if items: keys = keys[keys['품목'].isin(items)]
+    cart = [{'item': i, 's1': s1, 's2': s2} for i, s1, s2 in keys.itertuples(index=False)]
+    if not cart or not vendors: return {'업체별 비교': pd.DataFrame(columns=['품목', '규격1', '규격2'] + vendors)}
+    df_out, cols = vendor_comparison(df_sorted, cart, vendor_col, price_col, vendors)
+    df = df_out[KEY_COLS + cols].rename(columns={'calc_spec': '규격1', 'display_spec': '규격2'})
+    return {'업체별 비교': df}
+
+# --- 미수금/미지급금 잔고 (05) ---
+def aging_report_sheets(src, ref_date=None):
+    ref_date = datetime.date.fromisoformat(ref_date) if ref_date else datetime.date.today()
+    df_raw, layout = src.accounts()
+    sheets = {}
+    for title, mode in [('미수금', '매출업체'), ('미지급금', '매입업체')]:
+        sheets[title] = plain_report(aging_report(df_raw, ref_date, mode, layout))
+    return sheets
+
+# --- 폭별 인건비 (07) ---
+def _flat_grid(df):
+    # (길이, 폭) × (두께, 단가종류) → 길이/폭 컬럼 + "6mm 기본" 형태 컬럼 (화면과 같이 원 단위 버림)
+    out = pd.DataFrame(np.trunc(df.to_numpy()).astype(np.int64), columns=[f"{int(t)}mm {k}" for t, k in df.columns])
+    out.insert(0, '폭(m)', df.index.get_level_values('폭(m)'))
+    out.insert(0, '길이(m)', df.index.get_level_values('길이(m)'))
+    return out
+
+def labor_grid_report(src, items=None, kinds=None, widths=None, lengths=None, rope_length_per_roll=126.0):
+    base_tables = src.labor_base()
+    sheets = {}
+    for item in items or LABOR_ITEMS:
+        kinds_all, df_base = base_tables['방염' in item]
+        sel = [k for k in kinds or kinds_all if k in kinds_all]
+        if not sel: continue
+        df_roll, df_m2 = labor_grid(df_base[sel], sel, widths or DEFAULT_WIDTHS, lengths or [DEFAULT_LENGTH], rope_length_per_roll)
+        sheets[f"{item} 1롤"] = _flat_grid(df_roll)
+        sheets[f"{item} m²당"] = _flat_grid(df_m2)
+    return sheets
+
+# --- 단가표 버전 비교 (09) ---
+def price_diff_report(src, old, new=None):
+    # old: 이전 단가표 경로, new: 새 단가표 (기본: 현재 단가표)
+    diffs = price_diff(src.dataset(old), src.dataset(new))
+    return {'요약': diff_summary(diffs), **{f"{sheet} 변경": df for sheet, df in diffs.items()}}
+
+REPORTS = {
+    'sales_prices': sales_prices_report,
+    'vendor_comparison': vendor_comparison_report,
+    'aging': aging_report_sheets,
+    'labor_grid': labor_grid_report,
+    'price_diff': price_diff_report,
+}
+
+def run_report(src, definition):
+    # 보고서 정의 하나 실행 → {시트명: DataFrame}
+    params = {k: v for k, v in definition.items() if k not in ('type', 'out')}
+    kind = definition['type']
+    if kind not in REPORTS: raise ValueError(f"알 수 없는 보고서 종류: {kind} (가능: {', '.join(REPORTS)})")
+    return REPORTS[kind](src, **params)
+
+def write_report(sheets, path):
+    # .xlsx → 시트별 저장 (core/export.py: 숫자 서식·머리글 고정), .csv → 시트마다 "파일명_시트명.csv" (엑셀 한글 호환 utf-8-sig)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    if path.lower().endswith('.csv'):
+        stem = path[:-4]
+        paths = []
+        for name, df in sheets.items():
+            out = path if len(sheets) == 1 else f"{stem}_{sheet_title(name)}.csv"
+            df.to_csv(out, index=False, encoding='utf-8-sig'); paths.append(out)
+        return paths
+    write_xlsx(sheets, path)
+    return [path]
@@ -0,0 +1,72 @@
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# -----------------------------------------------------------------------------
+# 세션 공용 결과 캐시 (LRU, 개수·메모리 제한) — 같은 조회 조건이면 계산 없이 마지막 표시용 표를 재사용
+#   키: (데이터 버전, 페이지, 정규화된 필터 선택, 단가 방식, 정렬 옵션 …)
+#   값은 여러 세션이 공유하므로 읽기 전용으로 취급 (수정이 필요하면 복사해서 사용)
+#   큰 단가표 한 건이 수십 MB 가 될 수 있어 넣을 때 크기를 재고, 합계가 RESULT_CACHE_MB 를 넘으면 오래된 것부터 제거
+#   (한 건이 한도보다 크면 보관하지 않음)
+# -----------------------------------------------------------------------------
+RESULT_CACHE_SIZE = 128
+RESULT_CACHE_MB = 256
+
+def value_bytes(value):
+    # 캐시 값의 대략적인 메모리 크기 (DataFrame/Series 는 문자열 포함 deep 측정, 튜플·리스트·dict 는 항목 합계)
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+    if isinstance(value, np.ndarray): return value.nbytes
+    if isinstance(value, (tuple, list)): return sys.getsizeof(value) + sum(value_bytes(v) for v in value)
+    if isinstance(value, dict): return sys.getsizeof(value) + sum(value_bytes(k) + value_bytes(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+class ResultCache:
+    def __init__(self, maxsize=RESULT_CACHE_SIZE, max_mb=RESULT_CACHE_MB):
+        self.maxsize = maxsize
+        self.max_bytes = int(max_mb * 2**20)
+        self._items = OrderedDict()
+        self._sizes = {}  # 키 → 바이트
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+        # 계산은 잠금 밖에서 (같은 키를 동시에 계산해도 결과는 같으므로 나중 것이 덮어씀)
+        value = compute()
+        size = value_bytes(value)
+        if size > self.max_bytes: return value
+        with self._lock:
+            self._bytes += size - self._sizes.get(key, 0)
+            self._items[key] = value; self._sizes[key] = size
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize or self._bytes > self.max_bytes:
+                old, _ = self._items.popitem(last=False)
+                self._bytes -= self._sizes.pop(old)
+        return value
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            pages = {}
+            for key in self._items: pages[key[1]] = pages.get(key[1], 0) + 1
+            return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hits / lookups if lookups else 0.0,
+                    'size': len(self._items), 'maxsize': self.maxsize, 'mb': self._bytes / 2**20, 'max_mb': self.max_bytes / 2**20,
+                    'by_page': pages}
+
+    def clear(self):
+        with self._lock:
+            self._items.clear(); self._sizes.clear(); self._bytes = 0; self.hits = 0; self.misses = 0
+
+RESULTS = ResultCache()
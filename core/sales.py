@@ -0,0 +1,188 @@
+import re
+import math
+import pandas as pd
+
+# -----------------------------------------------------------------------------
+# 매출단가 조회 (pages/01_sales_price.py) 계산 로직
+# -----------------------------------------------------------------------------
+PRIORITY_ITEMS = [
+    '안전망1cm', '안전망2cm', '안전망',
+    '멀티망', '럿셀망',
+    'PE로프', 'pp로프', 'PP로프',
+    '와이어로프', '와이어',
+    '와이어클립', '케이블타이'
+]
+
+DEFAULT_VENDORS = ['가온건설', '신영산업안전', '네오이앤씨', '동원', '우주안전', '세종스틸', '제이엠산업개발', '전진산업안전', '씨에스산업건설', '타포', '경원안전', '토우코리아']
+
+# 큰 단가표는 페이지 단위로만 전송 (행 × 업체 열 창, 전송량은 전체 크기와 무관)
+WINDOW_ROWS = 100
+WINDOW_COLS = 30
+WINDOW_MIN_CELLS = 20000  # 이보다 큰 표는 기본으로 페이지 보기
+
+def robust_natural_sort_key(s):
+    text = str(s).strip()
+    if 'KS' in text: keyword_rank = 0
+    elif '가공' in text: keyword_rank = 2
+    else: keyword_rank = 1
+
+    def convert(t):
+        # 숫자/문자 조각이 같은 위치에서 섞여도 비교 가능하도록 (종류, 값) 으로 구분 (숫자가 앞)
+        return (0, float(t)) if t.replace('.', '', 1).isdigit() else (1, t.lower())
+
+    alphanum_key = [convert(c) for c in re.split('([0-9.]+)', text) if c]
+    return (keyword_rank, tuple(alphanum_key))
+
+def natural_sort_values(x):
+    # sort_values(key=...) 용: 규격 category 는 카테고리 순서가 이미 자연 정렬이므로 그대로 사용
+    if isinstance(x.dtype, pd.CategoricalDtype): return x
+    return x.map(robust_natural_sort_key)
+
+def extract_number_safe(text):
+    if pd.isna(text): return float('inf')
+    match = re.search(r'(\d+(\.\d+)?)', str(text))
+    if match: return float(match.group(1))
+    return float('inf')
+
+def format_price_safe(val):
+    try:
+        if pd.isna(val) or val == "" or val == 0: return ""
+        return f"{int(float(val)):,}"
+    except: return str(val)
+
+def get_item_priority(name):
+    name_str = str(name).strip()
+    for i, key in enumerate(PRIORITY_ITEMS):
+        if key in name_str: return i
+    return 999
+
+def get_note_rank(note):
+    s = str(note).strip()
+    if s == 'KS로프가공': return 2
+    if s == '로프가공': return 3
+    if 'KS' in s: return 0
+    return 1
+
+def prepare_sales(df_sales):
+    # 비고/규격/단위 컬럼 정리 후 (데이터, 비고 컬럼명, 현재매출단가 컬럼명) 반환
+    df_sales = df_sales.copy()
+    note_col = '비고 1' if '비고 1' in df_sales.columns else '비고'
+    if note_col not in df_sales.columns: df_sales[note_col] = ""
+
+    df_sales[note_col] = df_sales[note_col].fillna("").astype(str)
+    if '규격' in df_sales.columns:
+        df_sales['규격'] = df_sales['규격'].fillna("").astype(str)
+    if '단위' not in df_sales.columns: df_sales['단위'] = ""
+
+    current_price_col = next((c for c in df_sales.columns if '현재매출단가' in str(c)), None)
+    return df_sales, note_col, current_price_col
+
+def sort_sales(df_sales, note_col):
+    df_sales['rank_item'] = df_sales['품목'].apply(get_item_priority)
+    df_sales['rank_note'] = df_sales[note_col].apply(get_note_rank)
+    df_sales['rank_num'] = df_sales[note_col].apply(extract_number_safe)
+
+    return df_sales.sort_values(
+        by=['rank_item', 'rank_note', 'rank_num', '규격'],
+        key=lambda x: natural_sort_values(x) if x.name == '규격' else x,
+        ascending=True
+    )
+
+def sales_pivot(df_final, note_col, price_col, vendors, df_order=None):
+    # (품목, 규격, 비고, 단위) × 매출업체 단가표, 선택 업체만 남기고 단가가 모두 비어있는 행 제거
+    # df_order: 행 순서를 정할 원본 (df_final 을 선택 업체 행만으로 줄여 넘길 때 사용)
+    unique_rows = (df_final if df_order is None else df_order)[['품목', '규격', note_col, '단위']].drop_duplicates()
+    df_pivot = df_final.pivot_table(index=['품목', '규격', note_col, '단위'], columns='매출업체', values=price_col, aggfunc='first', observed=True)
+
+    target_index = pd.MultiIndex.from_frame(unique_rows)
+    final_index = target_index.intersection(df_pivot.index)
+    final_index_sorted = target_index[target_index.isin(final_index)]
+    df_pivot = df_pivot.reindex(final_index_sorted)
+
+    clean_targets = [str(v).replace(' ', '') for v in vendors]
+    valid_cols = [c for c in df_pivot.columns if str(c).replace(' ', '') in clean_targets]
+    df_display = df_pivot[valid_cols]
+    return df_display[df_display.replace(0, pd.NA).notna().any(axis=1)]
+
+def unit_divisor(iname, spec):
+    iname = str(iname); spec = str(spec); div = 1.0
+    if any(x in iname for x in ['안전망', '멀티망']):
+        nums = [float(x) for x in re.findall(r'(\d+(?:\.\d+)?)', spec)]; div = math.prod(nums) if nums else 1.0
+    elif '와이어로프' in iname:
+        m = re.search(r'\*\s*(\d+)', spec); div = float(m.group(1)) if m else 1.0
+    elif '와이어클립' in iname:
+        m = re.search(r'(\d+)', spec); div = float(m.group(1)) if m else 1.0
+    return div
+
+def to_unit_price(df_display, note_col):
+    def unit_calc(row):
+        div = unit_divisor(row.name[0], row.name[1])
+        return row.apply(lambda x: x / div if pd.notnull(x) and isinstance(x, (int, float)) and div != 0 else x)
+
+    df_calc = df_display.apply(unit_calc, axis=1).reset_index()
+
+    # --- 수정: 컬럼 유실 오류 방지를 위해 명시적 반복문으로 처리 ---
+    df_list = []
+    for _, group in df_calc.groupby(['품목', note_col, '단위'], dropna=False, sort=False, observed=True):
+        price_cols = [c for c in group.columns if c not in ['품목', '규격', note_col, '단위']]
+        if len(group[price_cols].drop_duplicates()) == 1:
+            first_row = group.iloc[[0]].copy()
+            first_row['규격'] = ""
+            df_list.append(first_row)
+        else:
+            df_list.append(group)
+
+    df_calc = pd.concat(df_list, ignore_index=True)
+    return df_calc.set_index(['품목', '규격', note_col, '단위'])
+
+def row_label(idx):
+    label = str(idx)
+    if isinstance(idx, tuple):
+        p_name, p_spec, p_note, p_unit = idx
+        parts = [p for p in [p_spec, p_note] if str(p).strip() and str(p) != 'nan']
+        label = f"{p_name}" + (f" ({' / '.join(parts)})" if parts else "")
+    return label
+
+def sort_columns_by_row(df_display, t_idx, descending=False):
+    # 특정 행(품목)의 가격 기준으로 업체 열 정렬, 가격 없는 업체는 항상 뒤로
+    t_row = df_display.loc[t_idx]
+    if isinstance(t_row, pd.DataFrame): t_row = t_row.iloc[0]
+    def s_key(c): v = t_row[c]; return float('inf') if pd.isna(v) or v==0 or v=="" else v
+    if descending:
+        cols_val = [c for c in df_display.columns if s_key(c) != float('inf')]
+        cols_nan = [c for c in df_display.columns if s_key(c) == float('inf')]
+        sorted_cols = sorted(cols_val, key=s_key, reverse=True) + cols_nan
+    else: sorted_cols = sorted(df_display.columns, key=s_key)
+    return df_display[sorted_cols]
+
+def window_pages(n, size):
+    return max(1, -(-n // size))
+
+def table_window(table, row_page, col_page, rows=WINDOW_ROWS, cols=WINDOW_COLS, fixed=('단위',)):
+    # 표시용 표에서 (행 페이지, 업체 열 페이지) 부분만 잘라냄 — 고정 열(단위)은 매 페이지 앞에 유지 (페이지는 1부터)
+    keep = [c for c in fixed if c in table.columns]
+    price_cols = [c for c in table.columns if c not in keep]
+    r0, c0 = (row_page - 1) * rows, (col_page - 1) * cols
+    return table.iloc[r0:r0 + rows][keep + price_cols[c0:c0 + cols]]
+
+def with_item_info(df_display, note_col, pad=False):
+    # 품목/규격/비고를 '품목정보' 한 칸으로 합쳐 인덱스로 사용
+    final_df = df_display.reset_index()
+    def combine_info(x):
+        res = str(x['품목'])
+        extras = []
+        if '규격' in x and str(x['규격']).strip() and str(x['규격']) != 'nan': extras.append(str(x['규격']))
+        if note_col in x and str(x[note_col]).strip() and str(x[note_col]) != 'nan': extras.append(str(x[note_col]))
+        if extras:
+            res += f" ({' / '.join(extras)})"
+
+        if pad:
+            res += "\xa0" * 30
+        return res
+
+    final_df['품목정보'] = final_df.apply(combine_info, axis=1)
+    drop_cols = [c for c in ['품목', '규격', note_col] if c in final_df.columns]
+    return final_df.drop(columns=drop_cols).set_index('품목정보')
+
+def format_prices(df):
+    return df.applymap(format_price_safe) if hasattr(df, 'applymap') else df.map(format_price_safe)
@@ -0,0 +1,73 @@
+import re
+from collections import defaultdict
+
+# -----------------------------------------------------------------------------
+# 품목/규격/비고/업체 선택지 검색 (서버에서 검색 후 상위 결과만 위젯에 전달)
+#   - 글자 n-gram(1글자) 역색인 + 한글 초성 키 ("ㅇㅈㅁ" → 안전망)
+#   - 일치 순위: 앞부분 일치 > 포함 > 글자 순서대로 포함 ("안2" → 안전망2cm), 같은 순위면 짧은 값 먼저
+#   - 초성과 일반 글자를 섞어 입력해도 됨 ("ㅇㅈ망")
+# -----------------------------------------------------------------------------
+CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+SEARCH_LIMIT = 200  # 위젯에 보내는 최대 선택지 수
+
+def normalize(text):
+    return re.sub(r'\s+', '', str(text)).lower()
+
+def choseong(text):
+    # 완성형 한글 음절 → 초성, 나머지 글자는 그대로
+    return ''.join(CHOSEONG[(ord(c) - 0xAC00) // 588] if '가' <= c <= '힣' else c for c in text)
+
+def _char_pattern(ch):
+    # 초성 글자는 그 초성으로 시작하는 음절 범위(588자)와도 일치
+    if ch in CHOSEONG:
+        start = 0xAC00 + CHOSEONG.index(ch) * 588
+        return f'[{ch}{chr(start)}-{chr(start + 587)}]'
+    return re.escape(ch)
+
+class SearchIndex:
+    def __init__(self, values):
+        self.values = list(values)  # 표시 순서 그대로 보관 (순위·길이가 같으면 이 순서)
+        self.text = [normalize(v) for v in self.values]
+        self.cho = [choseong(t) for t in self.text]
+        self.postings = defaultdict(set)  # 글자(또는 초성) → 값 번호
+        self._recent = {}  # 최근 검색어 → 순위별 값 번호 (rerun 마다 같은 검색어가 반복됨)
+        for i, (t, c) in enumerate(zip(self.text, self.cho)):
+            for ch in set(t) | set(c): self.postings[ch].add(i)
+
+    def search(self, query, limit=SEARCH_LIMIT):
+        q = normalize(query)
+        if not q: return self.values[:limit]
+        # 모든 세션이 공유하므로 지역 변수로 받아 사용 (확인과 읽기 사이에 다른 세션이 clear() 해도 안전)
+        ranked = self._recent.get(q)
+        if ranked is None:
+            ranked = self._rank(q)
+            if len(self._recent) >= 256: self._recent.clear()
+            self._recent[q] = ranked
+        return [self.values[i] for i in ranked[:limit]]
+
+    def _rank(self, q):
+        # 모든 글자를 포함하는 후보만 남긴 뒤(적은 목록부터 교집합) 순위 계산
+        lists = sorted((self.postings.get(ch, set()) for ch in set(q)), key=len)
+        cands = set(lists[0]).intersection(*lists[1:]) if lists else set()
+
+        parts = [_char_pattern(ch) for ch in q]
+        contiguous = re.compile(''.join(parts))  # 앞부분 일치 / 포함
+        in_order = re.compile('.*?'.join(parts))  # 글자 순서대로 포함
+        ranked = []
+        for i in cands:
+            t = self.text[i]
+            m = contiguous.search(t)
+            if m: rank = 0 if m.start() == 0 else 1
+            elif in_order.search(t): rank = 2
+            else: continue
+            ranked.append((rank, len(t), i))
+        ranked.sort()
+        return [i for _, _, i in ranked]
+
+def search_options(index, query, options, selected=(), limit=SEARCH_LIMIT):
+    # 위젯 선택지: 이미 선택된 값(유지) + 현재 선택 가능한 목록(options) 중 검색 결과 상위 N개
+    allowed = set(options)
+    if query: found = [v for v in index.search(query, limit=len(index.values)) if v in allowed][:limit]
+    else: found = list(options[:limit])
+    shown = set(found)
+    return [v for v in (selected or []) if v in allowed and v not in shown] + found
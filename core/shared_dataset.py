@@ -0,0 +1,157 @@
+import os
+import json
+import shutil
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from core.workbook import SalesData, PurchaseData, Dataset
+
+# -----------------------------------------------------------------------------
+# 여러 서버 프로세스가 한 벌의 단가 데이터를 공유 (메모리 매핑 컬럼 파일)
+#   게시: publish.py 한 프로세스만 엑셀을 파싱해 정규화된 표를 컬럼별 .npy 로 저장하고 current.json 을 새 버전으로 교체
+#   사용: PRICE_SHARED_DIR 를 지정한 Streamlit 프로세스는 엑셀을 읽지 않고 최신 버전을 np.load(mmap_mode='r') 로 매핑
+#     → 같은 파일의 페이지 캐시를 모든 프로세스가 함께 쓰므로 프로세스 수와 관계없이 메모리는 데이터 한 벌 (/dev/shm 권장)
+#   폴더 구성: <root>/current.json (현재 버전 태그), <root>/<태그>/manifest.json + <표>.<열 번호>.npy
+#     category 열은 코드 배열(매핑) + 카테고리 목록(작아서 프로세스마다 읽음), 숫자 열/인덱스는 그대로 매핑
+#     그 밖의 열(문자열 등)은 매핑할 수 없어 프로세스마다 읽음 — 정규화된 표에는 거의 없음
+#   매핑된 배열은 읽기 전용: pandas copy-on-write 라 필터/정렬/assign 은 새 배열을 만들고 공유 데이터는 바뀌지 않음
+#   새 버전을 게시해도 이전 버전 폴더는 KEEP_VERSIONS 개까지 남겨 두어 아직 이전 버전을 쓰는 프로세스가 깨지지 않게 함
+# -----------------------------------------------------------------------------
+SHARED_DIR_ENV = 'PRICE_SHARED_DIR'
+DEFAULT_SHARED_DIR = '/dev/shm/price_list'
+KEEP_VERSIONS = 3
+FRAMES = ['sales_raw', 'purch_raw', 'sales', 'purch']
+
+def shared_root():
+    # 공유 모드 폴더 (환경 변수가 없으면 None → 프로세스마다 엑셀 파싱)
+    return os.environ.get(SHARED_DIR_ENV) or None
+
+def published(root):
+    # 현재 게시된 버전 정보 (아직 게시 전이면 None)
+    try:
+        with open(os.path.join(root, 'current.json'), encoding='utf-8') as f: return json.load(f)
+    except FileNotFoundError:
+        return None
+
+# -----------------------------------------------------------------------------
+# 게시 (publish.py)
+# -----------------------------------------------------------------------------
+def _save_frame(d, key, df):
+    cols = []
+    for i, c in enumerate(df.columns):
+        s, path = df[c], os.path.join(d, f"{key}.{i}.npy")
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            cats = s.cat.categories
+            np.save(path, s.array.codes)
+            np.save(os.path.join(d, f"{key}.{i}.cats.npy"), cats.to_numpy(dtype=object), allow_pickle=True)
+            cols.append({'name': c, 'kind': 'category', 'cats_dtype': str(cats.dtype), 'ordered': bool(s.cat.ordered)})
+        elif isinstance(s.dtype, np.dtype) and s.dtype.kind in 'biufmM':
+            np.save(path, s.to_numpy())
+            cols.append({'name': c, 'kind': 'array'})
+        else:
+            np.save(path, s.to_numpy(dtype=object), allow_pickle=True)
+            cols.append({'name': c, 'kind': 'object', 'dtype': str(s.dtype)})
+
+    idx = df.index
+    if isinstance(idx, pd.RangeIndex):
+        index = {'kind': 'range', 'start': idx.start, 'stop': idx.stop, 'step': idx.step, 'name': idx.name}
+    else:
+        mapped = isinstance(idx.dtype, np.dtype) and idx.dtype.kind in 'biufmM'
+        np.save(os.path.join(d, f"{key}.index.npy"), idx.to_numpy() if mapped else idx.to_numpy(dtype=object), allow_pickle=not mapped)
+        index = {'kind': 'array' if mapped else 'object', 'name': idx.name}
+    return {'rows': len(df), 'columns': cols, 'index': index}
+
+def _save_labor(d, labor):
+    # 07 인건비 기준표 {방염 여부: (단가종류 목록, 표)} → 행렬 .npy + 행/열 이름
+    if labor is None: return None
+    meta = {}
+    for flame, (kinds, base) in labor.items():
+        np.save(os.path.join(d, f"labor.{int(flame)}.npy"), base.to_numpy(dtype=np.float64))
+        meta[str(int(flame))] = {'kinds': list(kinds), 'index': base.index.tolist(), 'index_name': base.index.name,
+                                 'columns': base.columns.tolist(), 'columns_name': base.columns.name}
+    return meta
+
+def _tag(version):
+    return f"{version[0]}_{version[1]}"
+
+def publish(ds, labor=None, root=DEFAULT_SHARED_DIR, source=None):
+    # Dataset (+ 인건비 기준표) 를 새 버전으로 게시하고 태그 반환 — 같은 파일 버전이 이미 있으면 포인터만 갱신
+    os.makedirs(root, exist_ok=True)
+    tag = _tag(ds.version)
+    d = os.path.join(root, tag)
+    if not os.path.exists(os.path.join(d, 'manifest.json')):
+        tmp = os.path.join(root, f".{tag}.tmp-{os.getpid()}")
+        shutil.rmtree(tmp, ignore_errors=True); os.makedirs(tmp)
+        frames = {key: _save_frame(tmp, key, df) for key, df in zip(FRAMES, (ds.sales_raw, ds.purch_raw, ds.sales.df, ds.purch.df))}
+        size = sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp))
+        manifest = {'tag': tag, 'version': list(ds.version), 'source': source, 'frames': frames,
+                    'sales': {'note_col': ds.sales.note_col, 'price_col': ds.sales.price_col},
+                    'purch': {'vendor_col': ds.purch.vendor_col, 'price_col': ds.purch.price_col},
+                    'memory': {**ds.memory, 'shared_mb': size / 2**20}, 'labor': _save_labor(tmp, labor)}
+        with open(os.path.join(tmp, 'manifest.json'), 'w', encoding='utf-8') as f: json.dump(manifest, f, ensure_ascii=False)
+        try: os.replace(tmp, d)
+        except OSError: shutil.rmtree(tmp, ignore_errors=True)  # 다른 게시 프로세스가 같은 버전을 먼저 게시함
+
+    pointer = {'tag': tag, 'version': list(ds.version), 'source': source, 'published': datetime.datetime.now().isoformat(timespec='seconds')}
+    tmp = os.path.join(root, f".current.json.tmp-{os.getpid()}")
+    with open(tmp, 'w', encoding='utf-8') as f: json.dump(pointer, f, ensure_ascii=False)
+    os.replace(tmp, os.path.join(root, 'current.json'))  # 모든 프로세스가 다음 rerun 부터 새 버전 사용
+    _cleanup(root, tag)
+    return tag
+
+def _cleanup(root, current):
+    # 최근 KEEP_VERSIONS 개 버전만 보관 (삭제해도 이미 매핑한 프로세스는 계속 읽을 수 있음 — 리눅스 기준)
+    tags = [t for t in os.listdir(root) if not t.startswith('.') and t != current and os.path.isdir(os.path.join(root, t))]
+    tags.sort(key=lambda t: os.stat(os.path.join(root, t)).st_mtime_ns, reverse=True)
+    for t in tags[KEEP_VERSIONS - 1:]: shutil.rmtree(os.path.join(root, t), ignore_errors=True)
+
+# -----------------------------------------------------------------------------
+# 매핑 (Streamlit 프로세스)
+# -----------------------------------------------------------------------------
+def _load_array(path, rows):
+    # ndarray 뷰로 넘김 (memmap 하위 클래스가 연산 결과로 퍼지지 않게) — 빈 배열은 매핑 불가라 그냥 읽음
+    return np.asarray(np.load(path, mmap_mode='r')) if rows else np.load(path)
+
+def _load_frame(d, key, meta):
+    rows, data = meta['rows'], {}
+    for i, col in enumerate(meta['columns']):
+        path = os.path.join(d, f"{key}.{i}.npy")
+        if col['kind'] == 'category':
+            cats = pd.Index(np.load(os.path.join(d, f"{key}.{i}.cats.npy"), allow_pickle=True), dtype=col['cats_dtype'])
+            data[i] = pd.Categorical.from_codes(_load_array(path, rows), dtype=pd.CategoricalDtype(cats, col['ordered']), validate=False)
+        elif col['kind'] == 'array':
+            data[i] = _load_array(path, rows)
+        else:
+            data[i] = pd.array(np.load(path, allow_pickle=True), dtype=col['dtype'])
+
+    im = meta['index']
+    if im['kind'] == 'range': index = pd.RangeIndex(im['start'], im['stop'], im['step'], name=im['name'])
+    else:
+        path = os.path.join(d, f"{key}.index.npy")
+        arr = _load_array(path, rows) if im['kind'] == 'array' else np.load(path, allow_pickle=True)
+        index = pd.Index(arr, name=im['name'], copy=False)
+    df = pd.DataFrame(data, index=index, copy=False)  # copy=False: 매핑된 배열을 그대로 사용
+    df.columns = [c['name'] for c in meta['columns']]
+    return df
+
+def _load_labor(d, meta):
+    if meta is None: return None
+    tables = {}
+    for flame, m in meta.items():
+        base = pd.DataFrame(np.load(os.path.join(d, f"labor.{flame}.npy")), index=pd.Index(m['index'], name=m['index_name']),
+                            columns=pd.Index(m['columns'], name=m['columns_name']))
+        tables[flame == '1'] = (m['kinds'], base)
+    return tables
+
+def attach(root, tag):
+    # 게시된 버전 → (Dataset, 인건비 기준표 또는 None)
+    d = os.path.join(root, tag)
+    with open(os.path.join(d, 'manifest.json'), encoding='utf-8') as f: m = json.load(f)
+    sales_raw, purch_raw, df_sales, df_purch = (_load_frame(d, key, m['frames'][key]) for key in FRAMES)
+    ds = Dataset(tuple(m['version']), sales_raw, purch_raw,
+                 SalesData(df_sales, m['sales']['note_col'], m['sales']['price_col']),
+                 PurchaseData(df_purch, m['purch']['vendor_col'], m['purch']['price_col']),
+                 {**m['memory'], 'shared_tag': tag})
+    return ds, _load_labor(d, m['labor'])
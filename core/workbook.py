@@ -0,0 +1,79 @@
+import os
+from collections import namedtuple
+
+import pandas as pd
+
+from core.sales import prepare_sales, sort_sales, robust_natural_sort_key
+from core.purchase import prepare_purchase, sort_purchase
+
+# -----------------------------------------------------------------------------
+# 엑셀 파일 버전 (캐시 키로 사용)
+# -----------------------------------------------------------------------------
+FILE_PATH = 'price_list.xlsx'
+ACCOUNTS_PATH = 'accounts.xlsx'
+HISTORY_DIR = 'price_history'  # 이전 단가표 보관 폴더 (버전 비교용)
+
+def file_version(path):
+    # 파일이 교체되면 수정시각/크기가 바뀌므로 이전 캐시를 자동으로 무효화
+    st_ = os.stat(path)
+    return (st_.st_mtime_ns, st_.st_size)
+
+def list_workbooks(dirs=('.', HISTORY_DIR)):
+    # 비교 후보 엑셀 파일 (현재 단가표·잔고 파일·엑셀 임시 파일 제외), 최근 수정 순
+    paths = []
+    for d in dirs:
+        if not os.path.isdir(d): continue
+        for name in os.listdir(d):
+            path = os.path.normpath(os.path.join(d, name))
+            if name.lower().endswith('.xlsx') and not name.startswith('~$') and path not in (FILE_PATH, ACCOUNTS_PATH): paths.append(path)
+    return sorted(paths, key=lambda p: os.stat(p).st_mtime_ns, reverse=True)
+
+# -----------------------------------------------------------------------------
+# 매출/매입 단가 시트 파싱 (Streamlit 없이 사용 가능 — 화면은 core/dataset.py 캐시, 배치는 batch.py)
+# -----------------------------------------------------------------------------
+SalesData = namedtuple('SalesData', ['df', 'note_col', 'price_col'])          # df: 정규화 + 정렬 완료
+PurchaseData = namedtuple('PurchaseData', ['df', 'vendor_col', 'price_col'])  # df: 정규화 + 정렬 완료
+Dataset = namedtuple('Dataset', ['version', 'sales_raw', 'purch_raw', 'sales', 'purch', 'memory'])
+
+# --- 컬럼 압축: 반복 문자열 키 → category, 단가 → 숫자 배열(빈칸/문자는 NaN) ---
+KEY_COLUMNS = ['품목', '규격', '규격1', '규격2', 'calc_spec', 'display_spec', '비고', '비고 1', '단위', '매출업체', '매입업체']
+SPEC_COLUMNS = ['규격', '규격1', '규격2', 'calc_spec', 'display_spec']
+
+def _category_order(values, natural):
+    # 카테고리 순서를 고정: 규격류는 자연 정렬(1.2 < 10 < 미가공), 나머지는 문자열 정렬
+    cats = pd.unique(values.dropna())
+    return sorted(cats, key=lambda v: (robust_natural_sort_key(v), str(v))) if natural else sorted(cats, key=str)
+
+def compact_frame(df, price_cols=()):
+    df = df.copy()
+    for c in KEY_COLUMNS:
+        if c in df.columns:
+            df[c] = pd.Categorical(df[c], categories=_category_order(df[c], c in SPEC_COLUMNS))
+    for c in price_cols:
+        if c and c in df.columns: df[c] = pd.to_numeric(df[c], errors='coerce').astype('float64')
+    return df
+
+def memory_mb(*frames):
+    return float(sum(f.memory_usage(deep=True).sum() for f in frames)) / 2**20
+
+def read_dataset(path, version=None):
+    sales_raw = pd.read_excel(path, sheet_name='Sales_매출단가')
+    purch_raw = pd.read_excel(path, sheet_name='Purchase_매입단가')
+
+    df_sales, note_col, price_col = prepare_sales(sales_raw)
+    if price_col: df_sales = sort_sales(df_sales, note_col)
+
+    df_purch, vendor_col, purch_price_col = prepare_purchase(purch_raw)
+    if vendor_col and purch_price_col: df_purch = sort_purchase(df_purch)
+
+    # 정렬까지 끝난 뒤 압축 (정렬키 계산은 문자열 기준 그대로)
+    frames = [sales_raw, purch_raw, df_sales, df_purch]
+    before = memory_mb(*frames)
+    sales_raw = compact_frame(sales_raw, [price_col])
+    purch_raw = compact_frame(purch_raw, [c for c in purch_raw.columns if '단가' in str(c) or '가격' in str(c)])
+    df_sales = compact_frame(df_sales, [price_col])
+    df_purch = compact_frame(df_purch, [purch_price_col])
+    memory = {'before_mb': before, 'after_mb': memory_mb(sales_raw, purch_raw, df_sales, df_purch)}
+
+    return Dataset(version if version is not None else file_version(path), sales_raw, purch_raw,
+                   SalesData(df_sales, note_col, price_col), PurchaseData(df_purch, vendor_col, purch_price_col), memory)
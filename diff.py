@@ -0,0 +1,44 @@
+import sys
+import time
+import argparse
+
+import pandas as pd
+
+from core.workbook import FILE_PATH, read_dataset
+from core.price_diff import price_diff, diff_summary
+from core.reports import write_report
+
+# -----------------------------------------------------------------------------
+# 단가표 두 버전 비교 (명령줄)
+#   python diff.py price_history/price_list_0901.xlsx                 # 이전 파일 ↔ 현재 price_list.xlsx
+#   python diff.py old.xlsx new.xlsx --out reports/단가변경.xlsx --top 30
+# -----------------------------------------------------------------------------
+def main(argv=None):
+    ap = argparse.ArgumentParser(description='단가표 버전 비교 (추가/삭제/단가 변경)')
+    ap.add_argument('old', help='이전 단가표')
+    ap.add_argument('new', nargs='?', default=FILE_PATH, help=f'새 단가표 (기본: {FILE_PATH})')
+    ap.add_argument('--out', default=None, help='변경 목록 저장 경로 (.xlsx 또는 .csv)')
+    ap.add_argument('--top', type=int, default=20, help='시트별로 출력할 변경 항목 수 (변동률 큰 순)')
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    old_ds, new_ds = read_dataset(args.old), read_dataset(args.new)
+    t1 = time.perf_counter()
+    diffs = price_diff(old_ds, new_ds)
+    t2 = time.perf_counter()
+
+    print(f"{args.old} → {args.new}  (읽기 {(t1 - t0) * 1000:.0f} ms, 비교 {(t2 - t1) * 1000:.0f} ms)\n")
+    print(diff_summary(diffs).to_string(index=False))
+    with pd.option_context('display.width', 200, 'display.max_columns', 20, 'display.unicode.east_asian_width', True):
+        for sheet, df in diffs.items():
+            changed = df[df['구분'] == '변경'].head(args.top)
+            if changed.empty: continue
+            print(f"\n[{sheet}] 단가 변경 상위 {len(changed)}건")
+            print(changed.assign(변동률=changed['변동률'].map(lambda v: f"{v:+.1%}")).to_string(index=False))
+    if args.out:
+        paths = write_report({'요약': diff_summary(diffs), **{f"{sheet} 변경": df for sheet, df in diffs.items()}}, args.out)
+        print(f"\n저장: {', '.join(paths)}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
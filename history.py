@@ -0,0 +1,63 @@
+import sys
+import argparse
+
+import pandas as pd
+
+from core.workbook import FILE_PATH, read_dataset
+from core.price_history import STORE_DIR, SHEETS, ingest, load_index, price_at, price_trend
+
+# -----------------------------------------------------------------------------
+# 단가 이력 저장소 (명령줄)
+#   python history.py ingest price_list.xlsx --date 2026-09-01    # 버전 기록 (기본 적용일: 파일 수정 시각)
+#   python history.py versions
+#   python history.py price --item 안전망1cm --vendor 가온건설 --date 2026-07-01
+#   python history.py trend --item PP로프 --spec 6mm --purchase --out reports/PP로프_추이.csv
+#   앱은 새 파일 버전을 읽을 때 자동으로 기록하므로, 과거 파일을 순서대로 넣어 이력을 채울 때 주로 사용
+# -----------------------------------------------------------------------------
+def main(argv=None):
+    ap = argparse.ArgumentParser(description='단가 이력 기록·조회')
+    ap.add_argument('--store', default=STORE_DIR)
+    sub = ap.add_subparsers(dest='cmd', required=True)
+
+    p = sub.add_parser('ingest', help='단가표 버전 기록 (여러 파일은 적용일 순서로)')
+    p.add_argument('files', nargs='*', default=[FILE_PATH])
+    p.add_argument('--date', default=None, help='적용 일시 (파일 하나일 때, 기본: 파일 수정 시각)')
+
+    sub.add_parser('versions', help='기록된 버전 목록')
+
+    for name, help_ in [('price', '특정 날짜 단가'), ('trend', '버전별 단가 추이')]:
+        p = sub.add_parser(name, help=help_)
+        p.add_argument('--item', required=True)
+        p.add_argument('--spec', default=None)
+        p.add_argument('--note', default=None)
+        p.add_argument('--vendor', action='append', help='업체 (여러 번 지정 가능)')
+        p.add_argument('--purchase', action='store_true', help='매입단가 시트 (기본: 매출단가)')
+        p.add_argument('--out', default=None, help='CSV 저장 경로')
+        if name == 'price': p.add_argument('--date', default=None, help='조회 날짜 (기본: 최신)')
+    args = ap.parse_args(argv)
+
+    if args.cmd == 'ingest':
+        for path in args.files:
+            info = ingest(read_dataset(path), path, args.date if len(args.files) == 1 else None, args.store)
+            if info is None: print(f"{path}: 이미 기록된 버전"); continue
+            counts = ', '.join(f"{s} +{c['추가']} ~{c['변경']} -{c['삭제']}" for s, c in info['changes'].items())
+            print(f"{path}: 버전 {info['id']} ({info['effective']}) {info['cells']:,}칸 기록 — {counts}")
+        return 0
+
+    idx = load_index(args.store)
+    if args.cmd == 'versions':
+        print(idx.versions[['id', 'effective', 'source', 'cells']].to_string(index=False) if not idx.versions.empty else '기록된 버전 없음')
+        return 0
+
+    sheet = SHEETS[1] if args.purchase else SHEETS[0]
+    if args.cmd == 'price': df = price_at(idx, args.item, args.date, args.vendor, args.spec, args.note, sheet)
+    else: df = price_trend(idx, args.item, args.vendor, args.spec, args.note, sheet)
+    if args.out:
+        df.to_csv(args.out, index=args.cmd == 'trend', encoding='utf-8-sig'); print(f"저장: {args.out}")
+    else:
+        with pd.option_context('display.width', 200, 'display.max_columns', 50, 'display.unicode.east_asian_width', True):
+            print(df.to_string(index=args.cmd == 'trend') if not df.empty else '결과 없음')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
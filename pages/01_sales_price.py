@@ -1,49 +1,30 @@
 import streamlit as st
-import pandas as pd
-import re
-import os
-import math
+import datetime
+from core.profiler import start_profile
+from core.dataset import FILE_PATH, load_dataset
+from core.derived import UNIT_MODES, sales_options, default_sales_vendors, sales_view, sales_search, sales_filter_index, sales_stats
+from core.search import search_options
+from core.result_cache import RESULTS
+from core.prewarm import start_prewarm
+from core.export import XLSX_MIME, xlsx_bytes
+from core.price_stats import STAT_COLUMNS, OUTLIER_Z, MIN_VENDORS, stat_columns, outlier_flags, with_stats, format_table
+from core.sales import (
+    sales_pivot, to_unit_price, row_label, sort_columns_by_row, with_item_info, unit_divisor,
+    WINDOW_ROWS, WINDOW_COLS, WINDOW_MIN_CELLS, window_pages, table_window
+)
 
 st.set_page_config(page_title="매출단가 조회", page_icon="📈", layout="wide")
+prof = start_profile("01_sales_price")
+start_prewarm()
 
 # -----------------------------------------------------------------------------
-# [데이터 강제 로드 로직] 세션에 데이터가 없으면 불러오기
+# [데이터 로드] 프로세스 공유 데이터 (세션별 사본 없음, 읽기 전용)
 # -----------------------------------------------------------------------------
-file_path = 'price_list.xlsx'
-if 'df_sales' not in st.session_state or 'df_purch' not in st.session_state:
-    if os.path.exists(file_path):
-        st.session_state['df_sales'] = pd.read_excel(file_path, sheet_name='Sales_매출단가')
-        st.session_state['df_purch'] = pd.read_excel(file_path, sheet_name='Purchase_매입단가')
-    else:
-        st.error(f"🚨 '{file_path}' 파일이 존재하지 않습니다.")
-        st.stop()
-
-# -----------------------------------------------------------------------------
-# [Helper] 유틸리티 함수
-# -----------------------------------------------------------------------------
-def robust_natural_sort_key(s):
-    text = str(s).strip()
-    if 'KS' in text: keyword_rank = 0
-    elif '가공' in text: keyword_rank = 2
-    else: keyword_rank = 1
-
-    def convert(t):
-        return float(t) if t.replace('.', '', 1).isdigit() else t.lower()
-    
-    alphanum_key = [convert(c) for c in re.split('([0-9.]+)', text) if c]
-    return (keyword_rank, tuple(alphanum_key))
-
-def extract_number_safe(text):
-    if pd.isna(text): return float('inf')
-    match = re.search(r'(\d+(\.\d+)?)', str(text))
-    if match: return float(match.group(1))
-    return float('inf')
-
-def format_price_safe(val):
-    try:
-        if pd.isna(val) or val == "" or val == 0: return ""
-        return f"{int(float(val)):,}"
-    except: return str(val)
+with prof.phase("데이터 로드"):
+    ds = load_dataset()
+if ds is None:
+    st.error(f"🚨 '{FILE_PATH}' 파일이 존재하지 않습니다.")
+    st.stop()
 
 # -----------------------------------------------------------------------------
 # 메인 로직
@@ -51,179 +32,165 @@ def format_price_safe(val):
 st.title("📈 매출단가 조회")
 
 try:
-    df_sales = st.session_state['df_sales'].copy()
-    
-    note_col = '비고 1' if '비고 1' in df_sales.columns else '비고'
-    if note_col not in df_sales.columns: df_sales[note_col] = ""
-    
-    df_sales[note_col] = df_sales[note_col].fillna("").astype(str)
-    if '규격' in df_sales.columns:
-        df_sales['규격'] = df_sales['규격'].fillna("").astype(str)
-    if '단위' not in df_sales.columns: df_sales['단위'] = ""
-    
-    current_price_col = next((c for c in df_sales.columns if '현재매출단가' in str(c)), None)
+    df_sorted, note_col, current_price_col = ds.sales
     if not current_price_col: 
         st.error("필수 컬럼 없음"); st.stop()
 
-    price_mode = st.radio("단가 표시 방식", ["기본 단가", "단위당 단가"], index=1, horizontal=True)
-
-    priority_items = [
-        '안전망1cm', '안전망2cm', '안전망', 
-        '멀티망', '럿셀망', 
-        'PE로프', 'pp로프', 'PP로프', 
-        '와이어로프', '와이어', 
-        '와이어클립', '케이블타이'
-    ]
-    
-    def get_item_priority(name):
-        name_str = str(name).strip()
-        for i, key in enumerate(priority_items):
-            if key in name_str: return i
-        return 999
-
-    def get_note_rank(note):
-        s = str(note).strip()
-        if s == 'KS로프가공': return 2
-        if s == '로프가공': return 3
-        if 'KS' in s: return 0
-        return 1
-
-    df_sales['rank_item'] = df_sales['품목'].apply(get_item_priority)
-    df_sales['rank_note'] = df_sales[note_col].apply(get_note_rank)
-    df_sales['rank_num'] = df_sales[note_col].apply(extract_number_safe)
-    
-    df_sorted = df_sales.sort_values(
-        by=['rank_item', 'rank_note', 'rank_num', '규격'],
-        key=lambda x: x.map(robust_natural_sort_key) if x.name == '규격' else x,
-        ascending=True
-    )
+    price_mode = st.radio("단가 표시 방식", UNIT_MODES, index=1, horizontal=True)
 
+    # 선택지/첫 화면 단가표는 미리 계산된 공유 캐시 사용 (서버 시작 시 prewarm)
+    # 각 선택지는 검색창 입력으로 서버에서 걸러 상위 결과만 표시 (초성 검색 가능, 선택한 값은 유지)
+    with prof.phase("선택지 준비"):
+        opts = sales_options(ds.version, ds)
+        search = sales_search(ds.version, ds)
+        fx = sales_filter_index(ds.version, ds)
     st.subheader("🔍 데이터 필터")
-    all_vendors = sorted(df_sales['매출업체'].dropna().unique().astype(str))
-    def_v = ['가온건설', '신영산업안전', '네오이앤씨', '동원', '우주안전', '세종스틸', '제이엠산업개발', '전진산업안전', '씨에스산업건설', '타포', '경원안전', '토우코리아']
-    sel_v_raw = st.multiselect("🏢 조회할 업체 선택", all_vendors, default=[v for v in def_v if v in all_vendors], placeholder="전체 업체 (클릭해서 선택)")
+    all_vendors = opts.vendors
+    default_v = default_sales_vendors(opts)
+    q_v = st.text_input("업체 검색", key="sp_q_vendor", placeholder="🔎 업체 검색 (예: ㄱㅇ, 가온)", label_visibility="collapsed")
+    # 기본 업체는 처음 한 번만 세션 값으로 지정 (default= 는 검색으로 선택지가 줄면 선택지에 없는 값이 되어 오류)
+    if "sp_vendor" not in st.session_state: st.session_state["sp_vendor"] = default_v
+    vendor_opts = search_options(search['vendors'], q_v, all_vendors, st.session_state["sp_vendor"])
+    sel_v_raw = st.multiselect("🏢 조회할 업체 선택", vendor_opts, key="sp_vendor", placeholder="전체 업체 (클릭해서 선택)")
     sel_v = all_vendors if not sel_v_raw else sel_v_raw
 
     c1, c2, c3 = st.columns(3)
-    all_items = [x for x in df_sorted['품목'].unique().tolist() if str(x).strip() != ""]
-    
-    with c1: sel_i_raw = st.multiselect("📦 품목", all_items, default=[], placeholder="전체 품목 (클릭해서 선택)")
+    all_items = opts.items
     
-    if not sel_i_raw:
-        df_step1 = df_sorted
-    else:
-        df_step1 = df_sorted[df_sorted['품목'].isin(sel_i_raw)].copy()
-        sorter_index = dict(zip(sel_i_raw, range(len(sel_i_raw))))
-        df_step1['select_rank'] = df_step1['품목'].map(sorter_index)
-        df_step1['select_rank'] = df_step1['select_rank'].fillna(999) # NaN 처리
-        df_step1 = df_step1.sort_values(['select_rank', 'rank_note', 'rank_num', '규격'])
-
-    all_specs = [x for x in sorted(df_step1['규격'].unique().tolist(), key=robust_natural_sort_key) if str(x).strip() != ""]
-    with c2: sel_s_raw = st.multiselect("📏 규격", all_specs, default=[], placeholder="전체 규격 (클릭해서 선택)")
-    df_step2 = df_step1 if not sel_s_raw else df_step1[df_step1['규격'].isin(sel_s_raw)]
+    with c1:
+        q_i = st.text_input("품목 검색", key="sp_q_item", placeholder="🔎 품목 검색 (예: 안2, ㅇㅈㅁ)", label_visibility="collapsed")
+        item_opts = search_options(search['items'], q_i, all_items, st.session_state.get("sp_item"))
+        sel_i_raw = st.multiselect("📦 품목", item_opts, default=[], key="sp_item", placeholder="전체 품목 (클릭해서 선택)")
     
-    all_notes = [x for x in df_step2[note_col].unique().tolist() if str(x).strip() != ""]
-    with c3: sel_n_raw = st.multiselect("📝 비고", all_notes, default=[], placeholder="전체 비고 (클릭해서 선택)")
-    df_final = df_step2 if not sel_n_raw else df_step2[df_step2[note_col].isin(sel_n_raw)]
-
-    if not df_final.empty:
-        unique_rows = df_final[['품목', '규격', note_col, '단위']].drop_duplicates()
-        df_pivot = df_final.pivot_table(index=['품목', '규격', note_col, '단위'], columns='매출업체', values=current_price_col, aggfunc='first')
-        
-        target_index = pd.MultiIndex.from_frame(unique_rows)
-        final_index = target_index.intersection(df_pivot.index)
-        final_index_sorted = target_index[target_index.isin(final_index)]
-        df_pivot = df_pivot.reindex(final_index_sorted)
-
-        clean_targets = [str(v).replace(' ', '') for v in sel_v]
-        valid_cols = [c for c in df_pivot.columns if str(c).replace(' ', '') in clean_targets]
-        df_display = df_pivot[valid_cols]
-        df_display = df_display[df_display.replace(0, pd.NA).notna().any(axis=1)]
-
-        if price_mode == "단위당 단가":
-            def unit_calc(row):
-                iname = str(row.name[0]); spec = str(row.name[1]); div = 1.0
-                if any(x in iname for x in ['안전망', '멀티망']):
-                    nums = [float(x) for x in re.findall(r'(\d+(?:\.\d+)?)', spec)]; div = math.prod(nums) if nums else 1.0
-                elif '와이어로프' in iname:
-                    m = re.search(r'\*\s*(\d+)', spec); div = float(m.group(1)) if m else 1.0
-                elif '와이어클립' in iname:
-                    m = re.search(r'(\d+)', spec); div = float(m.group(1)) if m else 1.0
-                return row.apply(lambda x: x / div if pd.notnull(x) and isinstance(x, (int, float)) and div != 0 else x)
-            
-            df_calc = df_display.apply(unit_calc, axis=1).reset_index()
-            
-            # --- 수정: 컬럼 유실 오류 방지를 위해 명시적 반복문으로 처리 ---
-            df_list = []
-            for _, group in df_calc.groupby(['품목', note_col, '단위'], dropna=False, sort=False):
-                price_cols = [c for c in group.columns if c not in ['품목', '규격', note_col, '단위']]
-                if len(group[price_cols].drop_duplicates()) == 1:
-                    first_row = group.iloc[[0]].copy()
-                    first_row['규격'] = "" 
-                    df_list.append(first_row)
-                else:
-                    df_list.append(group)
-                    
-            df_calc = pd.concat(df_list, ignore_index=True)
-            df_display = df_calc.set_index(['품목', '규격', note_col, '단위'])
+    # 필터는 역색인(값 → 행 번호)으로 처리: 품목은 선택 순서대로, 규격/비고는 그 안에서 걸러냄 (None = 전체 행)
+    with prof.phase("필터"):
+        rows1 = fx.select('품목', sel_i_raw, keep_order=True) if sel_i_raw else None
+        if not sel_i_raw: all_specs = opts.specs
+        else: all_specs = [x for x in fx.options('규격', rows1) if str(x).strip() != ""]
+    with c2:
+        q_s = st.text_input("규격 검색", key="sp_q_spec", placeholder="🔎 규격 검색", label_visibility="collapsed")
+        spec_opts = search_options(search['specs'], q_s, all_specs, st.session_state.get("sp_spec"))
+        sel_s_raw = st.multiselect("📏 규격", spec_opts, default=[], key="sp_spec", placeholder="전체 규격 (클릭해서 선택)")
+    with prof.phase("필터"):
+        rows2 = rows1 if not sel_s_raw else fx.select('규격', sel_s_raw, within=rows1)
+        if not (sel_i_raw or sel_s_raw): all_notes = opts.notes
+        else: all_notes = [x for x in fx.options(note_col, rows2, ordered=False) if str(x).strip() != ""]
+    with c3:
+        q_n = st.text_input("비고 검색", key="sp_q_note", placeholder="🔎 비고 검색", label_visibility="collapsed")
+        note_opts = search_options(search['notes'], q_n, all_notes, st.session_state.get("sp_note"))
+        sel_n_raw = st.multiselect("📝 비고", note_opts, default=[], key="sp_note", placeholder="전체 비고 (클릭해서 선택)")
+    with prof.phase("필터"):
+        rows3 = rows2 if not sel_n_raw else fx.select(note_col, sel_n_raw, within=rows2)
+
+    if len(df_sorted) if rows3 is None else len(rows3):
+        # 같은 조건(업체·규격·비고는 순서 무관, 품목은 선택 순서 유지)의 결과는 세션 공용 캐시에서 재사용
+        view_key = (ds.version, '01_sales_price', tuple(sorted(sel_v)), tuple(sel_i_raw), tuple(sorted(sel_s_raw)), tuple(sorted(sel_n_raw)), price_mode)
+
+        def build_view():
+            if not (sel_i_raw or sel_s_raw or sel_n_raw):
+                with prof.phase("피벗"):
+                    df_display = sales_view(ds.version, tuple(sel_v), price_mode, ds)
+            else:
+                with prof.phase("피벗"):
+                    # 선택 업체 행만 남겨 피벗 (선택 업체 단가가 없는 행은 어차피 제외됨, 행 순서는 필터 결과 기준)
+                    df_final = df_sorted.iloc[rows3]
+                    rows_v = fx.select('매출업체', sel_v, within=rows3) if sel_v_raw else rows3
+                    df_display = sales_pivot(df_sorted.iloc[rows_v], note_col, current_price_col, sel_v, df_order=df_final)
+
+                if price_mode == "단위당 단가":
+                    with prof.phase("단위 환산"):
+                        df_display = to_unit_price(df_display, note_col)
+
+            sort_opts = ["선택 안함"]
+            row_map = {}
+            for idx in df_display.index:
+                label = row_label(idx)
+                sort_opts.append(label); row_map[label] = idx
+            return df_display, sort_opts, row_map
+
+        df_display, sort_opts, row_map = RESULTS.get_or_compute(view_key, build_view)
 
         st.divider()
-        sort_opts = ["선택 안함"]
-        row_map = {}
-        for idx in df_display.index:
-            label = str(idx)
-            if isinstance(idx, tuple):
-                p_name, p_spec, p_note, p_unit = idx
-                parts = [p for p in [p_spec, p_note] if str(p).strip() and str(p) != 'nan']
-                label = f"{p_name}" + (f" ({' / '.join(parts)})" if parts else "")
-            sort_opts.append(label); row_map[label] = idx
+        # 큰 표는 페이지 보기: 전체 표는 서버(결과 캐시)에 두고 보이는 행/업체 열 페이지만 전송
+        #   (key 없음 → 표 크기 구분이 바뀌면 기본값으로 다시 시작)
+        n_vendors = len(df_display.columns)
+        big = len(df_display) * n_vendors > WINDOW_MIN_CELLS
+        view_mode = st.radio("표 보기", ["페이지 보기", "전체 표"], index=0 if big else 1, horizontal=True,
+                             help=f"페이지 보기: 한 번에 {WINDOW_ROWS}행 × 업체 {WINDOW_COLS}개씩 표시 (큰 표에서 브라우저가 느려지지 않음)")
+        windowed = view_mode == "페이지 보기"
+
+        if windowed:
+            n_rp, n_cp = window_pages(len(df_display), WINDOW_ROWS), window_pages(n_vendors, WINDOW_COLS)
+            # 페이지 번호는 세션 값으로만 관리 (value= 와 함께 쓰면 경고) — 필터가 바뀌어 페이지 수가 줄면 마지막 페이지로
+            for k, n in (("sp_row_page", n_rp), ("sp_col_page", n_cp)):
+                if k not in st.session_state: st.session_state[k] = 1
+                elif st.session_state[k] > n: st.session_state[k] = n
+            cp1, cp2, cp3 = st.columns([1, 1, 2])
+            row_page = cp1.number_input(f"행 페이지 (/{n_rp})", min_value=1, max_value=n_rp, key="sp_row_page")
+            col_page = cp2.number_input(f"업체 열 페이지 (/{n_cp})", min_value=1, max_value=n_cp, key="sp_col_page")
+            r0, c0 = (row_page - 1) * WINDOW_ROWS, (col_page - 1) * WINDOW_COLS
+            cp3.caption(f"행 {r0 + 1:,}–{min(r0 + WINDOW_ROWS, len(df_display)):,} / {len(df_display):,} · "
+                        f"업체 {c0 + 1:,}–{min(c0 + WINDOW_COLS, n_vendors):,} / {n_vendors:,} (열 정렬은 전체 업체 기준)")
+            # 정렬 기준 선택지도 현재 행 페이지만 (선택한 값은 다른 페이지로 넘어가도 유지)
+            cur = st.session_state.get("sp_sort_win", "선택 안함")
+            page_opts = [row_label(idx) for idx in df_display.index[r0:r0 + WINDOW_ROWS]]
+            sort_choices = ["선택 안함"] + ([cur] if cur in row_map and cur not in page_opts else []) + page_opts
 
         cs1, cs2 = st.columns([2, 1])
-        with cs1: s_opt = st.selectbox("📊 열 정렬 기준 품목", sort_opts)
+        with cs1:
+            if windowed: s_opt = st.selectbox("📊 열 정렬 기준 품목", list(dict.fromkeys(sort_choices)), key="sp_sort_win")
+            else: s_opt = st.selectbox("📊 열 정렬 기준 품목", sort_opts)
         with cs2: s_ord = st.radio("정렬 순서", ["낮은 가격순", "높은 가격순"], horizontal=True)
 
-        if s_opt != "선택 안함" and s_opt in row_map:
-            try:
-                t_idx = row_map[s_opt]
-                t_row = df_display.loc[t_idx]
-                if isinstance(t_row, pd.DataFrame): t_row = t_row.iloc[0]
-                is_rev = "높은" in s_ord
-                def s_key(c): v = t_row[c]; return float('inf') if pd.isna(v) or v==0 or v=="" else v
-                sorted_cols = sorted(df_display.columns, key=lambda c: -s_key(c) if is_rev and s_key(c)!=float('inf') else s_key(c))
-                if is_rev:
-                    cols_val = [c for c in df_display.columns if s_key(c) != float('inf')]
-                    cols_nan = [c for c in df_display.columns if s_key(c) == float('inf')]
-                    sorted_cols = sorted(cols_val, key=s_key, reverse=True) + cols_nan
-                else: sorted_cols = sorted(df_display.columns, key=s_key)
-                df_display = df_display[sorted_cols]
-                st.toast("정렬 완료")
-            except: pass
+        def build_table():
+            sorted_ok = False
+            df_view = df_display
+            if s_opt != "선택 안함" and s_opt in row_map:
+                try:
+                    df_view = sort_columns_by_row(df_display, row_map[s_opt], descending="높은" in s_ord)
+                    sorted_ok = True
+                except: pass
+            with prof.phase("업체 단가 통계"):
+                # 전체 업체 기준 통계(파일 버전별 캐시)를 표시 행·업체로 맞춤 — 규격이 합쳐진 단위당 단가 행은 빈칸
+                stats = sales_stats(ds.version, ds)
+                divisors = [unit_divisor(idx[0], idx[1]) for idx in df_view.index] if price_mode == "단위당 단가" else None
+                stats_cols = stat_columns(stats, df_view.index, divisors)
+                flags = outlier_flags(stats, df_view.index, df_view.columns)
+            with prof.phase("렌더링"):
+                return with_stats(with_item_info(df_view, note_col, pad=price_mode == "기본 단가"), stats_cols), flags, sorted_ok
+
+        # 정렬은 전체 표에서 (서버), 서식 적용은 보낼 부분에만
+        table_raw, flags, sorted_ok = RESULTS.get_or_compute(view_key + (s_opt, s_ord), build_table)
+        if sorted_ok: st.toast("정렬 완료")
+        with prof.phase("렌더링"):
+            fixed = ('단위', *STAT_COLUMNS)
+            if windowed: table = format_table(table_window(table_raw, row_page, col_page, fixed=fixed), table_window(flags, row_page, col_page, fixed=fixed))
+            else: table = RESULTS.get_or_compute(view_key + (s_opt, s_ord, "전체 표"), lambda: format_table(table_raw, flags))
 
         st.subheader("📋 업체별 현재 매출단가 비교")
+        st.caption(f"업체 수·최저·중앙값·최고·편차율((최고−최저)/중앙값)은 전체 매출업체 기준 · "
+                   f"▲/▼: 중앙값에서 크게 벗어난 단가 (robust z 절댓값 {OUTLIER_Z} 초과, 업체 {MIN_VENDORS}곳 이상 품목)")
         
-        final_df = df_display.reset_index()
-        def combine_info(x):
-            res = str(x['품목'])
-            extras = []
-            if '규격' in x and str(x['규격']).strip() and str(x['규격']) != 'nan': extras.append(str(x['규격']))
-            if note_col in x and str(x[note_col]).strip() and str(x[note_col]) != 'nan': extras.append(str(x[note_col]))
-            if extras:
-                res += f" ({' / '.join(extras)})"
+        with prof.phase("렌더링"):
+            cols_config = {c: st.column_config.TextColumn(c, width=90) for c in table.columns if c != '단위'}
+            for c in STAT_COLUMNS: cols_config[c] = st.column_config.TextColumn(c, width=60 if c in ('업체 수', '편차율') else 80)
             
-            if price_mode == "기본 단가":
-                res += "\xa0" * 30 
-            return res
-        
-        final_df['품목정보'] = final_df.apply(combine_info, axis=1)
-        drop_cols = [c for c in ['품목', '규격', note_col] if c in final_df.columns]
-        final_df = final_df.drop(columns=drop_cols).set_index('품목정보')
-        
-        cols_config = {c: st.column_config.TextColumn(c, width=90) for c in final_df.columns if c != '단위'}
-        
-        st.dataframe(
-            final_df.applymap(format_price_safe) if hasattr(final_df, 'applymap') else final_df.map(format_price_safe), 
-            use_container_width=True,
-            column_config=cols_config
-        )
+            st.dataframe(
+                table, 
+                use_container_width=True,
+                column_config=cols_config
+            )
+
+        # 엑셀: 필터·정렬이 반영된 전체 표 (페이지 보기여도 전체) — 버튼을 누를 때만 생성
+        def export_sales():
+            df = table_raw.reset_index()
+            price_cols = [c for c in df.columns if c not in ('품목정보', '단위', '업체 수', '편차율')]
+            df['품목정보'] = df['품목정보'].str.rstrip('\xa0')
+            df[price_cols] = df[price_cols].where(df[price_cols] != 0)  # 화면처럼 0 은 빈칸
+            return xlsx_bytes({'매출단가': df}, formats={'편차율': '0%'})
+        st.download_button("📥 엑셀 다운로드", data=export_sales, file_name=f"매출단가_{datetime.date.today():%Y%m%d}.xlsx",
+                           mime=XLSX_MIME, on_click="ignore", key="sp_export")
 except Exception as e: 
     st.error(f"오류: {e}")
+
+prof.finish()
@@ -1,33 +1,25 @@
 import streamlit as st
-import pandas as pd
-import re
-import os
+from core.profiler import start_profile
+from core.dataset import FILE_PATH, load_dataset
+from core.derived import quote_data, quote_search, quote_matrix
+from core.search import search_options
+from core.prewarm import start_prewarm
+from core.purchase import compare_two_vendors
+from core.basket import basket_prices, vendor_totals, split_plan, plan_table
+from core.sales import format_price_safe
 
 st.set_page_config(page_title="매입견적 비교", page_icon="📝", layout="wide")
+prof = start_profile("02_quote_comparison")
+start_prewarm()
 
 # -----------------------------------------------------------------------------
-# [데이터 강제 로드 로직] 세션에 데이터가 없으면 불러오기
+# [데이터 로드] 프로세스 공유 데이터 (세션별 사본 없음, 읽기 전용)
 # -----------------------------------------------------------------------------
-file_path = 'price_list.xlsx'
-if 'df_sales' not in st.session_state or 'df_purch' not in st.session_state:
-    if os.path.exists(file_path):
-        st.session_state['df_sales'] = pd.read_excel(file_path, sheet_name='Sales_매출단가')
-        st.session_state['df_purch'] = pd.read_excel(file_path, sheet_name='Purchase_매입단가')
-    else:
-        st.error(f"🚨 '{file_path}' 파일이 존재하지 않습니다.")
-        st.stop()
-
-# -----------------------------------------------------------------------------
-# [Helper] 유틸리티 함수
-# -----------------------------------------------------------------------------
-def natural_sort_key_simple(s):
-    text = str(s).strip()
-    match = re.search(r'(\d+(\.\d+)?)', text)
-    num_val = float(match.group(1)) if match else float('inf')
-    if 'KS' in text: k_rank = 0
-    elif '가공' in text: k_rank = 2
-    else: k_rank = 1
-    return (num_val, k_rank, text)
+with prof.phase("데이터 로드"):
+    ds = load_dataset()
+if ds is None:
+    st.error(f"🚨 '{FILE_PATH}' 파일이 존재하지 않습니다.")
+    st.stop()
 
 # -----------------------------------------------------------------------------
 # 메인 로직
@@ -38,24 +30,125 @@ st.markdown("원하는 품목을 **직접 선택**하여 견적서에 추가하
 if 'quote_list' not in st.session_state: 
     st.session_state.quote_list = []
 
+# -----------------------------------------------------------------------------
+# 견적 리스트 (프래그먼트: 삭제·보기 방식·최대 업체 수를 바꾸면 이 부분만 다시 실행)
+#   품목 추가·업체 선택은 바깥 위젯이므로 페이지 전체가 다시 실행됨
+# -----------------------------------------------------------------------------
+def remove_line(line_id):
+    st.session_state.quote_list = [x for x in st.session_state.quote_list if x['id'] != line_id]
+
+def clear_lines():
+    st.session_state.quote_list = []
+
+@st.fragment
+def quote_list_section(qd, vendor_a, vendor_b):
+    item_col, df_pivot = qd.item_col, qd.df_pivot
+    with prof.fragment("견적 리스트"):
+        try:
+            st.divider()
+            st.subheader(f"📋 견적 리스트 ({len(st.session_state.quote_list)}건)")
+            if st.session_state.quote_list:
+                with prof.phase("비교 계산"):
+                    df_merged = compare_two_vendors(st.session_state.quote_list, df_pivot, item_col, vendor_a, vendor_b)
+        
+                total_a = df_merged[f'{vendor_a} 합계'].sum()
+                total_b = df_merged[f'{vendor_b} 합계'].sum()
+                total_diff = total_a - total_b
+
+                view_mode = st.radio("화면 모드 선택", ["🖥️ PC (표)", "📱 모바일 (카드)"], horizontal=True, label_visibility="collapsed")
+                if view_mode == "🖥️ PC (표)":
+                    ratio = [0.5, 1.5, 1.2, 0.7, 1, 1, 1, 1.1, 1.1, 1.1]
+                    h = st.columns(ratio)
+                    h[0].markdown("**삭제**"); h[1].markdown("**품목**"); h[2].markdown("**규격**"); h[3].markdown("**수량**")
+                    h[4].markdown(f"**{vendor_a}<br>단가**", unsafe_allow_html=True)
+                    h[5].markdown(f"**{vendor_b}<br>단가**", unsafe_allow_html=True)
+                    h[6].markdown("**단가<br>차액**", unsafe_allow_html=True)
+                    h[7].markdown(f"**{vendor_a}<br>합계**", unsafe_allow_html=True)
+                    h[8].markdown(f"**{vendor_b}<br>합계**", unsafe_allow_html=True)
+                    h[9].markdown("**총 차액<br>(이득)**", unsafe_allow_html=True)
+                    st.markdown("---")
+                    for idx, row in df_merged.iterrows():
+                        c = st.columns(ratio)
+                        c[0].button("🗑️", key=f"del_{row['id']}", on_click=remove_line, args=(row['id'],))
+                        c[1].text(row[item_col]); c[2].text(row['통합규격']); c[3].text(f"{row['수량']:,}")
+                        c[4].text(f"{int(row[f'{vendor_a} 단가']):,}원"); c[5].text(f"{int(row[f'{vendor_b} 단가']):,}원")
+                        ud = row['단가 차액']
+                        c[6].markdown(f":red[+{int(ud):,}원]" if ud > 0 else f":blue[{int(ud):,}원]")
+                        c[7].text(f"{int(row[f'{vendor_a} 합계']):,}원"); c[8].text(f"{int(row[f'{vendor_b} 합계']):,}원")
+                        td = row['총 차액']
+                        c[9].markdown(f":blue[**+{int(td):,}원**]" if td > 0 else f":red[{int(td):,}원]")
+                else:
+                    for idx, row in df_merged.iterrows():
+                        with st.container(border=True):
+                            c1, c2 = st.columns([8,2])
+                            c1.markdown(f"**{row[item_col]}**"); 
+                            c2.button("🗑️", key=f"del_m_{row['id']}", on_click=remove_line, args=(row['id'],))
+                            st.text(f"규격: {row['통합규격']} | 수량: {row['수량']:,}개")
+                            st.markdown("---")
+                            c3, c4 = st.columns(2)
+                            with c3: st.markdown(f"**{vendor_a}**"); st.markdown(f"단가: {int(row[f'{vendor_a} 단가']):,}원 | 합계: {int(row[f'{vendor_a} 합계']):,}원")
+                            with c4: st.markdown(f"**{vendor_b}**"); st.markdown(f"단가: {int(row[f'{vendor_b} 단가']):,}원 | 합계: {int(row[f'{vendor_b} 합계']):,}원")
+        
+                st.markdown("---")
+                _, del_col = st.columns([5, 1])
+                del_col.button("🗑️ 리스트 전체 비우기", type="secondary", on_click=clear_lines)
+
+                with st.container():
+                    c1, c2 = st.columns(2)
+                    c1.metric(f"{vendor_a} 총 합계", f"{int(total_a):,}원")
+                    c2.metric(f"{vendor_b} 총 합계", f"{int(total_b):,}원")
+                    if total_diff > 0: st.success(f"### 🎉 최종 결론: [{vendor_b}]에서 구매 시 [{int(total_diff):,}원] 더 이득입니다!")
+                    else: st.error(f"### 🚨 최종 결론: [{vendor_b}]가 [{int(abs(total_diff)):,}원] 더 비쌉니다. [{vendor_a}] 추천!")
+
+                # -----------------------------------------------------------------------------
+                # 전체 업체 합계 순위 + 분할 구매 (장바구니 × 업체 단가 행렬)
+                # -----------------------------------------------------------------------------
+                st.divider()
+                st.subheader("🏆 전체 업체 합계 순위 · 분할 구매")
+                with prof.phase("전체 업체 계산"):
+                    qm = quote_matrix(ds.version, ds)
+                    prices, qty = basket_prices(qm, st.session_state.quote_list, item_col)
+                    ranking = vendor_totals(prices, qty, qm.vendors)
+
+                c1, c2 = st.columns([3, 1])
+                max_vendors = c2.number_input("최대 구매 업체 수 (0 = 제한 없음)", min_value=0, max_value=len(qm.vendors), value=0, step=1, key="max_vendors")
+                with prof.phase("분할 구매 계산"):
+                    assign = split_plan(prices, qty, max_vendors or None)
+                    df_plan = plan_table(st.session_state.quote_list, item_col, prices, qty, qm.vendors, assign)
+
+                with c1:
+                    st.markdown("**업체별 합계** (전 품목 취급 업체 우선, 미취급 품목은 합계에서 제외)")
+                    df_rank = ranking.assign(합계=ranking['합계'].apply(format_price_safe))
+                    st.dataframe(df_rank, hide_index=True, use_container_width=True, height=300)
+
+                st.markdown("**최저가 분할 구매 계획**" + (f" (최대 {max_vendors}곳)" if max_vendors else ""))
+                st.dataframe(df_plan.assign(단가=df_plan['단가'].apply(format_price_safe), 합계=df_plan['합계'].apply(format_price_safe)),
+                             hide_index=True, use_container_width=True)
+
+                split_total = df_plan['합계'].sum()
+                n_missing = int((assign < 0).sum())
+                full = ranking[ranking['미취급 품목'] == 0]
+                c1, c2, c3 = st.columns(3)
+                c1.metric("분할 구매 합계", f"{int(split_total):,}원", help=f"구매 업체 {df_plan.loc[assign >= 0, '구매 업체'].nunique()}곳")
+                if len(full):
+                    c2.metric(f"단일 업체 최저 ({full['업체'].iloc[0]})", f"{int(full['합계'].iloc[0]):,}원")
+                    c3.metric("분할 구매 절감액", f"{int(full['합계'].iloc[0] - split_total):,}원")
+                else:
+                    c2.metric("단일 업체 최저", "-", help="모든 품목을 취급하는 업체가 없습니다.")
+                if n_missing: st.warning(f"⚠️ {n_missing}개 품목은 선택한 업체 중 단가가 있는 곳이 없어 합계에서 제외되었습니다.")
+            else:
+                st.info("견적서가 비어있습니다.")
+        except Exception as e:
+            st.error(f"오류 발생: {e}")
+
 try:
-    df_raw = st.session_state['df_purch'].copy()
-    cols = df_raw.columns.tolist()
-    vendor_col = next((c for c in cols if '업체' in c or '거래처' in c), None)
-    item_col = next((c for c in cols if '품목' in c or '품명' in c), None)
-    price_col = next((c for c in cols if '단가' in c or '매입가' in c or '가격' in c), None)
-    spec_cols = [c for c in cols if '규격' in c]
+    # 피벗/품목·규격 목록은 미리 계산된 공유 캐시 사용 (서버 시작 시 prewarm)
+    with prof.phase("피벗"):
+        qd = quote_data(ds.version, ds)
+    vendor_col, item_col, price_col, df_pivot, vendors = qd.vendor_col, qd.item_col, qd.price_col, qd.df_pivot, qd.vendors
 
     if not (vendor_col and item_col and price_col): 
         st.error("필수 컬럼 없음"); st.stop()
-        
-    def combine_specs(row):
-        specs = [str(row[c]) for c in spec_cols if pd.notna(row[c]) and str(row[c]).strip() != '']
-        return ' '.join(specs) if specs else '-'
-        
-    df_raw['통합규격'] = df_raw.apply(combine_specs, axis=1)
-    df_pivot = df_raw.pivot_table(index=[item_col, '통합규격'], columns=vendor_col, values=price_col, aggfunc='first').reset_index()
-    vendors = [c for c in df_pivot.columns if c not in [item_col, '통합규격']]
 
     st.divider()
     c1, c2 = st.columns(2)
@@ -68,19 +161,11 @@ try:
     st.subheader("➕ 품목 추가하기")
     with st.container():
         col_input1, col_input2, col_input3, col_btn = st.columns([2, 2, 1, 1])
-        raw_items = df_pivot[item_col].unique().tolist()
-        priority_keywords = ['안전망', 'PP로프', '와이어로프', '와이어클립', '멀티망', '럿셀망', '케이블타이', 'PE로프']
-        sorted_items = []
-        used_items = set()
-        for kw in priority_keywords:
-            matches = sorted([x for x in raw_items if kw in str(x) and x not in used_items], key=natural_sort_key_simple)
-            sorted_items.extend(matches); used_items.update(matches)
-        others = sorted([x for x in raw_items if x not in used_items], key=natural_sort_key_simple)
-        final_item_list = sorted_items + others
-        
-        selected_item = col_input1.selectbox("품목 선택", final_item_list, key="sel_item")
-        available_specs = df_pivot[df_pivot[item_col] == selected_item]['통합규격'].unique().tolist()
-        available_specs = sorted(available_specs, key=natural_sort_key_simple)
+        # 검색창 입력으로 서버에서 걸러 상위 결과만 표시 (초성 검색 가능, 첫 결과가 선택됨)
+        q_item = col_input1.text_input("품목 검색", key="q_item", placeholder="🔎 품목 검색 (예: 안2, ㅇㅈㅁ)", label_visibility="collapsed")
+        item_opts = search_options(quote_search(ds.version, ds)['items'], q_item, qd.items)
+        selected_item = col_input1.selectbox("품목 선택", item_opts, key="sel_item")
+        available_specs = qd.specs.get(selected_item, [])
         selected_spec = col_input2.selectbox("규격 선택", available_specs, key="sel_spec")
         input_qty = col_input3.number_input("수량", min_value=1, value=1, step=1, key="in_qty")
 
@@ -91,72 +176,8 @@ try:
             else: st.session_state.quote_list.append(new_entry)
             st.toast(f"✅ '{selected_item}' 추가 완료!")
 
-    st.divider()
-    st.subheader(f"📋 견적 리스트 ({len(st.session_state.quote_list)}건)")
-    if st.session_state.quote_list:
-        df_quote = pd.DataFrame(st.session_state.quote_list)
-        df_merged = pd.merge(df_quote, df_pivot[[item_col, '통합규격', vendor_a, vendor_b]], on=[item_col, '통합규격'], how='left')
-        df_merged[f'{vendor_a} 단가'] = df_merged[vendor_a].fillna(0)
-        df_merged[f'{vendor_b} 단가'] = df_merged[vendor_b].fillna(0)
-        df_merged['단가 차액'] = df_merged[f'{vendor_b} 단가'] - df_merged[f'{vendor_a} 단가']
-        df_merged[f'{vendor_a} 합계'] = df_merged[f'{vendor_a} 단가'] * df_merged['수량']
-        df_merged[f'{vendor_b} 합계'] = df_merged[f'{vendor_b} 단가'] * df_merged['수량']
-        df_merged['총 차액'] = df_merged[f'{vendor_a} 합계'] - df_merged[f'{vendor_b} 합계']
-        
-        total_a = df_merged[f'{vendor_a} 합계'].sum()
-        total_b = df_merged[f'{vendor_b} 합계'].sum()
-        total_diff = total_a - total_b
-
-        view_mode = st.radio("화면 모드 선택", ["🖥️ PC (표)", "📱 모바일 (카드)"], horizontal=True, label_visibility="collapsed")
-        if view_mode == "🖥️ PC (표)":
-            ratio = [0.5, 1.5, 1.2, 0.7, 1, 1, 1, 1.1, 1.1, 1.1]
-            h = st.columns(ratio)
-            h[0].markdown("**삭제**"); h[1].markdown("**품목**"); h[2].markdown("**규격**"); h[3].markdown("**수량**")
-            h[4].markdown(f"**{vendor_a}<br>단가**", unsafe_allow_html=True)
-            h[5].markdown(f"**{vendor_b}<br>단가**", unsafe_allow_html=True)
-            h[6].markdown("**단가<br>차액**", unsafe_allow_html=True)
-            h[7].markdown(f"**{vendor_a}<br>합계**", unsafe_allow_html=True)
-            h[8].markdown(f"**{vendor_b}<br>합계**", unsafe_allow_html=True)
-            h[9].markdown("**총 차액<br>(이득)**", unsafe_allow_html=True)
-            st.markdown("---")
-            for idx, row in df_merged.iterrows():
-                c = st.columns(ratio)
-                if c[0].button("🗑️", key=f"del_{row['id']}"):
-                    st.session_state.quote_list = [x for x in st.session_state.quote_list if x['id'] != row['id']]
-                    st.rerun()
-                c[1].text(row[item_col]); c[2].text(row['통합규격']); c[3].text(f"{row['수량']:,}")
-                c[4].text(f"{int(row[f'{vendor_a} 단가']):,}원"); c[5].text(f"{int(row[f'{vendor_b} 단가']):,}원")
-                ud = row['단가 차액']
-                c[6].markdown(f":red[+{int(ud):,}원]" if ud > 0 else f":blue[{int(ud):,}원]")
-                c[7].text(f"{int(row[f'{vendor_a} 합계']):,}원"); c[8].text(f"{int(row[f'{vendor_b} 합계']):,}원")
-                td = row['총 차액']
-                c[9].markdown(f":blue[**+{int(td):,}원**]" if td > 0 else f":red[{int(td):,}원]")
-        else:
-            for idx, row in df_merged.iterrows():
-                with st.container(border=True):
-                    c1, c2 = st.columns([8,2])
-                    c1.markdown(f"**{row[item_col]}**"); 
-                    if c2.button("🗑️", key=f"del_m_{row['id']}"):
-                        st.session_state.quote_list = [x for x in st.session_state.quote_list if x['id'] != row['id']]
-                        st.rerun()
-                    st.text(f"규격: {row['통합규격']} | 수량: {row['수량']:,}개")
-                    st.markdown("---")
-                    c3, c4 = st.columns(2)
-                    with c3: st.markdown(f"**{vendor_a}**"); st.markdown(f"단가: {int(row[f'{vendor_a} 단가']):,}원 | 합계: {int(row[f'{vendor_a} 합계']):,}원")
-                    with c4: st.markdown(f"**{vendor_b}**"); st.markdown(f"단가: {int(row[f'{vendor_b} 단가']):,}원 | 합계: {int(row[f'{vendor_b} 합계']):,}원")
-        
-        st.markdown("---")
-        _, del_col = st.columns([5, 1])
-        if del_col.button("🗑️ 리스트 전체 비우기", type="secondary"):
-            st.session_state.quote_list = []; st.rerun()
-
-        with st.container():
-            c1, c2 = st.columns(2)
-            c1.metric(f"{vendor_a} 총 합계", f"{int(total_a):,}원")
-            c2.metric(f"{vendor_b} 총 합계", f"{int(total_b):,}원")
-            if total_diff > 0: st.success(f"### 🎉 최종 결론: [{vendor_b}]에서 구매 시 [{int(total_diff):,}원] 더 이득입니다!")
-            else: st.error(f"### 🚨 최종 결론: [{vendor_b}]가 [{int(abs(total_diff)):,}원] 더 비쌉니다. [{vendor_a}] 추천!")
-    else:
-        st.info("견적서가 비어있습니다.")
+    quote_list_section(qd, vendor_a, vendor_b)
 except Exception as e:
     st.error(f"오류 발생: {e}")
+
+prof.finish()
@@ -1,11 +1,19 @@
 import streamlit as st
 import pandas as pd
-import re
 import datetime
 import os
 import base64
+from core.profiler import start_profile
+from core.fragment import in_fragment_rerun, rerun_fragment
+from core.export import XLSX_MIME, xlsx_bytes
+from core.dataset import load_dataset
+from core.derived import customer_prices
+from core.prewarm import start_prewarm
+from core.quotation import quote_multiplier, quote_key, prefill_quote, customer_quote
 
 st.set_page_config(page_title="견적서 작성", page_icon="📄", layout="wide")
+prof = start_profile("04_quotation_generator")
+start_prewarm()
 
 # 1. 기본 단가 리스트 (하드코딩)
 DEFAULT_PRICES = [
@@ -44,10 +52,31 @@ def load_initial_data():
 def apply_discount():
     rate = st.session_state.quote_discount
     df = st.session_state.quote_df
-    for idx in df.index:
-        base_p = df.loc[idx, '기본단가']
-        if pd.notna(base_p):
-            df.loc[idx, '단가(원)'] = int(float(base_p) * (1 + rate / 100))
+    base = df['기본단가'].astype(float)
+    # 거래처 단가 불러오기(_quote_price)와 같이 소수 둘째 자리 반올림 (단위당 단가는 소수가 될 수 있음)
+    df['단가(원)'] = df['단가(원)'].astype(float).where(base.isna(), (base * (1 + rate / 100)).round(2))
+    st.session_state.quote_rev += 1
+
+# 기본 단가 목록 조회용 (정규화 키 → 단가) — 거래처 단가가 없는 행의 대체값
+DEFAULT_LOOKUP = {quote_key(r['품명'], r['규격']): r['단가(원)'] for r in DEFAULT_PRICES}
+QUOTE_SCOPES = ["현재 견적 품목", "거래처 단가 품목"]
+
+def load_customer_prices(prices_by_customer, new_customer=False):
+    # 거래처 선택/적용 시: 현재 견적 품목 단가를 거래처 단가로 (없으면 기본 단가), 또는 거래처 단가표로 견적 품목 구성
+    if new_customer: st.session_state.quote_items = []  # 품목 선택지는 거래처별
+    customer = st.session_state.get('quote_customer')
+    if customer not in prices_by_customer: return
+    prices = prices_by_customer[customer]
+    if st.session_state.quote_scope == QUOTE_SCOPES[0]:
+        df, found = prefill_quote(st.session_state.quote_df, prices, DEFAULT_LOOKUP)
+        st.toast(f"✅ {customer} 단가 {found}건 적용 (나머지 {len(df) - found}건은 기본 단가)")
+    else:
+        df = customer_quote(prices, st.session_state.get('quote_items'))
+        st.toast(f"✅ {customer} 단가 품목 {len(df)}건 불러옴")
+    st.session_state.quote_df = df
+    st.session_state.quote_discount = 0  # 불러온 단가가 새 기본단가
+    st.session_state.quote_rev += 1
+    if not st.session_state.get('quote_recipient'): st.session_state.quote_recipient = customer
 
 # 메인 UI
 st.title("📄 견적서 작성 및 출력")
@@ -62,7 +91,7 @@ with st.expander("수신처 및 공급자 정보 입력 (클릭해서 열기)",
         st.markdown("**[수신처 정보]**")
         q_date = st.date_input("견적일", datetime.date.today())
         q_name = st.text_input("견적명", "안전망, 로프 (단가견적)")
-        q_recipient = st.text_input("수신처 (회사명)", value="", placeholder="예: 주식회사 경원안전")
+        q_recipient = st.text_input("수신처 (회사명)", value="", placeholder="예: 주식회사 경원안전", key="quote_recipient")
         q_ref = st.text_input("참조", value="", placeholder="예: 한송이 차장")
         q_phone = st.text_input("수신처 전화/팩스", value="", placeholder="예: 전화 041-553-1021 / 팩스 041-553-1022")
     
@@ -77,96 +106,129 @@ with st.expander("수신처 및 공급자 정보 입력 (클릭해서 열기)",
 st.divider()
 
 # ---------------------------------------------------------
-# 품목 및 단가 조정
+# 품목 및 단가 조정 (프래그먼트: 수량/단가 편집·일괄 조정·행 삽입 시 편집기와 합계만 다시 실행)
+#   아래 미리보기는 페이지 전체 실행 때 갱신 (편집 후 [미리보기 갱신] 또는 다른 입력 변경 시)
 # ---------------------------------------------------------
 st.subheader("2. 품목 및 단가 입력")
 
 # 초기 세팅
 if 'quote_df' not in st.session_state: st.session_state.quote_df = load_initial_data()
 if 'quote_discount' not in st.session_state: st.session_state.quote_discount = 0
+if 'quote_rev' not in st.session_state: st.session_state.quote_rev = 0  # 견적표 변경 횟수 (미리보기 최신 여부 확인용)
+if 'quote_scope' not in st.session_state: st.session_state.quote_scope = QUOTE_SCOPES[0]
 
-# 단가 일괄 조정 너비 축소 (오류 해결 위해 value 제거)
-col_adj1, col_adj2 = st.columns([1.5, 8.5])
-with col_adj1:
-    st.number_input("단가 일괄 조정 (%)", min_value=-100, max_value=100, step=5, key="quote_discount", on_change=apply_discount)
-
-# --- 중간 행 삽입 기능 추가 ---
-col_ins1, col_ins2, col_ins3 = st.columns([1.5, 2, 6])
-with col_ins1:
-    ins_idx = st.number_input("추가할 행 번호", min_value=1, max_value=len(st.session_state.quote_df)+1, value=1, step=1)
-with col_ins2:
-    st.markdown("<div style='margin-top: 28px;'></div>", unsafe_allow_html=True)
-    if st.button("➕ 해당 번호에 행 삽입"):
-        df = st.session_state.quote_df
-        idx = int(ins_idx) - 1
-        new_row = pd.DataFrame([{"번호": 0, "품명": "", "규격": "", "단위": "", "수량": None, "단가(원)": None, "금액(원)": None, "비고": "", "기본단가": None}])
-        st.session_state.quote_df = pd.concat([df.iloc[:idx], new_row, df.iloc[idx:]]).reset_index(drop=True)
-        st.session_state.quote_df['번호'] = range(1, len(st.session_state.quote_df) + 1)
-        st.rerun()
-
-st.caption("💡 **수량**을 입력하면 금액이 자동 계산됩니다. 빈 행을 클릭해 품목을 추가할 수 있습니다.")
-
-edited_df = st.data_editor(
-    st.session_state.quote_df,
-    num_rows="dynamic",
-    use_container_width=True,
-    hide_index=True,
-    column_order=["번호", "품명", "규격", "단위", "수량", "단가(원)", "금액(원)", "비고"],
-    column_config={
-        "번호": st.column_config.NumberColumn("번호", disabled=True, width="small"),
-        "금액(원)": st.column_config.NumberColumn("금액(원)", disabled=True, format="%d"),
-        "기본단가": None # 숨김
-    }
-)
-
-# 실시간 금액 계산 로직
-changed = False
-for idx in edited_df.index:
-    qty = edited_df.loc[idx, '수량']
-    price = edited_df.loc[idx, '단가(원)']
-    item = str(edited_df.loc[idx, '품명'])
-    spec = str(edited_df.loc[idx, '규격'])
-    
-    multiplier = 1.0
-    if '럿셀망' in item:
-        multiplier = 1.0
-    elif any(x in item for x in ['안전망', '멀티망']):
-        nums = [float(x) for x in re.findall(r'(\d+(?:\.\d+)?)', spec)]
-        if len(nums) >= 2: multiplier = nums[0] * nums[1]
-        elif len(nums) == 1 and re.search(r'[xX*]', spec): multiplier = nums[0]
-    elif any(x in item for x in ['와이어로프', '와이어클립']):
-        nums = [float(x) for x in re.findall(r'(\d+(?:\.\d+)?)', spec)]
-        if nums and re.search(r'[mM미터]', spec): multiplier = nums[-1]
-    
-    try:
-        if pd.notna(qty) and str(qty).strip() != "" and float(qty) > 0 and pd.notna(price):
-            amt = float(qty) * float(price) * multiplier
-            new_amt = int(amt)
-            if edited_df.loc[idx, '금액(원)'] != new_amt:
-                edited_df.loc[idx, '금액(원)'] = new_amt
-                changed = True
-        else:
-            if pd.notna(edited_df.loc[idx, '금액(원)']):
-                edited_df.loc[idx, '금액(원)'] = None
-                changed = True
-    except: pass
-
-# 기본단가 동기화
-for idx in edited_df.index:
-    try:
-        if idx in st.session_state.quote_df.index:
-            if st.session_state.quote_df.loc[idx, '단가(원)'] != edited_df.loc[idx, '단가(원)']:
-                edited_df.loc[idx, '기본단가'] = edited_df.loc[idx, '단가(원)']
-                changed = True
-    except: pass
-
-if changed or not edited_df.equals(st.session_state.quote_df):
-    edited_df['번호'] = range(1, len(edited_df) + 1) # 행 추가/삭제 시 번호 자동 재정렬
-    st.session_state.quote_df = edited_df.copy()
-    st.rerun()
+# 거래처 매출단가 불러오기: Sales_매출단가 거래처별 단가 색인 (파일 버전별 공유 캐시, 서버 시작 시 prewarm)
+with prof.phase("거래처 단가 색인"):
+    ds = load_dataset()
+    prices_by_customer = customer_prices(ds.version, ds) if ds is not None else {}
+if prices_by_customer:
+    with st.expander("🏢 거래처 매출단가 불러오기 (Sales_매출단가)", expanded=False):
+        c_cu1, c_cu2, c_cu3, c_cu4 = st.columns([2, 2, 3, 1.2])
+        customer = c_cu1.selectbox("거래처 (매출업체)", list(prices_by_customer), index=None, key="quote_customer", placeholder="거래처를 선택하세요...",
+                                   on_change=load_customer_prices, args=(prices_by_customer, True))
+        scope = c_cu2.radio("불러올 품목", QUOTE_SCOPES, key="quote_scope",
+                            help="현재 견적 품목: 표의 각 행 단가를 거래처 단가로 (없는 품목은 기본 단가) · 거래처 단가 품목: 거래처 단가표로 견적 품목을 새로 구성")
+        item_opts = prices_by_customer[customer].table['품목'].unique().tolist() if customer else []
+        c_cu3.multiselect("품목 (비우면 전체)", item_opts, key="quote_items", disabled=scope != QUOTE_SCOPES[1] or not customer)
+        c_cu4.markdown("<div style='margin-top: 28px;'></div>", unsafe_allow_html=True)
+        c_cu4.button("📥 적용", use_container_width=True, disabled=not customer, on_click=load_customer_prices, args=(prices_by_customer,))
+
+@st.fragment
+def quote_editor():
+    with prof.fragment("견적표 편집"):
+        # 단가 일괄 조정 너비 축소 (오류 해결 위해 value 제거)
+        col_adj1, col_adj2 = st.columns([1.5, 8.5])
+        with col_adj1:
+            st.number_input("단가 일괄 조정 (%)", min_value=-100, max_value=100, step=5, key="quote_discount", on_change=apply_discount)
+
+        # --- 중간 행 삽입 기능 추가 ---
+        col_ins1, col_ins2, col_ins3 = st.columns([1.5, 2, 6])
+        with col_ins1:
+            ins_idx = st.number_input("추가할 행 번호", min_value=1, max_value=len(st.session_state.quote_df)+1, value=1, step=1)
+        with col_ins2:
+            st.markdown("<div style='margin-top: 28px;'></div>", unsafe_allow_html=True)
+            if st.button("➕ 해당 번호에 행 삽입"):
+                df = st.session_state.quote_df
+                idx = int(ins_idx) - 1
+                new_row = pd.DataFrame([{"번호": 0, "품명": "", "규격": "", "단위": "", "수량": None, "단가(원)": None, "금액(원)": None, "비고": "", "기본단가": None}])
+                st.session_state.quote_df = pd.concat([df.iloc[:idx], new_row, df.iloc[idx:]]).reset_index(drop=True)
+                st.session_state.quote_df['번호'] = range(1, len(st.session_state.quote_df) + 1)
+                st.session_state.quote_rev += 1
+                rerun_fragment()
+
+        st.caption("💡 **수량**을 입력하면 금액이 자동 계산됩니다. 빈 행을 클릭해 품목을 추가할 수 있습니다.")
+
+        edited_df = st.data_editor(
+            st.session_state.quote_df,
+            num_rows="dynamic",
+            use_container_width=True,
+            hide_index=True,
+            column_order=["번호", "품명", "규격", "단위", "수량", "단가(원)", "금액(원)", "비고"],
+            column_config={
+                "번호": st.column_config.NumberColumn("번호", disabled=True, width="small"),
+                "금액(원)": st.column_config.NumberColumn("금액(원)", disabled=True, format="%d"),
+                "기본단가": None # 숨김
+            }
+        )
 
+        # 실시간 금액 계산 로직
+        with prof.phase("금액 계산"):
+            changed = False
+            for idx in edited_df.index:
+                qty = edited_df.loc[idx, '수량']
+                price = edited_df.loc[idx, '단가(원)']
+                multiplier = quote_multiplier(edited_df.loc[idx, '품명'], edited_df.loc[idx, '규격'])
+
+                try:
+                    if pd.notna(qty) and str(qty).strip() != "" and float(qty) > 0 and pd.notna(price):
+                        amt = float(qty) * float(price) * multiplier
+                        new_amt = int(amt)
+                        if edited_df.loc[idx, '금액(원)'] != new_amt:
+                            edited_df.loc[idx, '금액(원)'] = new_amt
+                            changed = True
+                    else:
+                        if pd.notna(edited_df.loc[idx, '금액(원)']):
+                            edited_df.loc[idx, '금액(원)'] = None
+                            changed = True
+                except: pass
+
+            # 기본단가 동기화
+            for idx in edited_df.index:
+                try:
+                    if idx in st.session_state.quote_df.index:
+                        if st.session_state.quote_df.loc[idx, '단가(원)'] != edited_df.loc[idx, '단가(원)']:
+                            edited_df.loc[idx, '기본단가'] = edited_df.loc[idx, '단가(원)']
+                            changed = True
+                except: pass
+
+        if changed or not edited_df.equals(st.session_state.quote_df):
+            edited_df['번호'] = range(1, len(edited_df) + 1) # 행 추가/삭제 시 번호 자동 재정렬
+            st.session_state.quote_df = edited_df.copy()
+            st.session_state.quote_rev += 1
+            rerun_fragment()
+
+        total_sum = edited_df['금액(원)'].dropna().sum()
+        st.markdown(f"<h4 style='text-align: right; color:#d32f2f;'>계산된 합계금액 : {int(total_sum):,} 원</h4>", unsafe_allow_html=True)
+
+        # 엑셀 견적서: 품목표(합계 행 포함) + 견적 정보 시트 — 버튼을 누를 때만 생성 (프래그먼트 안이라 편집한 견적표 그대로)
+        def export_quote():
+            cols = ["번호", "품명", "규격", "단위", "수량", "단가(원)", "금액(원)", "비고"]
+            df = edited_df.dropna(subset=['품명'])[cols]
+            df = pd.concat([df, pd.DataFrame([{"품명": "합계", "금액(원)": total_sum}])], ignore_index=True)
+            info = pd.DataFrame({'항목': ["견적일", "견적명", "수신처", "참조", "수신처 전화/팩스", "공급자", "주소", "사업자등록번호", "연락처", "이메일"],
+                                 '내용': [q_date.isoformat(), q_name, q_recipient, q_ref, q_phone, s_company, s_address.replace("\n", " "), s_biznum, s_contact, s_email]})
+            return xlsx_bytes({'견적서': df, '견적 정보': info}, formats={'수량': '#,##0.##'})
+        st.download_button("📥 엑셀 다운로드", data=export_quote, file_name=f"{q_name}_견적서.xlsx", mime=XLSX_MIME, on_click="ignore", key="quote_export")
+
+        if in_fragment_rerun() and st.session_state.get('quote_preview_rev') != st.session_state.quote_rev:
+            c_msg, c_btn = st.columns([8, 2])
+            c_msg.warning("편집한 내용이 아래 미리보기에 아직 반영되지 않았습니다.")
+            if c_btn.button("🔄 미리보기 갱신", use_container_width=True): st.rerun()
+
+quote_editor()
+edited_df = st.session_state.quote_df
 total_sum = edited_df['금액(원)'].dropna().sum()
-st.markdown(f"<h4 style='text-align: right; color:#d32f2f;'>계산된 합계금액 : {int(total_sum):,} 원</h4>", unsafe_allow_html=True)
+st.session_state.quote_preview_rev = st.session_state.quote_rev
 
 st.divider()
 
@@ -177,30 +239,31 @@ st.subheader("3. 견적서 출력 (미리보기)")
 st.info("💡 아래 [📥 PDF 다운로드] 버튼을 누르면 PC와 모바일 모두에서 파일로 즉시 저장됩니다.")
 
 # HTML 테이블 생성
-tbody_html = ""
-valid_rows = edited_df.dropna(subset=['품명']) # 품명이 있는 행만 출력
-for i, row in valid_rows.iterrows():
-    r_no = row.get('번호', '') if pd.notna(row.get('번호')) else ''
-    r_item = row.get('품명', '') if pd.notna(row.get('품명')) else ''
-    r_spec = row.get('규격', '') if pd.notna(row.get('규격')) else ''
-    r_unit = row.get('단위', '') if pd.notna(row.get('단위')) else ''
-    r_qty = f"{float(row['수량']):g}" if pd.notna(row.get('수량')) and str(row.get('수량')).strip() else ""
-    r_price = f"{int(row['단가(원)']):,}" if pd.notna(row.get('단가(원)')) else ""
-    r_amt = f"{int(row['금액(원)']):,}" if pd.notna(row.get('금액(원)')) else ""
-    r_note = row.get('비고', '') if pd.notna(row.get('비고')) else ''
+with prof.phase("렌더링"):
+    tbody_html = ""
+    valid_rows = edited_df.dropna(subset=['품명']) # 품명이 있는 행만 출력
+    for i, row in valid_rows.iterrows():
+        r_no = row.get('번호', '') if pd.notna(row.get('번호')) else ''
+        r_item = row.get('품명', '') if pd.notna(row.get('품명')) else ''
+        r_spec = row.get('규격', '') if pd.notna(row.get('규격')) else ''
+        r_unit = row.get('단위', '') if pd.notna(row.get('단위')) else ''
+        r_qty = f"{float(row['수량']):g}" if pd.notna(row.get('수량')) and str(row.get('수량')).strip() else ""
+        r_price = f"{float(row['단가(원)']):,.10g}" if pd.notna(row.get('단가(원)')) else ""  # 단위당 단가(예: 안전망 m2 당)는 소수 유지
+        r_amt = f"{int(row['금액(원)']):,}" if pd.notna(row.get('금액(원)')) else ""
+        r_note = row.get('비고', '') if pd.notna(row.get('비고')) else ''
     
-    tbody_html += f"""
-    <tr>
-        <td style='text-align:center; padding:3px 4px; border:1px solid #000;'>{r_no}</td>
-        <td style='padding:3px 4px; border:1px solid #000;'>{r_item}</td>
-        <td style='padding:3px 4px; border:1px solid #000;'>{r_spec}</td>
-        <td style='text-align:center; padding:3px 4px; border:1px solid #000;'>{r_unit}</td>
-        <td style='text-align:center; padding:3px 4px; border:1px solid #000;'>{r_qty}</td>
-        <td style='text-align:right; padding:3px 4px; border:1px solid #000;'>{r_price}</td>
-        <td style='text-align:right; padding:3px 4px; border:1px solid #000;'>{r_amt}</td>
-        <td style='padding:3px 4px; border:1px solid #000;'>{r_note}</td>
-    </tr>
-    """
+        tbody_html += f"""
+        <tr>
+            <td style='text-align:center; padding:3px 4px; border:1px solid #000;'>{r_no}</td>
+            <td style='padding:3px 4px; border:1px solid #000;'>{r_item}</td>
+            <td style='padding:3px 4px; border:1px solid #000;'>{r_spec}</td>
+            <td style='text-align:center; padding:3px 4px; border:1px solid #000;'>{r_unit}</td>
+            <td style='text-align:center; padding:3px 4px; border:1px solid #000;'>{r_qty}</td>
+            <td style='text-align:right; padding:3px 4px; border:1px solid #000;'>{r_price}</td>
+            <td style='text-align:right; padding:3px 4px; border:1px solid #000;'>{r_amt}</td>
+            <td style='padding:3px 4px; border:1px solid #000;'>{r_note}</td>
+        </tr>
+        """
 
 addr_html = s_address.replace("\n", " ")
 contact_html = s_contact.replace(" / ", "<br>")
@@ -316,4 +379,7 @@ html_template = f"""
 </script>
 """
 
-st.components.v1.html(html_template, height=1100, scrolling=True)
+with prof.phase("렌더링"):
+    st.components.v1.html(html_template, height=1100, scrolling=True)
+
+prof.finish()
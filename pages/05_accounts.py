@@ -1,110 +1,14 @@
 import streamlit as st
 import pandas as pd
-import re
 import os
 import datetime
+from core.excel_header import detect_header
+from core.accounts import aging_report, plain_report
+from core.export import XLSX_MIME, xlsx_bytes
+from core.profiler import start_profile
 
 st.set_page_config(page_title="미수금/미지급금 관리", page_icon="💰", layout="wide")
-
-# -----------------------------------------------------------------------------
-# [로직] 데이터 처리 및 연체 계산 함수
-# -----------------------------------------------------------------------------
-def process_data(df_raw, ref_date, mode="매출업체"):
-    try:
-        header_idx = df_raw[df_raw.apply(lambda r: r.astype(str).str.contains('업체구분').any(), axis=1)].index
-        if len(header_idx) > 0:
-            idx = header_idx[0]
-            df = df_raw.iloc[idx+1:].copy()
-            df.columns = df_raw.iloc[idx].astype(str).str.strip()
-        else:
-            df = df_raw.copy()
-            
-        df.columns = ['업체구분', '업체', '결제금액'] + list(df.columns[3:])
-        
-        # 새 양식 대응: 1열이 비어있어도 요약행 기준으로 매입/매출 자동 분류
-        current_cat = "매입업체"
-        for i in df.index:
-            row_val = str(df.loc[i, '업체구분']) + str(df.loc[i, '업체'])
-            if '매출' in row_val and '요약' not in row_val: current_cat = "매출업체"
-            elif '매입' in row_val and '요약' not in row_val: current_cat = "매입업체"
-            
-            df.loc[i, '업체구분'] = current_cat
-            
-            if '매입' in row_val and '요약' in row_val: 
-                current_cat = "매출업체"
-        
-        df_target = df[df['업체구분'] == mode].copy()
-        df_target = df_target.dropna(subset=['업체'])
-        df_target = df_target[~df_target['업체'].astype(str).str.contains('요약')]
-        
-        df_target['결제금액'] = df_target['결제금액'].astype(str).str.replace(',', '').str.replace('₩', '').str.strip()
-        df_target['금액_백만'] = pd.to_numeric(df_target['결제금액'], errors='coerce') / 1_000_000
-        df_target = df_target.dropna(subset=['금액_백만'])
-
-        def extract_info(val):
-            val_str = str(val).strip()
-            match = re.search(r'^(.*?)(\d{4})$', val_str)
-            if match: return match.group(1).strip(), match.group(2)
-            return val_str, None
-            
-        df_target[['거래처명', 'YYMM']] = df_target['업체'].apply(lambda x: pd.Series(extract_info(x)))
-        
-        # 비고 컬럼 처리
-        if '비고' not in df_target.columns:
-            df_target['비고'] = ''
-        df_target['비고'] = df_target['비고'].fillna('').astype(str)
-        
-        def calc_delay(yymm):
-            if not yymm: return 0
-            y = 2000 + int(yymm[:2])
-            m = int(yymm[2:])
-            # 당월을 1개월 차로 계산하기 위해 + 1 추가
-            delay = (ref_date.year - y) * 12 + (ref_date.month - m) + 1
-            return delay if delay >= 0 else 0
-            
-        df_target['연체개월'] = df_target['YYMM'].apply(calc_delay)
-        
-        result = []
-        for name, group in df_target.groupby('거래처명'):
-            total_amt = group['금액_백만'].sum()
-            if total_amt <= 0: continue
-            
-            max_delay = group['연체개월'].max()
-            note_parts = []
-            for d in sorted(group['연체개월'].unique(), reverse=True):
-                amt = group[group['연체개월'] == d]['금액_백만'].sum()
-                if amt > 0:
-                    # 해당 연체개월의 YYMM 값 가져오기
-                    yymm_val = group[group['연체개월'] == d]['YYMM'].iloc[0]
-                    yymm_str = f"({yymm_val[:2]}.{int(yymm_val[2:])}月)" if yymm_val and len(str(yymm_val)) == 4 else ""
-                    
-                    label = f"{int(d)}개월{yymm_str}"
-                    note_parts.append(f"{label}: <span style='color: red; font-weight: bold;'>{amt:.1f}</span>")
-                    
-            # 비고 내용 추출
-            bigo_parts = []
-            for _, row in group.iterrows():
-                b_val = str(row['비고']).strip()
-                if b_val and b_val.lower() != 'nan':
-                    # '400추가' -> '400만원추가' 로 변환 (이미 '만'이 있으면 건너뜀)
-                    b_val = re.sub(r'(\d+)(추가)', r'\1만원\2', b_val)
-                    
-                    yymm_val = row['YYMM']
-                    yymm_str = f"({yymm_val[:2]}.{int(yymm_val[2:])}月)" if yymm_val and len(str(yymm_val)) == 4 else ""
-                    bigo_parts.append(f"{yymm_str} {b_val}".strip())
-                    
-            result.append({
-                '거래처명': name,
-                '총액': round(total_amt, 1),
-                '최대 경과': f"{int(max_delay)}개월" if max_delay > 0 else "1개월",
-                '상세 비고': " / ".join(note_parts),
-                '비고': " / ".join(bigo_parts),
-                '_sort': total_amt
-            })
-            
-        return pd.DataFrame(result).sort_values('_sort', ascending=False).drop(columns=['_sort']) if result else pd.DataFrame()
-    except: 
-        return pd.DataFrame()
+prof = start_profile("05_accounts")
 
 # -----------------------------------------------------------------------------
 # [UI] 화면 구성
@@ -120,7 +24,9 @@ tab1, tab2 = st.tabs(["🔴 미수금 (매출업체)", "🔵 미지급금 (매
 # 폴더의 accounts.xlsx 파일만 자동 로드 (업로드 위젯 삭제)
 df_raw = None
 if os.path.exists('accounts.xlsx'): 
-    df_raw = pd.read_excel('accounts.xlsx', header=None)
+    with prof.phase("데이터 로드"):
+        df_raw = pd.read_excel('accounts.xlsx', header=None)
+        layout = detect_header('accounts.xlsx', 0, marker='업체구분')
 
 def show_table(data, title, date_str):
     if data.empty:
@@ -148,10 +54,20 @@ def show_table(data, title, date_str):
 if df_raw is not None:
     date_label = f"({ref_date.month}월 {ref_date.day}일 기준, 단위:백만 원)"
     with tab1:
-        res = process_data(df_raw, ref_date, "매출업체")
-        show_table(res, "총 미수금", date_label)
+        with prof.phase("연체 집계"):
+            res_ar = aging_report(df_raw, ref_date, "매출업체", layout)
+        with prof.phase("렌더링"):
+            show_table(res_ar, "총 미수금", date_label)
     with tab2:
-        res = process_data(df_raw, ref_date, "매입업체")
-        show_table(res, "총 미지급금", date_label)
+        with prof.phase("연체 집계"):
+            res_ap = aging_report(df_raw, ref_date, "매입업체", layout)
+        with prof.phase("렌더링"):
+            show_table(res_ap, "총 미지급금", date_label)
+
+    # 엑셀: 미수금/미지급금 두 시트 (금액 단위: 백만 원) — 버튼을 누를 때만 생성
+    st.download_button("📥 엑셀 다운로드", data=lambda: xlsx_bytes({'미수금': plain_report(res_ar), '미지급금': plain_report(res_ap)}, formats={'총액': '#,##0.0'}),
+                       file_name=f"미수금_미지급금_{ref_date:%Y%m%d}.xlsx", mime=XLSX_MIME, on_click="ignore", key="acc_export")
 else:
     st.error("🚨 폴더에 'accounts.xlsx' 파일이 없습니다. 파일을 업로드해주세요.")
+
+prof.finish()
@@ -1,7 +1,10 @@
 import streamlit as st
 import pandas as pd
+from core.profiler import start_profile
+from core.fragment import rerun_fragment
 
 st.set_page_config(page_title="원가분석", page_icon="📊", layout="wide")
+prof = start_profile("06_cost_analysis")
 
 st.title("📊 로프가공 원가분석 (안전망 2cm)")
 st.markdown("매입업체의 해배(m²)당 산출 방식에 맞춰 숨은 **인건비**를 자동으로 역산합니다.")
@@ -182,35 +185,42 @@ st.divider()
 
 # -----------------------------------------------------------------------------
 # 3. 누적 결과 표 (계속 추가되는 곳)
+#   프래그먼트: 삭제 체크·전체 삭제 시 이 표만 다시 실행 (저장 버튼은 위 계산부라 페이지 전체 실행)
 # -----------------------------------------------------------------------------
-st.subheader("📋 원가 비교 누적표")
-if st.session_state['cost_history']:
-    df_history = pd.DataFrame(st.session_state['cost_history'])
+def clear_history():
+    st.session_state['cost_history'] = []
+
+@st.fragment
+def history_table():
+    st.subheader("📋 원가 비교 누적표")
+    with prof.fragment("누적표"):
+        if st.session_state['cost_history']:
+            df_history = pd.DataFrame(st.session_state['cost_history'])
     
-    if '삭제' not in df_history.columns:
-        df_history.insert(0, '삭제', False)
+            if '삭제' not in df_history.columns:
+                df_history.insert(0, '삭제', False)
     
-    cols_config = {"삭제": st.column_config.CheckboxColumn("삭제", width="small")}
-    disabled_cols = [c for c in df_history.columns if c != '삭제']
+            cols_config = {"삭제": st.column_config.CheckboxColumn("삭제", width="small")}
+            disabled_cols = [c for c in df_history.columns if c != '삭제']
     
-    edited_df = st.data_editor(
-        df_history,
-        hide_index=True,
-        use_container_width=True,
-        column_config=cols_config,
-        disabled=disabled_cols
-    )
+            edited_df = st.data_editor(
+                df_history,
+                hide_index=True,
+                use_container_width=True,
+                column_config=cols_config,
+                disabled=disabled_cols
+            )
     
-    if edited_df['삭제'].any():
-        keep_indices = edited_df[~edited_df['삭제']].index.tolist()
-        st.session_state['cost_history'] = [st.session_state['cost_history'][i] for i in keep_indices]
-        st.rerun()
+            if edited_df['삭제'].any():
+                keep_indices = edited_df[~edited_df['삭제']].index.tolist()
+                st.session_state['cost_history'] = [st.session_state['cost_history'][i] for i in keep_indices]
+                rerun_fragment()
     
-    if st.button("🗑️ 누적 기록 전체 삭제"):
-        st.session_state['cost_history'] = []
-        st.rerun()
-else:
-    st.info("아직 추가된 기록이 없습니다. 위에서 계산 후 파란색 [저장하기] 버튼을 누르세요.")
+            st.button("🗑️ 누적 기록 전체 삭제", key="cost_clear_all", on_click=clear_history)
+        else:
+            st.info("아직 추가된 기록이 없습니다. 위에서 계산 후 파란색 [저장하기] 버튼을 누르세요.")
+
+history_table()
 
 st.divider()
 
@@ -252,3 +262,5 @@ else:
         - <b>망 1개 작업 총 인건비</b> = 해배당 인건비 × 면적(m²)
     </div>
     """, unsafe_allow_html=True)
+
+prof.finish()
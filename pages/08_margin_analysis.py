@@ -0,0 +1,97 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+from core.profiler import start_profile
+from core.dataset import FILE_PATH, load_dataset
+from core.derived import margin_data
+from core.prewarm import start_prewarm
+from core.margin import margin_matrix, margin_detail
+from core.sales import DEFAULT_VENDORS as DEFAULT_CUSTOMERS
+from core.purchase import DEFAULT_VENDORS as DEFAULT_SUPPLIERS
+
+st.set_page_config(page_title="마진 분석", page_icon="💹", layout="wide")
+prof = start_profile("08_margin_analysis")
+start_prewarm()
+
+# -----------------------------------------------------------------------------
+# [데이터 로드] 프로세스 공유 데이터 (세션별 사본 없음, 읽기 전용)
+# -----------------------------------------------------------------------------
+with prof.phase("데이터 로드"):
+    ds = load_dataset()
+if ds is None:
+    st.error(f"🚨 '{FILE_PATH}' 파일이 존재하지 않습니다.")
+    st.stop()
+
+# -----------------------------------------------------------------------------
+# 메인 로직
+# -----------------------------------------------------------------------------
+st.title("💹 매출·매입 마진 분석")
+st.markdown("같은 품목/규격의 **매출단가**와 **매입단가**를 연결해 매출업체 × 매입업체 마진율을 비교합니다.")
+st.caption("💡 마진율 = (매출단가 - 매입단가) / 매출단가 · 품목/규격/비고(규격2)는 공백·대소문자 차이를 무시하고 연결합니다.")
+
+try:
+    # 정규화 키 색인·단가 행렬은 파일 버전별 공유 캐시 (서버 시작 시 prewarm)
+    with prof.phase("키 색인"):
+        mi = margin_data(ds.version, ds)
+    if mi.keys.empty:
+        st.warning("매출단가와 매입단가가 모두 있는 품목이 없습니다."); st.stop()
+
+    all_items = mi.keys['품목'].unique().tolist()
+    c1, c2 = st.columns([3, 1])
+    sel_items = c1.multiselect("품목 필터 (비우면 전체)", all_items, key="mg_items")
+    threshold = c2.number_input("마진율 기준 (%)", min_value=-100.0, max_value=100.0, value=10.0, step=1.0, key="mg_threshold") / 100
+
+    c1, c2 = st.columns(2)
+    customers = c1.multiselect("매출업체 (행)", mi.customers, default=[v for v in DEFAULT_CUSTOMERS if v in mi.customers] or mi.customers[:10], key="mg_customers")
+    suppliers = c2.multiselect("매입업체 (열)", mi.suppliers, default=[v for v in DEFAULT_SUPPLIERS if v in mi.suppliers] or mi.suppliers[:10], key="mg_suppliers")
+    if not customers or not suppliers:
+        st.info("👆 비교할 매출업체와 매입업체를 선택해주세요."); st.stop()
+
+    with prof.phase("필터"):
+        rows = np.flatnonzero(mi.keys['품목'].isin(sel_items).to_numpy()) if sel_items else np.arange(len(mi.keys))
+        c_idx = [mi.customers.index(c) for c in customers]
+        v_idx = [mi.suppliers.index(v) for v in suppliers]
+
+    # -----------------------------------------------------------------------------
+    # 1. 매출업체 × 매입업체 평균 마진율
+    # -----------------------------------------------------------------------------
+    st.divider()
+    st.subheader("📊 매출업체 × 매입업체 평균 마진율")
+    with prof.phase("마진 행렬"):
+        rate, n = margin_matrix(mi.sales[np.ix_(rows, c_idx)], mi.purchase[np.ix_(rows, v_idx)])
+        df_rate = pd.DataFrame(rate, index=customers, columns=suppliers)
+        df_n = pd.DataFrame(n, index=customers, columns=suppliers)
+
+    with prof.phase("렌더링"):
+        st.dataframe(
+            df_rate.style.format("{:.1%}", na_rep="").map(lambda v: 'color: #d32f2f; font-weight: bold;' if pd.notna(v) and v < threshold else ''),
+            use_container_width=True
+        )
+        st.caption(f"빨간 글씨: 마진율 {threshold:.0%} 미만 · 빈 칸: 두 업체가 함께 취급하는 품목 없음")
+        with st.expander("공통 품목 수 (평균 계산에 쓰인 품목/규격 수)"):
+            st.dataframe(df_n, use_container_width=True)
+
+    # -----------------------------------------------------------------------------
+    # 2. 품목별 상세 (선택 매입업체 중 최저 매입가 기준)
+    # -----------------------------------------------------------------------------
+    st.divider()
+    st.subheader("📋 품목별 마진율 (선택 매입업체 중 최저 매입가 기준)")
+    only_low = st.checkbox("마진율 기준 미만 품목만 보기", key="mg_only_low")
+
+    with prof.phase("상세 계산"):
+        df_detail = margin_detail(mi, rows, customers, suppliers)
+        rates = df_detail[customers].to_numpy()
+        keep = ~np.isnan(rates).all(axis=1)
+        if only_low: keep &= (rates < threshold).any(axis=1)
+        df_detail = df_detail[keep]
+
+    with prof.phase("렌더링"):
+        df_show = df_detail.assign(**{c: df_detail[c] * 100 for c in customers})
+        cols_config = {c: st.column_config.NumberColumn(c, format="%.1f%%", width=90) for c in customers}
+        cols_config['최저 매입가'] = st.column_config.NumberColumn('최저 매입가', format="localized")
+        st.dataframe(df_show, hide_index=True, use_container_width=True, column_config=cols_config)
+        st.caption(f"{len(df_show):,}개 품목/규격")
+except Exception as e:
+    st.error(f"오류 발생: {e}")
+
+prof.finish()
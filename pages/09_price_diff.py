@@ -0,0 +1,89 @@
+import streamlit as st
+import hashlib
+import io
+from core.profiler import start_profile
+from core.dataset import FILE_PATH, load_dataset
+from core.workbook import HISTORY_DIR, file_version, list_workbooks
+from core.derived import workbook_dataset, diff_data
+from core.price_diff import DIFF_KINDS
+
+st.set_page_config(page_title="단가표 버전 비교", page_icon="🔀", layout="wide")
+prof = start_profile("09_price_diff")
+
+# -----------------------------------------------------------------------------
+# [데이터 로드] 새 단가표 = 현재 price_list.xlsx (프로세스 공유 데이터), 이전 단가표 = 폴더 파일 또는 업로드
+# -----------------------------------------------------------------------------
+with prof.phase("데이터 로드"):
+    ds = load_dataset()
+if ds is None:
+    st.error(f"🚨 '{FILE_PATH}' 파일이 존재하지 않습니다.")
+    st.stop()
+
+st.title("🔀 단가표 버전 비교")
+st.markdown("이전 단가표와 새 단가표의 **매출단가 / 매입단가** 시트를 비교해 추가·삭제·단가 변경 항목을 보여줍니다.")
+st.caption(f"💡 품목/규격/비고/업체 표기의 공백·대소문자 차이는 무시합니다. 이전 파일은 앱 폴더나 '{HISTORY_DIR}' 폴더에 두거나 직접 업로드하세요.")
+
+UPLOAD = "📤 파일 업로드"
+CURRENT = f"{FILE_PATH} (현재)"
+files = list_workbooks()
+
+c1, c2 = st.columns(2)
+old_choice = c1.selectbox("이전 단가표", files + [UPLOAD], key="pd_old")
+new_choice = c2.selectbox("새 단가표", [CURRENT] + files, key="pd_new")
+
+try:
+    with prof.phase("비교 대상 로드"):
+        if old_choice == UPLOAD:
+            up = st.file_uploader("이전 단가표 엑셀 (.xlsx)", type=['xlsx'], key="pd_upload")
+            if up is None:
+                st.info("👆 비교할 이전 단가표를 업로드해주세요."); st.stop()
+            data = up.getvalue()
+            old_key = ('upload', hashlib.md5(data).hexdigest())
+            old_ds = workbook_dataset(old_key, io.BytesIO(data))
+        else:
+            old_key = (old_choice,) + file_version(old_choice)
+            old_ds = workbook_dataset(old_key, old_choice)
+
+        if new_choice == CURRENT:
+            new_key, new_ds = (FILE_PATH,) + ds.version, ds
+        else:
+            new_key = (new_choice,) + file_version(new_choice)
+            new_ds = workbook_dataset(new_key, new_choice)
+
+    # 같은 두 버전이면 모든 세션이 비교 결과를 공유
+    with prof.phase("비교"):
+        diffs = diff_data(old_key, new_key, old_ds, new_ds)
+
+    st.divider()
+    c1, c2 = st.columns([3, 1])
+    sel_kinds = c1.multiselect("구분", DIFF_KINDS, default=DIFF_KINDS, key="pd_kinds")
+    min_rate = c2.number_input("변경 항목 최소 변동률 (%)", min_value=0.0, value=0.0, step=1.0, key="pd_min_rate") / 100
+
+    for tab, (sheet, df) in zip(st.tabs(list(diffs)), diffs.items()):
+        with tab:
+            with prof.phase("필터"):
+                items = st.multiselect("품목 필터 (비우면 전체)", df['품목'].unique().tolist(), key=f"pd_items_{sheet}")
+                mask = df['구분'].isin(sel_kinds)
+                if min_rate > 0: mask &= (df['구분'] != '변경') | (df['변동률'].abs() >= min_rate)
+                if items: mask &= df['품목'].isin(items)
+                df_show = df[mask]
+
+            with prof.phase("렌더링"):
+                k1, k2, k3 = st.columns(3)
+                for col, kind in zip((k1, k2, k3), DIFF_KINDS):
+                    col.metric(kind, f"{(df['구분'] == kind).sum():,}건")
+                st.dataframe(
+                    df_show.assign(변동률=df_show['변동률'] * 100),
+                    hide_index=True, use_container_width=True,
+                    column_config={
+                        '이전 단가': st.column_config.NumberColumn('이전 단가', format="localized"),
+                        '새 단가': st.column_config.NumberColumn('새 단가', format="localized"),
+                        '차액': st.column_config.NumberColumn('차액', format="localized"),
+                        '변동률': st.column_config.NumberColumn('변동률', format="%+.1f%%"),
+                    }
+                )
+                st.caption(f"{len(df_show):,} / {len(df):,}건 표시")
+except Exception as e:
+    st.error(f"오류 발생: {e}")
+
+prof.finish()
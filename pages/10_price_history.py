@@ -0,0 +1,72 @@
+import streamlit as st
+import datetime
+from core.profiler import start_profile
+from core.prewarm import start_prewarm
+from core.derived import history_index
+from core.price_history import SHEETS, store_version, price_at, price_trend
+
+st.set_page_config(page_title="단가 이력", page_icon="🕰️", layout="wide")
+prof = start_profile("10_price_history")
+start_prewarm()  # 현재 단가표의 새 버전은 백그라운드에서 이력에 기록됨
+
+# -----------------------------------------------------------------------------
+# [데이터 로드] 이력 색인 (버전별 변경분 전체, 새 버전이 기록될 때만 다시 읽음 · 과거 엑셀 파일은 읽지 않음)
+# -----------------------------------------------------------------------------
+st.title("🕰️ 단가 이력 조회")
+st.markdown("단가표 파일이 바뀔 때마다 **바뀐 칸만** 기록해 둔 이력에서 특정 날짜의 단가와 단가 추이를 조회합니다.")
+
+with prof.phase("이력 로드"):
+    idx = history_index(store_version())
+if idx.versions.empty:
+    st.info("아직 기록된 단가 이력이 없습니다. 단가표를 불러오면 자동으로 첫 버전이 기록됩니다.")
+    st.stop()
+
+try:
+    with st.expander(f"📚 기록된 버전 ({len(idx.versions)}개)"):
+        df_v = idx.versions[['id', 'effective', 'source', 'cells']].rename(columns={'id': '버전', 'effective': '적용 일시', 'source': '파일', 'cells': '기록 칸 수'})
+        st.dataframe(df_v.iloc[::-1], hide_index=True, use_container_width=True)
+
+    c1, c2, c3 = st.columns([1, 2, 2])
+    sheet = c1.radio("시트", SHEETS, format_func=lambda s: '매출단가' if s == SHEETS[0] else '매입단가', key="ph_sheet")
+    keys = idx.keys[idx.keys['sheet'] == SHEETS.index(sheet)]
+    item = c2.selectbox("품목", sorted(keys['품목'].unique()), key="ph_item")
+    item_keys = keys[keys['c_품목'] == keys.loc[keys['품목'] == item, 'c_품목'].iloc[0]]
+    spec = c3.selectbox("규격 (비우면 전체)", sorted(item_keys['규격'].unique()), index=None, key="ph_spec")
+
+    c1, c2 = st.columns([3, 1])
+    vendors = c1.multiselect("업체 (비우면 전체)", sorted(item_keys['업체'].unique()), key="ph_vendors")
+    first, last = idx.versions['effective'].min().date(), idx.versions['effective'].max().date()
+    date = c2.date_input("조회 날짜", value=min(last, datetime.date.today()), min_value=first, key="ph_date")
+
+    # -----------------------------------------------------------------------------
+    # 1. 선택 날짜 기준 단가
+    # -----------------------------------------------------------------------------
+    st.divider()
+    st.subheader(f"📌 {date:%Y-%m-%d} 기준 단가")
+    with prof.phase("시점 조회"):
+        df_at = price_at(idx, item, date, vendors, spec, sheet=sheet)
+    with prof.phase("렌더링"):
+        st.dataframe(df_at, hide_index=True, use_container_width=True,
+                     column_config={'단가': st.column_config.NumberColumn('단가', format="localized"),
+                                    '적용일': st.column_config.DatetimeColumn('적용일', format="YYYY-MM-DD HH:mm")})
+        st.caption("적용일: 해당 단가가 처음 기록된 버전의 적용 일시")
+
+    # -----------------------------------------------------------------------------
+    # 2. 버전별 단가 추이
+    # -----------------------------------------------------------------------------
+    st.divider()
+    st.subheader("📈 단가 추이")
+    with prof.phase("추이 조회"):
+        df_trend = price_trend(idx, item, vendors, spec, sheet=sheet)
+    if df_trend.empty:
+        st.info("표시할 이력이 없습니다.")
+    else:
+        with prof.phase("렌더링"):
+            if len(df_trend.columns) > 30: st.caption(f"항목이 많아 앞의 30개만 그래프에 표시합니다 (전체 {len(df_trend.columns)}개는 아래 표 참고).")
+            st.line_chart(df_trend.iloc[:, :30])
+            with st.expander("버전별 단가 표"):
+                st.dataframe(df_trend, use_container_width=True)
+except Exception as e:
+    st.error(f"오류 발생: {e}")
+
+prof.finish()
@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+import logging
+import argparse
+
+from core.workbook import FILE_PATH, file_version, read_dataset
+from core.labor import read_labor_base
+from core.price_history import record_version
+from core.shared_dataset import SHARED_DIR_ENV, DEFAULT_SHARED_DIR, publish, published
+
+# -----------------------------------------------------------------------------
+# 공유 데이터 게시 (여러 Streamlit 서버 프로세스 운영용 — core/shared_dataset.py)
+#   python publish.py --watch                         # price_list.xlsx 가 바뀔 때마다 새 버전 게시 (기본 폴더 /dev/shm/price_list)
+#   PRICE_SHARED_DIR=/dev/shm/price_list streamlit run app.py --server.port 8501   # 서버 프로세스마다 같은 폴더 지정
+#   엑셀 파싱·단가 이력 기록은 이 프로세스만 수행하고, 서버 프로세스는 게시된 버전을 매핑만 함
+# -----------------------------------------------------------------------------
+_log = logging.getLogger('publish')
+
+def publish_file(path, root):
+    t0 = time.perf_counter()
+    ds = read_dataset(path)
+    try: labor = read_labor_base(path)
+    except Exception:
+        _log.exception("labor_cost 시트 읽기 실패 — 인건비 기준표 없이 게시 (07 페이지는 서버 프로세스가 직접 계산)")
+        labor = None
+    tag = publish(ds, labor, root, source=path)
+    record_version(ds, path)  # 단가 이력 (서버 프로세스는 공유 모드에서 기록하지 않음)
+    _log.info("게시: %s → %s/%s (%.0f ms, %.1f MB)", path, root, tag, (time.perf_counter() - t0) * 1000, ds.memory['after_mb'])
+    return tag
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description='단가표를 공유 메모리 폴더에 게시')
+    ap.add_argument('--file', default=FILE_PATH)
+    ap.add_argument('--dir', default=os.environ.get(SHARED_DIR_ENV) or DEFAULT_SHARED_DIR, help=f'게시 폴더 (기본: ${SHARED_DIR_ENV} 또는 {DEFAULT_SHARED_DIR})')
+    ap.add_argument('--watch', action='store_true', help='파일이 바뀔 때마다 다시 게시')
+    ap.add_argument('--interval', type=float, default=2.0, help='--watch 파일 확인 간격 (초)')
+    args = ap.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
+
+    if not args.watch:
+        publish_file(args.file, args.dir)
+        return 0
+
+    current = published(args.dir)
+    last = tuple(current['version']) if current and current.get('source') == args.file else None
+    while True:
+        try:
+            version = file_version(args.file)
+            if version != last:
+                publish_file(args.file, args.dir)
+                last = version
+        except FileNotFoundError:
+            _log.warning("%s 없음 — %s초 후 다시 확인", args.file, args.interval)
+        except Exception:
+            _log.exception("게시 실패 — 이전 버전 유지")  # 저장 중인 엑셀 파일 등, 다음 확인 때 다시 시도
+        time.sleep(args.interval)
+
+if __name__ == '__main__':
+    sys.exit(main())
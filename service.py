@@ -0,0 +1,104 @@
+import sys
+import json
+import logging
+import argparse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from core.workbook import FILE_PATH
+from core.price_service import OPS, PriceService
+
+# -----------------------------------------------------------------------------
+# 로컬 단가 조회 JSON 서비스 (ERP·주문 입력 시트 연동용, 표준 라이브러리 HTTP 서버)
+#   python service.py --port 8765
+#
+#   POST /sales_price     {"item": "안전망1cm", "spec": "1.2*50", "vendor": "가온건설"}
+#   POST /purchase_price  {"item": "안전망1cm", "spec": "1.2*50", "spec2": "KS"}
+#   POST /compare         {"items": [{"item": "PP로프", "spec": "6mm"}], "vendors": ["가온건설", "타포"]}
+#   POST /basket          {"lines": [{"item": "안전망1cm", "spec": "1.2*50 KS", "qty": 10}], "max_vendors": 2}
+#     → {"results": [...]}  (본문이 목록이거나 {"queries": [...]} 이면 여러 건을 한 번에 처리)
+#   POST /batch           {"requests": [{"op": "sales_price", ...}, {"op": "basket", ...}]}
+#   GET  /catalog  조회 가능한 품목/규격/업체,  GET /stats  처리량·지연시간,  GET /health
+#
+#   엑셀 파일이 바뀌면 다음 요청 때(최대 1초 간격 확인) 새 색인으로 교체 — 서버 재시작 불필요
+# -----------------------------------------------------------------------------
+DEFAULT_PORT = 8765
+MAX_BODY = 16 * 2**20
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive (ERP 연동·부하 테스트에서 연결 재사용)
+    disable_nagle_algorithm = True  # 헤더/본문을 나눠 쓸 때 생기는 ~40ms 지연(Nagle + delayed ACK) 방지
+    service = None
+    verbose = False
+
+    def _send(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = self.path.split('?')[0].rstrip('/')
+        if path == '/health':
+            idx = self.service.index()
+            self._send(200, {'status': 'ok', 'version': list(idx.version), 'loaded_at': idx.loaded_at})
+        elif path == '/stats': self._send(200, self.service.stats())
+        elif path == '/catalog': self._send(200, self.service.catalog())
+        else: self._send(404, {'error': f'없는 경로: {path}'})
+
+    def do_POST(self):
+        path = self.path.split('?')[0].strip('/')
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            if length > MAX_BODY: return self._send(413, {'error': '요청 본문이 너무 큽니다'})
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError as e:
+            return self._send(400, {'error': f'JSON 형식 오류: {e}'})
+        try:
+            idx = self.service.index()  # 한 요청은 한 색인으로 처리하고 그 버전을 응답
+            if path == 'batch':
+                reqs = body.get('requests', []) if isinstance(body, dict) else body
+                results = [self._batch_item(r, idx) for r in reqs]
+            elif path in OPS:
+                queries = body if isinstance(body, list) else body.get('queries', [body])
+                results = self.service.run(path, queries, idx)
+            else:
+                return self._send(404, {'error': f'없는 조회: {path} (가능: {", ".join(OPS)}, batch)'})
+        except Exception as e:
+            logging.exception("요청 처리 실패")
+            return self._send(500, {'error': str(e)})
+        self._send(200, {'version': list(idx.version), 'results': results})
+
+    def _batch_item(self, req, idx):
+        # 건별 오류는 결과에 담고 나머지는 계속 (run() 과 같음)
+        if not isinstance(req, dict): return {'error': f'요청 항목은 객체여야 합니다: {req!r}'}
+        op = req.get('op')
+        if op not in OPS: return {'error': f'알 수 없는 op: {op}'}
+        return self.service.run(op, [{k: v for k, v in req.items() if k != 'op'}], idx)[0]
+
+    def log_message(self, fmt, *args):
+        if self.verbose: super().log_message(fmt, *args)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description='로컬 단가 조회 JSON 서비스')
+    ap.add_argument('--file', default=FILE_PATH, help='단가표 엑셀 파일')
+    ap.add_argument('--host', default='127.0.0.1')
+    ap.add_argument('--port', type=int, default=DEFAULT_PORT)
+    ap.add_argument('--verbose', action='store_true', help='요청마다 접속 로그 출력')
+    args = ap.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    Handler.service = PriceService(args.file)
+    Handler.verbose = args.verbose
+    Handler.service.index()  # 시작 전에 첫 색인 준비
+    server = ThreadingHTTPServer((args.host, args.port), Handler)
+    server.daemon_threads = True
+    print(f"단가 조회 서비스: http://{args.host}:{args.port}  ({args.file})", flush=True)
+    try: server.serve_forever()
+    except KeyboardInterrupt: pass
+    finally: server.server_close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())